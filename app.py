@@ -1,5 +1,5 @@
 import streamlit as st
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import io
 import os
 
@@ -9,30 +9,54 @@ import re
 import json
 import sys
 import base64
-from typing import Dict, List, Optional
-from utils.cup_generator import CupGenerator
-from streamlit_clickable_images import clickable_images
+import zipfile
+import functools
+import uuid
+from typing import IO, Callable, Dict, List, Optional, Tuple
 
 # Adicionar utils ao path
 sys.path.append(os.path.dirname(__file__))
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 import csv
-import plotly.graph_objects as go
 
-from utils.results_parser import ResultsParser
+# Módulos pesados (pandas, plotly, lxml, geradores de imagem) são importados
+# dentro do modo que os usa, para o app abrir rápido
 from utils.table_processor import TableProcessor
-from utils.bbi_functions import _season_start, _season_label
-from utils.image_generator import ImageGenerator
+from utils.season import _season_start, _season_label
 from utils.github_handler import GitHubHandler
-from utils.news_generator import NewsGenerator
-from utils.table_validator import TableValidator
-from utils.stats_engine import compute_league_stats
+from utils.persistence_queue import PersistenceQueue
+from utils import perf
+from utils.profiling import profile, profiling_enabled
+from utils.round_processing import (
+    LIGA_DISPLAY_NAMES,
+    apply_new_results,
+    build_table_data,
+    load_table,
+    parse_results_text,
+)
+from utils.background import BackgroundTooLargeError, open_background
+from utils.image_export import (
+    PREVIEW_EXPORT,
+    ExportSettings,
+    ImageZipWriter,
+    available_formats,
+    encode_image,
+    read_zip_entry,
+)
+from utils.render_cache import RenderCache, render_key
+from utils.scaling import PREVIEW_SCALE
+from utils.scoreboard import (
+    desenhar_placar,
+    escudos_faltando,
+    gerar_zip_placares,
+    obter_escudo_path,
+    parse_lote_placares,
+)
 from utils.insights_cache import (
     load_cached_stats,
     get_cache_meta,
     is_stale,
-    save_stats,
     rebuild_for_liga,
 )
 from utils.position_history import (
@@ -85,13 +109,313 @@ INGLES_UCL = ["Arsenal", "Manchester City", "Manchester United", "Aston Villa",
 INGLES_UEL = ["Bournemouth", "Sunderland", "Crystal Palace"]
 INGLES_UECL = ["Brighton"]
 
-LIGA_DISPLAY_NAMES = {
-    "premierleague": "Premier League",
-    "championship":  "Championship",
-    "leagueone":     "League One",
-    "leaguetwo":     "League Two",
-    "nationalleague":"National League",
-}
+def ler_secret(nome: str):
+    """Valor de um secret, ou None se não existir (ou se não houver secrets.toml)"""
+    try:
+        return st.secrets[nome] if nome in st.secrets else None
+    except Exception:
+        return None
+
+@st.cache_resource
+def obter_fila_github() -> Optional[PersistenceQueue]:
+    """
+    Fila de sincronização com o GitHub (uma por processo)
+
+    Os arquivos são gravados localmente e enviados em segundo plano; retorna
+    None se GITHUB_TOKEN / GITHUB_REPO não estiverem configurados.
+    """
+    try:
+        if 'GITHUB_TOKEN' not in st.secrets or 'GITHUB_REPO' not in st.secrets:
+            return None
+        token, repo = st.secrets['GITHUB_TOKEN'], st.secrets['GITHUB_REPO']
+    except Exception:
+        return None
+    return PersistenceQueue(lambda: GitHubHandler(token=token, repo=repo))
+
+
+# Geradores e parser: carregam configs/fontes uma vez por processo e são
+# reaproveitados entre sessões (nenhum guarda estado entre chamadas)
+@st.cache_resource
+def obter_gerador_imagens():
+    from utils.image_generator import ImageGenerator
+    return ImageGenerator()
+
+
+@st.cache_resource
+def obter_gerador_copa():
+    from utils.cup_generator import CupGenerator
+    return CupGenerator()
+
+
+@st.cache_resource
+def obter_gerador_noticias():
+    from utils.news_generator import NewsGenerator
+    return NewsGenerator()
+
+
+@st.cache_resource
+def obter_parser_resultados():
+    from utils.results_parser import ResultsParser
+    return ResultsParser()
+
+
+@st.cache_resource
+def obter_validador_tabelas():
+    from utils.table_validator import TableValidator
+    return TableValidator()
+
+
+@st.cache_resource
+def obter_cache_renders() -> RenderCache:
+    """Imagens prontas em .cache/renders, compartilhadas entre sessões"""
+    return RenderCache()
+
+
+def renderizar_em_cache(tipo: str, entradas: dict, gerar: Callable[[float], Image.Image],
+                        escala: float = 1.0,
+                        exportacao: ExportSettings = PREVIEW_EXPORT) -> bytes:
+    """
+    Bytes da arte (tipo, entradas) na escala e no formato pedidos; só gera e
+    codifica se não estiver em cache
+    """
+    return obter_cache_renders().get_or_render(
+        tipo, {**entradas, 'scale': escala, 'export': exportacao.as_dict()},
+        lambda: encode_image(gerar(escala), exportacao)
+    )
+
+
+@st.cache_resource
+def obter_perfis_layout() -> Dict[str, dict]:
+    """Perfis de formato (feed, story, paisagem) do leagues_config.json"""
+    from utils.layout_profiles import load_layout_profiles
+    return load_layout_profiles()
+
+
+def download_perfis(artes: Dict[str, tuple], perfis: List[str],
+                    exportacao: ExportSettings) -> Callable[[], bytes]:
+    """
+    Dados adiados do ZIP com cada arte (nome base → (entradas, gerar)) em
+    todos os perfis pedidos. Cada arte é desenhada uma vez só, em resolução
+    final; os perfis são composições dela, codificadas em paralelo
+    """
+    from utils.layout_profiles import compose_profiles
+
+    cache = obter_cache_renders()
+    config = obter_perfis_layout()
+    entradas_zip = {
+        'artes': {nome: entradas for nome, (entradas, _) in artes.items()},
+        'perfis': {perfil: config[perfil] for perfil in perfis},
+        'export': exportacao.as_dict(),
+    }
+
+    def gerar_zip() -> bytes:
+        buffer = io.BytesIO()
+        with ImageZipWriter(buffer, exportacao) as zip_writer:
+            for nome, (_, gerar) in artes.items():
+                for perfil, img in compose_profiles(gerar(1.0), config, perfis).items():
+                    zip_writer.add(f"{nome}-{perfil}.{exportacao.extension}", img)
+        return buffer.getvalue()
+
+    return lambda: cache.get_or_render("perfis", entradas_zip, gerar_zip)
+
+
+def download_versao_final(tipo: str, entradas: dict, gerar: Callable[[float], Image.Image],
+                          exportacao: ExportSettings) -> Callable[[], bytes]:
+    """
+    Dados adiados para st.download_button: a arte em resolução final só é
+    gerada e codificada quando o usuário clica em baixar (fora do script,
+    sem chamadas st.*)
+    """
+    cache = obter_cache_renders()
+    return lambda: cache.get_or_render(
+        tipo, {**entradas, 'scale': 1.0, 'export': exportacao.as_dict()},
+        lambda: encode_image(gerar(1.0), exportacao)
+    )
+
+
+def animacao_em_cache(generator, entradas: dict, linhas_iniciais: List[int],
+                      escala: float, formato: str) -> bytes:
+    """
+    Bytes da animação da tabela (entradas), com cada time saindo de
+    linhas_iniciais, na escala e no formato pedidos; só gera se não estiver
+    em cache
+    """
+    from utils.standings_animation import render_standings_animation
+
+    def gerar() -> bytes:
+        camadas = generator.generate_table_layers(**entradas, scale=escala)
+        buffer = io.BytesIO()
+        render_standings_animation(buffer, camadas, linhas_iniciais, formato)
+        return buffer.getvalue()
+
+    return obter_cache_renders().get_or_render(
+        "animacao_tabela",
+        {**entradas, 'rows_from': linhas_iniciais, 'scale': escala, 'format': formato},
+        gerar
+    )
+
+
+def download_animacao(generator, entradas: dict, linhas_iniciais: List[int],
+                      formato: str) -> Callable[[], bytes]:
+    """Dados adiados da animação em resolução final (gerada só no clique)"""
+    return lambda: animacao_em_cache(generator, entradas, linhas_iniciais, 1.0, formato)
+
+
+_PRESETS_EXPORTACAO = {"Máxima": "maxima", "Alta": "alta", "Compacta": "compacta"}
+
+
+def opcoes_exportacao(chave: str, formato_padrao: str = "png") -> ExportSettings:
+    """Formato, qualidade e tamanho máximo escolhidos para os downloads de uma tela"""
+    formatos = available_formats()
+    with st.expander("⚙️ Formato do download"):
+        formato = st.selectbox(
+            "Formato",
+            formatos,
+            index=formatos.index(formato_padrao),
+            format_func=str.upper,
+            key=f"export_formato_{chave}",
+            help="WebP e AVIF geram arquivos bem menores que PNG/JPEG"
+        )
+        preset = st.radio(
+            "Qualidade",
+            list(_PRESETS_EXPORTACAO),
+            index=1,
+            horizontal=True,
+            key=f"export_preset_{chave}",
+            help="No PNG só \"Compacta\" perde qualidade (paleta de 256 cores)"
+        )
+        max_mb = st.number_input(
+            "Tamanho máximo (MB)",
+            min_value=0.0,
+            value=0.0,
+            step=0.5,
+            key=f"export_max_{chave}",
+            help="0 = sem limite. Com limite, a qualidade é reduzida até o arquivo caber"
+        )
+    return ExportSettings.from_preset(
+        formato, _PRESETS_EXPORTACAO[preset], int(max_mb * 1024 * 1024) or None
+    )
+
+
+# gerar(arquivo, escala, exportacao): grava o ZIP em arquivo e devolve os nomes das entradas
+GeradorZip = Callable[[IO[bytes], float, ExportSettings], List[str]]
+
+
+def zip_em_cache(cache: RenderCache, tipo: str, entradas: dict, gerar: GeradorZip,
+                 escala: float, exportacao: ExportSettings) -> Tuple[bytes, List[str]]:
+    """
+    ZIP (tipo, entradas) na escala e no formato pedidos (lido do cache de
+    renders quando já existe) e os nomes das imagens dentro dele
+    """
+    chave = render_key(tipo, {**entradas, 'scale': escala, 'export': exportacao.as_dict()})
+    dados = cache.get(chave)
+
+    if dados is not None:
+        # Mesmas entradas: o ZIP já pronto
+        with zipfile.ZipFile(io.BytesIO(dados)) as _zf:
+            return dados, _zf.namelist()
+
+    with perf.timed(f"zip {tipo}") as _span:
+        _buffer = io.BytesIO()
+        nomes = gerar(_buffer, escala, exportacao)
+        dados = _buffer.getvalue()
+        _span.bytes_out = len(dados)
+    cache.put(chave, dados)
+    return dados, nomes
+
+
+def download_zip_final(tipo: str, entradas: dict, gerar: GeradorZip,
+                       exportacao: ExportSettings) -> Callable[[], bytes]:
+    """Dados adiados do ZIP em resolução final (gerado só no clique)"""
+    cache = obter_cache_renders()
+
+    def zip_final() -> bytes:
+        return zip_em_cache(cache, tipo, entradas, gerar, 1.0, exportacao)[0]
+
+    return zip_final
+
+
+def gerador_zip_copa(generator, entradas: dict) -> GeradorZip:
+    """GeradorZip com as artes da copa descritas por entradas"""
+    def gerar(arquivo: IO[bytes], escala: float, exportacao: ExportSettings) -> List[str]:
+        # Cada arte é codificada (em paralelo com o desenho da próxima) e gravada
+        # no ZIP assim que fica pronta, então poucas ficam em memória por vez
+        with ImageZipWriter(arquivo, exportacao) as zip_writer:
+            for idx, img in enumerate(generator.iter_cup_images(
+                cup=entradas['cup'],
+                results=entradas['results'],
+                title=entradas['title'],
+                scale=escala
+            ), start=1):
+                zip_writer.add(f"{entradas['prefixo']}-{idx}.{exportacao.extension}", img)
+        return zip_writer.filenames
+
+    return gerar
+
+
+def mostrar_zip_gerado(zip_dados: bytes, arquivos: List[str], zip_final: Callable[[], bytes],
+                       exportacao: ExportSettings, nome_zip: str, chave: str) -> None:
+    """Prévias de um ZIP gerado, com download do pacote e de cada imagem em resolução final"""
+    # BOTÃO PARA BAIXAR TODAS DE UMA VEZ
+    if len(arquivos) > 1:
+        st.download_button(
+            "📦 Baixar Todas as Imagens (ZIP)",
+            zip_final,
+            file_name=nome_zip,
+            mime="application/zip",
+            width='stretch',
+            type="primary",
+            key=f"download_{chave}_zip"
+        )
+        
+        st.divider()
+    
+    # Mostrar cada prévia individualmente (lidas do ZIP, sem arquivos temporários)
+    for idx, filename in enumerate(arquivos, start=1):
+        png_bytes = read_zip_entry(io.BytesIO(zip_dados), filename)
+        st.image(png_bytes, caption=f"Imagem {idx} de {len(arquivos)} (prévia)")
+        
+        # Botão de download individual, em resolução final
+        nome_final = f"{os.path.splitext(filename)[0]}.{exportacao.extension}"
+        st.download_button(
+            f"📥 Baixar Imagem {idx}",
+            lambda nome=nome_final: read_zip_entry(io.BytesIO(zip_final()), nome),
+            file_name=nome_final,
+            mime=exportacao.mime,
+            width='stretch',
+            key=f"download_{chave}_{idx}"  # ← Key única evita conflitos
+        )
+        
+        if idx < len(arquivos):
+            st.divider()
+
+
+def enfileirar_github(paths: List[str], mensagem: str) -> bool:
+    """Agenda o envio dos arquivos locais ao GitHub; False se não configurado"""
+    fila = obter_fila_github()
+    if fila is None:
+        return False
+    fila.enqueue(paths, mensagem)
+    return True
+
+
+def mostrar_status_sincronizacao():
+    """Mostra o estado dos envios pendentes ao GitHub"""
+    fila = obter_fila_github()
+    if fila is None:
+        return
+    status = fila.status()
+    if status['pending']:
+        if status['last_error']:
+            st.warning(
+                f"⚠️ Sincronização com o GitHub falhou ({status['attempts']}x), tentando novamente: "
+                f"{status['last_error']} — pendentes: {', '.join(status['pending'])}"
+            )
+        else:
+            st.info(f"☁️ Enviando ao GitHub: {', '.join(status['pending'])}")
+    elif status['last_success']:
+        st.caption(f"☁️ GitHub sincronizado em {status['last_success'].replace('T', ' ')}")
+
 
 @st.cache_data(ttl=300)  # Cache por 5 minutos
 def carregar_tabela_github(liga: str):
@@ -101,6 +425,15 @@ def carregar_tabela_github(liga: str):
     Returns:
         (content: str, sha: str, source: str)
     """
+    # Com envio pendente, a versão local é a mais recente
+    fila = obter_fila_github()
+    if fila is not None and fila.is_pending(f"data/tabelas/{liga}.txt"):
+        try:
+            with open(f"data/tabelas/{liga}.txt", 'r', encoding='utf-8') as f:
+                return f.read(), None, 'local'
+        except Exception:
+            pass
+
     # Tentar carregar do GitHub primeiro
     try:
         if 'GITHUB_TOKEN' in st.secrets and 'GITHUB_REPO' in st.secrets:
@@ -225,510 +558,11 @@ def obter_fontes_por_template(template_path):
         return ("fontes/FontePlacar.ttf", "fontes/FontePlacar.ttf")
 
 
-def redimensionar_escudo(filepath, target_size=(100, 100)):
-    escudo = Image.open(filepath).convert("RGBA")
-    escudo.thumbnail(target_size, Image.LANCZOS)
-
-    canvas = Image.new("RGBA", target_size, (0, 0, 0, 0))
-    pos_x = (target_size[0] - escudo.width) // 2
-    pos_y = (target_size[1] - escudo.height) // 2
-    canvas.paste(escudo, (pos_x, pos_y), escudo)
-
-    return canvas
-
-
-
-def obter_config_template(template_path):
-    nome = os.path.splitext(os.path.basename(template_path))[0].lower()
-    
-    if "premier" in nome:
-        h = 799
-        return {
-            "fonte_normal": "fontes/premierleague.otf",
-            "fonte_bold": "fontes/premierleague-bold.otf",
-            "tamanho_escudo": (84, 84),
-            "pos_escudo_casa": (145, h),
-            "pos_escudo_fora": (-229, h), # valor negativo será tratado como relativo ao width,
-            "cor_texto": "#3b0643",
-            "cor_texto_placar": "white",
-            "cor_texto_times": "white",
-            "alinhamento_nomes": "lados",  # mandante à esquerda, visitante à direita (como os marcadores)
-            "pos_nome_casa": (240, h+22),  # x = margem esquerda
-            "pos_nome_fora": (-240, h+24), # x negativo = margem da borda direita
-            "pos_placar": h+1,
-            "pos_marcadores_casa": (243, 887),  # mesmo x do nome do time
-            "pos_marcadores_fora": (-243, 887), # x negativo = margem da borda direita
-            "tamanho_nome": 36,
-            "tamanho_placar": 72,
-            "tamanho_marcadores": 30,
-            "espaco_linha": 45,
-        }
-    # elif nome == "championship":
-    #     # Escudos ficam fora do card (card sem "orelhas"); placar dividido dentro do card
-    #     # Escudo maior (240x240) mantendo o mesmo centro de ancoragem (borda do card / linha do placar)
-    #     return {
-    #         "fonte_normal": "fontes/premierleague-bold.otf",
-    #         "fonte_bold": "fontes/efl-placar.otf",
-    #         "tamanho_escudo": (220, 220),
-    #         "pos_escudo_casa": (160, 880),
-    #         "pos_escudo_fora": (-380, 880),
-    #         "cor_texto": "#ad994a",
-    #         "cor_texto_placar": "#ad994a",
-    #         "tamanho_placar": 220,
-    #         "tamanho_marcadores": 16,
-    #         "pos_placar": 1000,
-    #         "placar_dividido": True,
-    #         "pos_placar_split_x": (490, 590),
-    #         "pos_marcadores_casa": (500, 1105),
-    #         "pos_marcadores_fora": (-500, 1105),
-    #         "espaco_linha": 20,
-    #     }
-    elif nome in ("championship", "leagueone", "leaguetwo", "eflcup"):
-        # Escudos ficam dentro das "orelhas" do card; placar dividido pela linha central
-        cor = {"championship": "#7f6701", "leagueone": "white", "leaguetwo": "#C10724", "eflcup": "#177E52"}[nome]
-        config = {
-            "fonte_normal": "fontes/premierleague-bold.otf",
-            "fonte_bold": "fontes/efl-placar.otf",
-            "tamanho_escudo": (164, 164),
-            "pos_escudo_casa": (350, 900),
-            "pos_escudo_fora": (-515, 900),
-            "cor_texto": "white",
-            "cor_texto_placar": "white",
-            "tamanho_placar": 164,
-            "tamanho_marcadores": 16,
-            "pos_placar": 990,
-            "placar_dividido": True,
-            "pos_placar_split_x": (248, 828),
-            "pos_marcadores_casa": (525, 1100),
-            "pos_marcadores_fora": (-525, 1100),
-            "espaco_linha": 20,
-        }
-        return config
-    elif "championship" in nome or "efl" in nome or "league" in nome:
-        h = 920
-        return {
-            "fonte_normal": "fontes/efl.otf",
-            "fonte_bold": "fontes/efl-bold.otf",
-            "tamanho_escudo": (50, 50),
-            "pos_escudo_casa": (130, h),
-            "pos_escudo_fora": (-180, h),
-            "cor_texto": "#3241a1",
-            "cor_texto_placar": "white",
-            # Sem nomes de times na nova arte da EFL (pos_nome_* omitidos)
-            "pos_placar": 923,
-        }
-    elif "facup" in nome:
-        h = 914
-        return {
-            "fonte_normal": "fontes/facup.otf",
-            "fonte_bold": "fontes/facup-bold.otf",
-            "tamanho_escudo": (60, 60),
-            "pos_escudo_casa": (121, h),
-            "pos_escudo_fora": (-181, h),
-            "cor_texto_times": "#383b38",
-            "cor_texto": "white",
-            "cor_texto_placar": "white",
-            "pos_nome_casa": (336, h+18),  # Posição absoluta
-            "pos_nome_fora": (742, h+18),
-            "pos_placar": 920,
-        }
-    elif "ucl" in nome:
-        h = 880
-        return {
-            "fonte_normal": "fontes/ucl.ttf",
-            "fonte_bold": "fontes/ucl-bold.ttf",
-            "tamanho_escudo": (120, 120),
-            "pos_escudo_casa": (70, h),
-            "pos_escudo_fora": (-180, h),
-            "cor_texto": "white",
-            "cor_texto_placar": "white",
-            "pos_nome_casa": (317, h+45),  # Posição absoluta
-            "pos_nome_fora": (758, h+45),
-            "pos_placar": 915,
-        }
-    elif "uel" in nome or "uecl" in nome:
-        h = 912
-        return {
-            "fonte_normal": "fontes/uel.ttf",
-            "fonte_bold": "fontes/uel-bold.ttf",
-            "tamanho_escudo": (60, 60),
-            "pos_escudo_casa": (120, h),
-            "pos_escudo_fora": (-180, h),
-            "cor_texto": "white",
-            "cor_texto_placar": "black",
-            "pos_nome_casa": (335, h+15),  # Posição absoluta
-            "pos_nome_fora": (743, h+15),  # Posição absoluta
-            "pos_placar": 915,
-        }
-    elif "inglaterra" in nome:
-        h = 915
-        return {
-            "fonte_normal": "fontes/ing.ttf",
-            "fonte_bold": "fontes/ing.ttf",
-            "tamanho_escudo": (60, 60),
-            "pos_escudo_casa": (120, h),
-            "pos_escudo_fora": (-180, h),
-            "cor_texto": "#0c113c",
-            "cor_texto_placar": "white",
-            "pos_nome_casa": (330, h+17),  # Posição absoluta
-            "pos_nome_fora": (760, h+17),
-            "pos_placar": 920,
-        }
-    else:
-        return {
-            "fonte_normal": "fontes/facup.ttf",
-            "fonte_bold": "fontes/facup-bold.ttf",
-            "tamanho_escudo": (100, 100),
-            "pos_escudo_casa": (50, h),
-            "pos_escudo_fora": (-150, h),
-            "cor_texto": "white",
-            "cor_texto_placar": "white",
-            "pos_nome_casa": (360, 870),  # Posição absoluta
-            "pos_nome_fora": (-360, 870),
-            "pos_placar": 915,
-        }
-
-
-
-def obter_escudo_path(team_name, template_path=None):
-    """Busca o escudo em múltiplas pastas"""
-    pastas = ["escudos-pl", "escudos-ch", "escudos-l1", "escudos-l2", 
-              "escudos-ucl", "escudos-uel", "escudos-uecl", "selecoes", "escudos-nl", "escudos-nonleague"]
-    
-    for pasta in pastas:
-        caminho = os.path.join(pasta, f"{team_name}.png")
-        if os.path.exists(caminho):
-            return caminho
-    
-    return None
-
-_GRADIENT_CONFIG = {
-    "premier":       {"color": (55, 0, 60),   "start": 0.4,  "intensity": 0.9},   # #37003c
-    "championship":  {"color": (52, 42, 0),   "start": 0.55, "intensity": 0.95},  # #342a00
-    "leagueone":     {"color": (23, 23, 23),  "start": 0.55, "intensity": 0.95},  # #171717
-    "leaguetwo":     {"color": (75, 0, 16),   "start": 0.55, "intensity": 0.95},  # #4b0010
-    "eflcup":        {"color": (28, 65, 35),  "start": 0.55, "intensity": 0.95},  # #1c4123
-    "nationalleague": {"color": (0, 0, 0),    "start": 0.4,  "intensity": 0.9},   # a definir
-    "efl":           {"color": (0, 0, 0),     "start": 0.4,  "intensity": 0.9},   # a definir
-}
-
-def apply_bottom_gradient(image: Image.Image, intensity: float = 0.9, color: tuple = (0, 0, 0), start: float = 0.4) -> Image.Image:
-        """Cria o efeito de sombra na parte inferior para destacar o texto"""
-        width, height = image.size
-        gradient = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(gradient)
-        start_y = int(height * start)
-        for y in range(start_y, height):
-            alpha = int(255 * intensity * ((y - start_y) / (height - start_y)))
-            draw.line([(0, y), (width, y)], fill=(*color, alpha))
-        return Image.alpha_composite(image, gradient)
-
-def desenhar_placar(template_path, escudo_casa, escudo_fora, placar_texto, marcadores_casa, marcadores_fora, background=None, alinhamento="Centro"):
-    base = Image.open(template_path).convert("RGBA")
-
-    # O template da Premier League é fornecido em alta resolução (2160px);
-    # reduz para 1350px de altura para casar com as coordenadas de obter_config_template
-    if "premier" in template_path.lower() and base.height > 1350:
-        escala = 1350 / base.height
-        base = base.resize((round(base.width * escala), 1350), Image.LANCZOS)
-
-    if background:
-        bg_raw = Image.open(background).convert("RGBA")
-        scale_w = base.width / bg_raw.width
-        scale_h = base.height / bg_raw.height
-        scale = max(scale_w, scale_h)
-        new_width = int(bg_raw.width * scale)
-        new_height = int(bg_raw.height * scale)
-        bg_resized = bg_raw.resize((new_width, new_height), Image.LANCZOS)
-
-        # Ajusta o recorte baseado no alinhamento
-        max_left = new_width - base.width
-        if isinstance(alinhamento, (int, float)):
-            left = int(max_left * alinhamento / 100)
-        elif alinhamento == "Esquerda":
-            left = 0
-        elif alinhamento == "Direita":
-            left = max_left
-        else:  # Centro
-            left = max_left // 2
-        
-        top = (new_height - base.height) // 2
-        bg_cropped = bg_resized.crop((left, top, left + base.width, top + base.height))
-
-        tpl = template_path.lower()
-        gradient_cfg = next(
-            (cfg for key, cfg in _GRADIENT_CONFIG.items() if key in tpl),
-            None,
-        )
-        if gradient_cfg is not None:
-            bg_cropped = apply_bottom_gradient(
-                bg_cropped,
-                intensity=gradient_cfg["intensity"],
-                color=gradient_cfg["color"],
-                start=gradient_cfg["start"],
-            )
-
-        final_img = Image.new("RGBA", bg_cropped.size, (0, 0, 0, 0))
-        base_x = (bg_cropped.width - base.width) // 2
-        base_y = (bg_cropped.height - base.height) // 2
-        final_img.paste(bg_cropped, (0, 0))
-        final_img.paste(base, (base_x, base_y), base)
-        base = final_img
-
-    # Configurações do template
-    config = obter_config_template(template_path)
-    path_lower = template_path.lower()
-
-    if any(comp in path_lower for comp in ["uel", "uecl"]):
-        fonte_normal = ImageFont.truetype(config["fonte_bold"], 28)
-    else:
-        fonte_normal = ImageFont.truetype(config["fonte_normal"], 32)
-    fonte_bold = ImageFont.truetype(config["fonte_bold"], config.get("tamanho_placar", 48))
-    fonte_pequena = ImageFont.truetype(config["fonte_normal"], config.get("tamanho_marcadores", 26))
-    fonte_mais_pequena = ImageFont.truetype(config["fonte_normal"], 18)
-    fonte_nome = (
-        ImageFont.truetype(config["fonte_normal"], config["tamanho_nome"])
-        if "tamanho_nome" in config else None
-    )
-    cor_texto = config["cor_texto"]
-    cor_texto_placar = config["cor_texto_placar"]
-    cor_marcadores = config.get("cor_marcadores", cor_texto)
-
-    draw = ImageDraw.Draw(base)
-
-    # Redimensionar escudos com proporção preservada
-    escudo_home = redimensionar_escudo(obter_escudo_path(escudo_casa), config["tamanho_escudo"])
-    escudo_away = redimensionar_escudo(obter_escudo_path(escudo_fora), config["tamanho_escudo"])
-
-    # Posição dos escudos
-    pos_escudo_casa = config["pos_escudo_casa"]
-    pos_escudo_fora_raw = config["pos_escudo_fora"]
-    pos_escudo_fora = (
-        base.width + pos_escudo_fora_raw[0] if pos_escudo_fora_raw[0] < 0 else pos_escudo_fora_raw[0],
-        pos_escudo_fora_raw[1]
-    )
-
-    base.paste(escudo_home, pos_escudo_casa, escudo_home)
-    base.paste(escudo_away, pos_escudo_fora, escudo_away)
-    europeu = any(comp in path_lower for comp in ["ucl", "uel", "uecl"])
-    efl = any(comp in path_lower for comp in ["efl", "champ", "leagueone", "leaguetwo", "nationalleague"])
-    ing = any(comp in path_lower for comp in ["inglaterra"])
-
-    # 🏷️ Nomes dos times
-    for nome, pos_key in [(escudo_casa, "pos_nome_casa"), (escudo_fora, "pos_nome_fora")]:
-        pos = config.get(pos_key)
-        if not pos:
-            continue
-        
-        x, y = pos
-        if europeu and nome == "Nottingham Forest":
-            nome = "Nott'm Forest"
-        if europeu and nome == "Borussia Dortmund":
-            nome = "Bor. Dortmund"
-        if "facup" in path_lower and nome == "Queens Park Rangers":
-            nome = "QPR"
-        # Solicitação oficial do clube: exibir "Tottenham Hotspur" ou "Spurs", nunca "Tottenham"
-        if "premier" in path_lower and nome == "Tottenham Hotspur":
-            nome = "Spurs"
-        if "premier" in path_lower and nome == "Manchester United":
-            nome = "Manchester Utd"
-        if "premier" in path_lower and nome == "Newcastle United":
-            nome = "Newcastle Utd"
-        if "premier" in path_lower and nome == "Nottingham Forest":
-            nome = "Nott'm Forest"
-        nome_maiusculo = nome.upper()
-
-        # Decide a fonte (tamanho_nome no config tem prioridade)
-        if fonte_nome is not None:
-            fonte_usada = fonte_nome
-        elif any(comp in path_lower for comp in ["ucl", "uel", "uecl"]):
-            fonte_usada = fonte_normal
-        else:
-            fonte_usada = fonte_pequena
-
-        w_text = fonte_usada.getbbox(nome_maiusculo)[2] - fonte_usada.getbbox(nome_maiusculo)[0]
-
-        if config.get("alinhamento_nomes") == "lados":
-            # Mandante alinhado à esquerda; visitante à direita (x negativo = margem direita)
-            x_final = base.width + x - w_text if x < 0 else x
-        else:
-            # Centralizado na posição x
-            x_final = x - w_text // 2
-
-        # Desenha
-        if ing:
-            draw.text((x_final, y), nome_maiusculo, font=fonte_usada, fill=cor_texto)
-        else:
-            draw.text((x_final, y), nome_maiusculo, font=fonte_usada, fill=config.get("cor_texto_times", "white"))
-
-
-    # Placar principal centralizado
-    placar = placar_texto.split('(')[0].strip()
-
-    # Remove espaços ao redor de hífens
-    placar = re.sub(r'\s*-\s*', '-', placar)
-
-    if config.get("placar_dividido") and '-' in placar:
-        # Números separados nos dois lados da linha/escudo central do card
-        # pos_placar_split_x guarda o centro de cada número (anchor "mm" centraliza nos dois eixos)
-        placar_casa, placar_fora = placar.split('-', 1)
-        x_placar_casa, x_placar_fora = config["pos_placar_split_x"]
-        draw.text((x_placar_casa, config["pos_placar"]), placar_casa, font=fonte_bold, fill=cor_texto_placar, anchor="mm")
-        draw.text((x_placar_fora, config["pos_placar"]), placar_fora, font=fonte_bold, fill=cor_texto_placar, anchor="mm")
-    else:
-        w_placar = fonte_bold.getbbox(placar)[2] - fonte_bold.getbbox(placar)[0]
-        draw.text(((base.width - w_placar) // 2, config["pos_placar"]), placar, font=fonte_bold, fill=cor_texto_placar)
-
-    # Agregado ou pênaltis (centralizado)
-    # Posições do config têm prioridade sobre os padrões por competição
-    # (x negativo em pos_marcadores_fora = margem da borda direita)
-    pos_marc_casa = config.get("pos_marcadores_casa")
-    pos_marc_fora = config.get("pos_marcadores_fora")
-
-    # Nos cards de placar dividido (EFL Cup, Championship, League One, League Two)
-    # o texto de agregado/pênaltis fica escondido atrás do escudo/placar central se
-    # desenhado na posição padrão — em vez disso, ocupa o lugar onde os marcadores
-    # ficariam e empurra os marcadores um pouco mais para baixo.
-    agregado_abaixo_marcadores = bool(config.get("placar_dividido")) and pos_marc_casa is not None
-
-    if '(' in placar_texto and ')' in placar_texto:
-        conteudo = placar_texto.split('(')[1].replace(')', '').strip().lower()
-
-        if "agr" in conteudo:
-            label = "Agregado: "
-            valor = conteudo.replace("agr.", "").replace("agr", "").strip()
-        elif "pên" in conteudo:
-            label = "Pênaltis: "
-            valor = conteudo.replace("pên.", "").replace("pên", "").strip()
-        elif "pen" in conteudo:
-            label = "Pênaltis: "
-            valor = conteudo.replace("pen.", "").replace("pen", "").strip()
-        elif "pro" in conteudo:
-            label = "Prorrogação"
-            valor = ""
-        else:
-            label = ""
-            valor = conteudo  # fallback
-
-        agregado_texto = label + valor
-
-        path_lower = template_path.lower()
-        mais_pra_cima = any(comp in path_lower for comp in ["uel", "uecl", "efl", "championship", "leagueone", "leaguetwo", "nationalleague"])
-
-        if agregado_abaixo_marcadores:
-            y_agregado = pos_marc_casa[1]
-            # Um pouco maior que a fonte dos marcadores, para se destacar como informação extra
-            fonte_agregado = ImageFont.truetype(config["fonte_normal"], config.get("tamanho_marcadores", 26) + 4)
-        else:
-            y_agregado = 975 if mais_pra_cima else 985
-            fonte_agregado = fonte_mais_pequena
-
-        w_agr = fonte_agregado.getbbox(agregado_texto)[2] - fonte_agregado.getbbox(agregado_texto)[0]
-        draw.text(((base.width - w_agr) // 2, y_agregado), agregado_texto, font=fonte_agregado, fill=cor_texto)
-
-    # 🟩 Marcadores
-    espaco_linha = config.get("espaco_linha", 34)
-
-    tem_agregado = (
-        '(' in placar_texto and ')' in placar_texto and
-        any(x in placar_texto.split('(')[1].replace(')', '').strip().lower() for x in ["agr", "pên", "pen", "pro"])
-    )
-    if tem_agregado:
-        offset_agregado = 36 if agregado_abaixo_marcadores else 15
-    else:
-        offset_agregado = 0
-
-    if europeu:
-        y_base = 1000 + offset_agregado
-    elif efl:
-        y_base = 980 + offset_agregado
-    else:
-        y_base = 990 + offset_agregado
-
-    margem_padrao = 140 if europeu else 200
-    maiusculas = europeu or ing or config.get("placar_dividido")
-
-    y_casa = pos_marc_casa[1] + offset_agregado if pos_marc_casa else y_base
-    y_fora = pos_marc_fora[1] + offset_agregado if pos_marc_fora else y_base
-
-    # Nos cards de placar dividido, os marcadores ficam ancorados na borda interna
-    # (voltada para o centro) do próprio escudo: mandante alinhado à direita,
-    # visitante alinhado à esquerda — o oposto do padrão usado nos demais templates.
-    if config.get("placar_dividido"):
-        badge_w = config["tamanho_escudo"][0]
-        if pos_marc_casa:
-            x_casa_fim = pos_marc_casa[0]
-        else:
-            x_casa_fim = pos_escudo_casa[0] + badge_w
-        if pos_marc_fora:
-            x_fora_inicio = base.width + pos_marc_fora[0] if pos_marc_fora[0] < 0 else pos_marc_fora[0]
-        else:
-            x_fora_inicio = pos_escudo_fora[0]
-
-        # Mandante (alinhamento à direita)
-        for i, linha in enumerate(marcadores_casa.split('\n')):
-            if maiusculas:
-                linha = linha.upper()
-            w_linha = fonte_pequena.getbbox(linha)[2] - fonte_pequena.getbbox(linha)[0]
-            draw.text((x_casa_fim - w_linha, y_casa + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
-
-        # Visitante (alinhamento à esquerda)
-        for i, linha in enumerate(marcadores_fora.split('\n')):
-            if maiusculas:
-                linha = linha.upper()
-            draw.text((x_fora_inicio, y_fora + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
-    else:
-        x_casa = pos_marc_casa[0] if pos_marc_casa else margem_padrao
-        margem_fora = -pos_marc_fora[0] if pos_marc_fora else margem_padrao
-
-        # Casa (alinhamento à esquerda)
-        for i, linha in enumerate(marcadores_casa.split('\n')):
-            if maiusculas:
-                linha = linha.upper()
-            draw.text((x_casa, y_casa + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
-
-        # Visitante (alinhado à direita)
-        for i, linha in enumerate(marcadores_fora.split('\n')):
-            if maiusculas:
-                linha = linha.upper()
-            w_linha = fonte_pequena.getbbox(linha)[2] - fonte_pequena.getbbox(linha)[0]
-            draw.text((base.width - margem_fora - w_linha, y_fora + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
-
-    return base
-
-
 # ============================================================================
 # UTILITÁRIO: HISTÓRICO LOCAL
 # ============================================================================
 
-def is_already_in_historico(home_team: str, away_team: str, liga_str: str,
-                             match_date: str = None) -> bool:
-    """Returns True if (home_team, away_team, liga_str, temporada) exists in
-    data/historico.csv, where temporada is derived from match_date.
-
-    Fixture pairings repeat from one season to the next, so the check must be
-    scoped to the current season (the 'temporada' column) — otherwise a
-    new-season result gets treated as a duplicate of the same fixture played
-    the previous year.
-    """
-    path = "data/historico.csv"
-    if not os.path.exists(path):
-        return False
-
-    ref = datetime.strptime(match_date, '%Y-%m-%d') if match_date else datetime.now()
-    temporada_atual = _season_label(ref)
-
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if (row.get('casa') == home_team and
-                    row.get('fora') == away_team and
-                    row.get('liga') == liga_str and
-                    row.get('temporada') == temporada_atual):
-                return True
-    return False
-
-
+@perf.instrument()
 def _append_to_historico(resultados: list, data_rodada, liga_str: str) -> dict:
     """
     Adiciona resultados finalizados a data/historico.csv.
@@ -906,107 +740,95 @@ def render_table_mode():
 
     # Botão de processar
     if st.button("🔄 Processar Resultados", type="primary"):
-        if not resultados_texto.strip():
-            st.error("❌ Por favor, insira pelo menos um resultado!")
-            return
+        with perf.action("Processar Resultados"):
+            if not resultados_texto.strip():
+                st.error("❌ Por favor, insira pelo menos um resultado!")
+                return
         
-        # Parse dos resultados com suporte a prefixo de data (-N dias)
-        parser = ResultsParser()
-        _prefix_re = re.compile(r'^(-\d+)\s+')
-        resultados = []
-        for _line in resultados_texto.strip().split('\n'):
-            _line = _line.strip()
-            if not _line:
-                continue
-            _m = _prefix_re.match(_line)
-            if _m:
-                _days_offset = int(_m.group(1))
-                _resolved_date = data_rodada + timedelta(days=_days_offset)
-                _clean_line = _line[_m.end():]
-            else:
-                _resolved_date = data_rodada
-                _clean_line = _line
-            _result = parser.parse_single_result(_clean_line)
-            if _result:
-                _result['data'] = _resolved_date.strftime('%Y-%m-%d')
-                resultados.append(_result)
-
-        if not resultados:
-            st.error("❌ Nenhum resultado válido encontrado! Verifique o formato.")
-            return
+            # Parse dos resultados com suporte a prefixo de data (-N dias)
+            resultados = parse_results_text(resultados_texto, data_rodada,
+                                            parser=obter_parser_resultados())
+
+            if not resultados:
+                st.error("❌ Nenhum resultado válido encontrado! Verifique o formato.")
+                return
         
-        # Mostrar resultados parseados
-        st.success(f"✅ {len(resultados)} resultado(s) processado(s)!")
+            # Mostrar resultados parseados
+            st.success(f"✅ {len(resultados)} resultado(s) processado(s)!")
         
-        with st.expander("Ver resultados parseados"):
-            for r in resultados:
-                status = r.get('status', 'normal')
-                _date_label = ""
-                if 'data' in r:
-                    from datetime import date as _date_cls
-                    _d = _date_cls.fromisoformat(r['data'])
-                    _date_label = f" — {_d.strftime('%d/%m')}"
-
-                if status == 'normal':
-                    st.write(f"**{r['home_team']}** {r['home_score']}-{r['away_score']} **{r['away_team']}**{_date_label}")
-                elif status == 'penalties':
-                    st.write(f"**{r['home_team']}** {r['home_score']}-{r['away_score']} **{r['away_team']}** (Pênaltis: {r['pen_home']}-{r['pen_away']}) 🥅{_date_label}")
-                elif status == 'extra_time':
-                    st.write(f"**{r['home_team']}** {r['home_score']}-{r['away_score']} **{r['away_team']}** (Prorrogação) ⏱️{_date_label}")
-                elif status == 'future':
-                    st.write(f"**{r['home_team']}** vs **{r['away_team']}** - ⏰ *Jogo futuro*{_date_label}")
-                elif status == 'vs':
-                    st.write(f"**{r['home_team']}** vs. **{r['away_team']}** - 🆚 *Jogo a realizar*{_date_label}")
-                elif status == 'postponed':
-                    st.write(f"**{r['home_team']}** vs **{r['away_team']}** - 🔄 *Adiado*{_date_label}")
-                elif status == 'abandoned':
-                    st.write(f"**{r['home_team']}** vs **{r['away_team']}** - ⚠️ *Abandonado*{_date_label}")
-        # Salvar na sessão
-        st.session_state['resultados_parseados'] = resultados
-        st.session_state['tipo_rodada'] = tipo_rodada
-        st.session_state['numero_rodada'] = numero_rodada
-        st.session_state['liga_selecionada'] = liga_key
-        st.session_state['data_rodada'] = data_rodada
+            with st.expander("Ver resultados parseados"):
+                for r in resultados:
+                    status = r.get('status', 'normal')
+                    _date_label = ""
+                    if 'data' in r:
+                        from datetime import date as _date_cls
+                        _d = _date_cls.fromisoformat(r['data'])
+                        _date_label = f" — {_d.strftime('%d/%m')}"
+
+                    if status == 'normal':
+                        st.write(f"**{r['home_team']}** {r['home_score']}-{r['away_score']} **{r['away_team']}**{_date_label}")
+                    elif status == 'penalties':
+                        st.write(f"**{r['home_team']}** {r['home_score']}-{r['away_score']} **{r['away_team']}** (Pênaltis: {r['pen_home']}-{r['pen_away']}) 🥅{_date_label}")
+                    elif status == 'extra_time':
+                        st.write(f"**{r['home_team']}** {r['home_score']}-{r['away_score']} **{r['away_team']}** (Prorrogação) ⏱️{_date_label}")
+                    elif status == 'future':
+                        st.write(f"**{r['home_team']}** vs **{r['away_team']}** - ⏰ *Jogo futuro*{_date_label}")
+                    elif status == 'vs':
+                        st.write(f"**{r['home_team']}** vs. **{r['away_team']}** - 🆚 *Jogo a realizar*{_date_label}")
+                    elif status == 'postponed':
+                        st.write(f"**{r['home_team']}** vs **{r['away_team']}** - 🔄 *Adiado*{_date_label}")
+                    elif status == 'abandoned':
+                        st.write(f"**{r['home_team']}** vs **{r['away_team']}** - ⚠️ *Abandonado*{_date_label}")
+            # Salvar na sessão
+            st.session_state['resultados_parseados'] = resultados
+            st.session_state['tipo_rodada'] = tipo_rodada
+            st.session_state['numero_rodada'] = numero_rodada
+            st.session_state['liga_selecionada'] = liga_key
+            st.session_state['data_rodada'] = data_rodada
         
-        # Limpar imagens anteriores
-        if 'imagem_rodada_gerada' in st.session_state:
-            del st.session_state['imagem_rodada_gerada']
-        if 'imagem_tabela_gerada' in st.session_state:
-            del st.session_state['imagem_tabela_gerada']
-        if 'table_data_atual' in st.session_state:
-            del st.session_state['table_data_atual']
-
-        # Step 2 — pre-compute table so mathematical situations are available
-        # immediately after "Processar Resultados" without needing "Gerar Tabela"
-        try:
-            _td = compute_updated_table(liga_key, resultados)
-            st.session_state['table_data_atual'] = _td
-        except Exception:
-            pass  # silently skip if table file is unavailable
-
-        # Step 3 — pre-fill confirmation checkboxes with confirmed statuses.
-        # A Premier League usa template com zonas fixas (baked_template), então
-        # não há confirmações de classificação a pré-preencher.
-        if liga_key != 'premierleague':
-            # Reset the champion key first so stale True values from a previous batch don't persist
-            _champion_key = {
-                'championship': 'ch_1_champion',
-                'leagueone': 'l1_1_champion',
-                'leaguetwo': 'l2_1_champion',
-                'nationalleague': 'nl_1_champion',
-            }.get(liga_key)
-            if _champion_key:
-                st.session_state[_champion_key] = False
+            # Limpar imagens anteriores
+            for _chave in ('imagem_rodada_gerada', 'download_rodada', 'arte_rodada',
+                           'imagem_tabela_gerada', 'download_tabela', 'arte_tabela',
+                           'animacao_tabela'):
+                st.session_state.pop(_chave, None)
             if 'table_data_atual' in st.session_state:
-                try:
-                    compute_mathematical_prefill(liga_key, st.session_state['table_data_atual'])
-                except Exception:
-                    pass
+                del st.session_state['table_data_atual']
+
+            # Step 2 — pre-compute table so mathematical situations are available
+            # immediately after "Processar Resultados" without needing "Gerar Tabela"
+            try:
+                _td = compute_updated_table(liga_key, resultados)
+                st.session_state['table_data_atual'] = _td
+            except Exception:
+                pass  # silently skip if table file is unavailable
+
+            # Step 3 — pre-fill confirmation checkboxes with confirmed statuses.
+            # A Premier League usa template com zonas fixas (baked_template), então
+            # não há confirmações de classificação a pré-preencher.
+            if liga_key != 'premierleague':
+                # Reset the champion key first so stale True values from a previous batch don't persist
+                _champion_key = {
+                    'championship': 'ch_1_champion',
+                    'leagueone': 'l1_1_champion',
+                    'leaguetwo': 'l2_1_champion',
+                    'nationalleague': 'nl_1_champion',
+                }.get(liga_key)
+                if _champion_key:
+                    st.session_state[_champion_key] = False
+                if 'table_data_atual' in st.session_state:
+                    try:
+                        compute_mathematical_prefill(liga_key, st.session_state['table_data_atual'])
+                    except Exception:
+                        pass
 
     # ========================================================================
     # SE RESULTADOS FORAM PROCESSADOS, MOSTRAR OPÇÕES
     # ========================================================================
     if 'resultados_parseados' in st.session_state:
+        # Tabelas oficiais de todas as ligas baixadas em paralelo, em segundo
+        # plano, enquanto a tabela é configurada: a validação só lê o cache
+        obter_validador_tabelas().prefetch_all()
+
         st.divider()
         st.subheader("📋 Configurar Tabela")
         
@@ -1031,100 +853,158 @@ def render_table_mode():
         
         with col1:
             if st.button("📸 Gerar Imagem da Rodada", type="primary", width='stretch'):
-                generator = ImageGenerator()
-                try:
-                    generator = ImageGenerator()
-                    
-                    img = generator.generate_results_image(
-                        league=st.session_state['liga_selecionada'],
-                        results=st.session_state['resultados_parseados'],
-                        round_number=st.session_state.get('numero_rodada'),
-                        is_postponed=st.session_state['tipo_rodada'] == "Jogos Atrasados"
-                    )
-                    
-                    # Salvar na sessão
-                    st.session_state['imagem_rodada_gerada'] = img
-                    st.success("✅ Imagem da rodada gerada com sucesso!")
+                with perf.action("Gerar Imagem da Rodada"):
+                    try:
+                        generator = obter_gerador_imagens()
+                        entradas = {
+                            'league': st.session_state['liga_selecionada'],
+                            'results': st.session_state['resultados_parseados'],
+                            'round_number': st.session_state.get('numero_rodada'),
+                            'is_postponed': st.session_state['tipo_rodada'] == "Jogos Atrasados",
+                        }
+
+                        # Última arte de cada escala nesta sessão: corrigir um placar
+                        # repinta só o jogo alterado
+                        from utils.image_generator import ResultsRenderState
+                        estados = st.session_state.setdefault('estados_rodada', {})
+
+                        def gerar(escala: float) -> Image.Image:
+                            estado = estados.setdefault(escala, ResultsRenderState())
+                            return generator.generate_results_image(
+                                **entradas, scale=escala, state=estado
+                            ).convert("RGB")
+
+                        # Prévia reduzida agora; resolução final só no download.
+                        # Mesmas entradas → mesma imagem (volta direto do cache)
+                        st.session_state['imagem_rodada_gerada'] = renderizar_em_cache(
+                            "resultados", entradas, gerar, PREVIEW_SCALE
+                        )
+                        st.session_state['download_rodada'] = functools.partial(
+                            download_versao_final, "resultados", entradas, gerar
+                        )
+                        st.session_state['arte_rodada'] = (entradas, gerar)
+                        st.success("✅ Imagem da rodada gerada com sucesso!")
                     
-                except Exception as e:
-                    st.error(f"❌ Erro ao gerar imagem: {str(e)}")
+                    except Exception as e:
+                        st.error(f"❌ Erro ao gerar imagem: {str(e)}")
         
         with col2:
             if st.button("📊 Gerar Imagem da Tabela", type="primary", width='stretch'):
-                try:
-                    table_data = compute_updated_table(
-                        st.session_state['liga_selecionada'],
-                        st.session_state['resultados_parseados']
-                    )
+                with perf.action("Gerar Imagem da Tabela"):
+                    try:
+                        table_data = compute_updated_table(
+                            st.session_state['liga_selecionada'],
+                            st.session_state['resultados_parseados']
+                        )
 
-                    # Coletar confirmações
-                    confirmations = collect_confirmations(st.session_state['liga_selecionada'])
-
-                    # Gerar imagem
-                    generator = ImageGenerator()
-                    img = generator.generate_table_image(
-                        league=st.session_state['liga_selecionada'],
-                        table_data=table_data,
-                        confirmations=confirmations,
-                        table_mode=st.session_state.get('table_mode'),
-                        round_number=st.session_state.get('numero_rodada')
-                    )
+                        # Coletar confirmações
+                        confirmations = collect_confirmations(st.session_state['liga_selecionada'])
+
+                        # Gerar imagem (ou reaproveitar do cache)
+                        generator = obter_gerador_imagens()
+                        entradas = {
+                            'league': st.session_state['liga_selecionada'],
+                            'table_data': table_data,
+                            'confirmations': confirmations,
+                            'table_mode': st.session_state.get('table_mode'),
+                            'round_number': st.session_state.get('numero_rodada'),
+                        }
+                        def gerar(escala: float) -> Image.Image:
+                            return generator.generate_table_image(**entradas, scale=escala)
+
+                        png_bytes = renderizar_em_cache("tabela", entradas, gerar, PREVIEW_SCALE)
                     
-                    # ================================================================
-                    # VALIDAÇÃO DA TABELA (ANTES DE SALVAR)
-                    # ================================================================
-                    validator = TableValidator()
+                        # ================================================================
+                        # VALIDAÇÃO DA TABELA (ANTES DE SALVAR)
+                        # ================================================================
+                        validator = obter_validador_tabelas()
 
-                    has_divergences = False 
+                        has_divergences = False 
                     
-                    # 1. Verificar times repetidos
-                    num_teams = len(table_data)  # Usar o número de times da tabela
-                    is_valid, warnings = validator.validate_results(
-                        st.session_state['resultados_parseados'],
-                        num_teams
-                    )
+                        # 1. Verificar times repetidos
+                        num_teams = len(table_data)  # Usar o número de times da tabela
+                        is_valid, warnings = validator.validate_results(
+                            st.session_state['resultados_parseados'],
+                            num_teams
+                        )
                     
-                    if warnings:
-                        for warning in warnings:
-                            st.warning(warning)
+                        if warnings:
+                            for warning in warnings:
+                                st.warning(warning)
                     
-                    # 2. Comparar com tabela oficial
-                    with st.spinner("🔍 Validando tabela com fonte oficial..."):
-                        official_table = validator.fetch_official_table(st.session_state['liga_selecionada'])
-
-                    if official_table is not None and not official_table.empty:
-                        divergencias = validator.compare_tables(table_data, official_table)
+                        # 2. Comparar com tabela oficial
+                        with st.spinner("🔍 Validando tabela com fonte oficial..."):
+                            validator.wait_prefetch(timeout=15)
+                            official_table = validator.fetch_official_table(st.session_state['liga_selecionada'])
+
+                        if official_table is not None and not official_table.empty:
+                            from utils.team_matcher import TeamMatcher
+                            matcher = TeamMatcher([team['name'] for team in table_data])
+                            divergencias = validator.compare_tables(table_data, official_table, matcher)
+                            # Nomes associados por aproximação: confirmados no painel abaixo
+                            if matcher.fuzzy_matches:
+                                st.session_state['nomes_aproximados'] = matcher
+                            else:
+                                st.session_state.pop('nomes_aproximados', None)
                         
-                        if divergencias.empty:
-                            st.success("✅ Tabela validada! Nenhuma divergência encontrada.")
-                            has_divergences = False
-                        else:
-                            st.error("❌ Divergências encontradas com a fonte oficial:")
-                            has_divergences = True
+                            if divergencias.empty:
+                                st.success("✅ Tabela validada! Nenhuma divergência encontrada.")
+                                has_divergences = False
+                            else:
+                                st.error("❌ Divergências encontradas com a fonte oficial:")
+                                has_divergences = True
                             
-                            # Mostrar divergências em formato tabela
-                            colunas_exibir = ['Time', 'J_calculado', 'J_oficial', 'Pts_calculado', 'Pts_oficial', 
-                                            'SG_calculado', 'SG_oficial']
+                                # Mostrar divergências em formato tabela
+                                colunas_exibir = ['Time', 'J_calculado', 'J_oficial', 'Pts_calculado', 'Pts_oficial', 
+                                                'SG_calculado', 'SG_oficial']
                             
-                            # Só mostrar colunas que existem
-                            colunas_exibir = [col for col in colunas_exibir if col in divergencias.columns]
+                                # Só mostrar colunas que existem
+                                colunas_exibir = [col for col in colunas_exibir if col in divergencias.columns]
                             
-                            st.dataframe(divergencias[colunas_exibir], width='stretch')
-                    else:
-                        st.info("ℹ️ Não foi possível buscar a tabela oficial para validação (verifique sua conexão).")
-                        has_divergences = False
+                                st.dataframe(divergencias[colunas_exibir], width='stretch')
+                        else:
+                            st.info("ℹ️ Não foi possível buscar a tabela oficial para validação (verifique sua conexão).")
+                            has_divergences = False
                     
-                    # ================================================================
-                    # Salvar na sessão
-                    st.session_state['imagem_tabela_gerada'] = img
-                    # tabela_processada already set by compute_updated_table
-                    st.session_state['table_data_atual'] = table_data
+                        # ================================================================
+                        # Salvar na sessão
+                        st.session_state['imagem_tabela_gerada'] = png_bytes
+                        st.session_state['download_tabela'] = functools.partial(
+                            download_versao_final, "tabela", entradas, gerar
+                        )
+                        st.session_state['arte_tabela'] = (entradas, gerar)
+                        st.session_state.pop('animacao_tabela', None)
+                        # tabela_processada already set by compute_updated_table
+                        st.session_state['table_data_atual'] = table_data
                     
-                    if not has_divergences or official_table is None:
-                        st.success("✅ Imagem da tabela gerada com sucesso!")
+                        if not has_divergences or official_table is None:
+                            st.success("✅ Imagem da tabela gerada com sucesso!")
                     
-                except Exception as e:
-                    st.error(f"❌ Erro ao gerar tabela: {str(e)}")
+                    except Exception as e:
+                        st.error(f"❌ Erro ao gerar tabela: {str(e)}")
+
+        # Nomes da fonte oficial associados por aproximação na última validação:
+        # confirmados aqui, ficam memorizados e não passam mais pelo fuzzy
+        matcher = st.session_state.get('nomes_aproximados')
+        if matcher is not None and matcher.fuzzy_matches:
+            with st.expander("🔤 Nomes da fonte oficial associados por aproximação", expanded=False):
+                st.caption("Confirme (ou corrija) cada associação para memorizá-la.")
+                for nome_oficial, (palpite, pontuacao) in list(matcher.fuzzy_matches.items()):
+                    col_nome, col_time, col_ok = st.columns([3, 3, 1])
+                    col_nome.markdown(f"**{nome_oficial}** ({pontuacao}%)")
+                    escolhido = col_time.selectbox(
+                        "Time", matcher.candidates,
+                        index=matcher.candidates.index(palpite),
+                        key=f"nome_aproximado_{nome_oficial}",
+                        label_visibility="collapsed",
+                    )
+                    if col_ok.button("✅", key=f"confirmar_nome_{nome_oficial}"):
+                        matcher.remember(nome_oficial, escolhido)
+                        st.rerun()
+                if st.button("🗑️ Esquecer todos os nomes confirmados", key="esquecer_nomes"):
+                    matcher.clear_remembered()
+                    st.session_state.pop('nomes_aproximados', None)
+                    st.rerun()
         
         # ====================================================================
         # MOSTRAR IMAGENS GERADAS
@@ -1132,201 +1012,264 @@ def render_table_mode():
         if 'imagem_rodada_gerada' in st.session_state or 'imagem_tabela_gerada' in st.session_state:
             st.divider()
             st.subheader("📷 Preview das Imagens")
+            exportacao = opcoes_exportacao("tabela")
+
+            # MAPEAR PREFIXOS
+            prefixos = {
+                'premierleague': 'PL',
+                'championship': 'CH',
+                'leagueone': 'L1',
+                'leaguetwo': 'L2',
+                'nationalleague': 'NL'
+            }
             
             col1, col2 = st.columns(2)
             
             with col1:
                 if 'imagem_rodada_gerada' in st.session_state:
-                    st.image(st.session_state['imagem_rodada_gerada'], caption="Imagem da Rodada")
-                    
-                    # Salvar e oferecer download
-                    img_rgb = st.session_state['imagem_rodada_gerada'].convert("RGB")
-                    img_rgb.save("rodada.png", format="PNG")
-                    
-                    with open("rodada.png", "rb") as f:
-                        rodada_num = st.session_state.get('numero_rodada')
-                        tipo_rodada_atual = st.session_state.get('tipo_rodada', 'Rodada')
-
-                        # MAPEAR PREFIXOS
-                        prefixos = {
-                            'premierleague': 'PL',
-                            'championship': 'CH',
-                            'leagueone': 'L1',
-                            'leaguetwo': 'L2',
-                            'nationalleague': 'NL'
-                        }
+                    st.image(st.session_state['imagem_rodada_gerada'], caption="Imagem da Rodada (prévia — o download sai em resolução final)")
 
-                        liga_key = st.session_state['liga_selecionada']
-                        prefixo = prefixos.get(liga_key, 'XX')
-                        rodada_seg = "AD" if tipo_rodada_atual == "Jogos Atrasados" else f"M{rodada_num}"
-
-                        st.download_button(
-                            "📥 Baixar Imagem da Rodada",
-                            f,
-                            file_name=f"{prefixo}-{rodada_seg}-R.png",
-                            width='stretch'
-                        )
+                    # Oferecer download (bytes da sessão)
+                    rodada_num = st.session_state.get('numero_rodada')
+                    tipo_rodada_atual = st.session_state.get('tipo_rodada', 'Rodada')
+
+                    liga_key = st.session_state['liga_selecionada']
+                    prefixo = prefixos.get(liga_key, 'XX')
+                    rodada_seg = "AD" if tipo_rodada_atual == "Jogos Atrasados" else f"M{rodada_num}"
+
+                    st.download_button(
+                        "📥 Baixar Imagem da Rodada",
+                        st.session_state['download_rodada'](exportacao),
+                        file_name=f"{prefixo}-{rodada_seg}-R.{exportacao.extension}",
+                        mime=exportacao.mime,
+                        width='stretch'
+                    )
             
             with col2:
                 if 'imagem_tabela_gerada' in st.session_state:
-                    st.image(st.session_state['imagem_tabela_gerada'], caption="Imagem da Tabela")
-                    
-                    # Salvar como PNG
-                    st.session_state['imagem_tabela_gerada'].save("tabela.png", format="PNG")
-                    
-                    with open("tabela.png", "rb") as f:
-                        rodada_num = st.session_state.get('numero_rodada')
-                        tipo_rodada_atual = st.session_state.get('tipo_rodada', 'Rodada')
-
-                        # MAPEAR PREFIXOS
-                        prefixos = {
-                            'premierleague': 'PL',
-                            'championship': 'CH',
-                            'leagueone': 'L1',
-                            'leaguetwo': 'L2',
-                            'nationalleague': 'NL'
-                        }
+                    st.image(st.session_state['imagem_tabela_gerada'], caption="Imagem da Tabela (prévia — o download sai em resolução final)")
+
+                    # Oferecer download (bytes da sessão)
+                    rodada_num = st.session_state.get('numero_rodada')
+                    tipo_rodada_atual = st.session_state.get('tipo_rodada', 'Rodada')
+
+                    liga_key = st.session_state['liga_selecionada']
+                    prefixo = prefixos.get(liga_key, 'XX')
+                    rodada_seg = "AD" if tipo_rodada_atual == "Jogos Atrasados" else f"M{rodada_num}"
+
+                    st.download_button(
+                        "📥 Baixar Tabela",
+                        st.session_state['download_tabela'](exportacao),
+                        file_name=f"{prefixo}-{rodada_seg}-T.{exportacao.extension}",
+                        mime=exportacao.mime,
+                        width='stretch'
+                    )
+            
+            # ================================================================
+            # TODOS OS FORMATOS (FEED, STORY, PAISAGEM) NUM ZIP
+            # ================================================================
+            perfis_layout = obter_perfis_layout()
+            artes_geradas = {
+                sufixo: st.session_state[chave]
+                for chave, sufixo in (('arte_rodada', 'R'), ('arte_tabela', 'T'))
+                if chave in st.session_state
+            }
+            if perfis_layout and artes_geradas:
+                perfis_escolhidos = st.multiselect(
+                    "Formatos",
+                    list(perfis_layout),
+                    default=list(perfis_layout),
+                    format_func=lambda p: perfis_layout[p].get('label', p),
+                    key="perfis_layout_tabela",
+                    help="Cada arte é desenhada uma vez e adaptada a cada formato "
+                         "(fundo desfocado nas sobras)"
+                )
+                if perfis_escolhidos:
+                    prefixo = prefixos.get(st.session_state['liga_selecionada'], 'XX')
+                    rodada_seg = ("AD" if st.session_state.get('tipo_rodada') == "Jogos Atrasados"
+                                  else f"M{st.session_state.get('numero_rodada')}")
+                    st.download_button(
+                        "📦 Baixar em todos os formatos (ZIP)",
+                        download_perfis(
+                            {f"{prefixo}-{rodada_seg}-{sufixo}": arte
+                             for sufixo, arte in artes_geradas.items()},
+                            perfis_escolhidos, exportacao
+                        ),
+                        file_name=f"{prefixo}-{rodada_seg}-formatos.zip",
+                        mime="application/zip",
+                        width='stretch'
+                    )
+
+            # ================================================================
+            # ANIMAÇÃO DA TABELA (POSIÇÕES DA RODADA ANTERIOR → ATUAIS)
+            # ================================================================
+            if 'arte_tabela' in st.session_state:
+                st.divider()
+                entradas_tabela, _ = st.session_state['arte_tabela']
+
+                if st.button("🎞️ Gerar Animação da Tabela", width='stretch'):
+                    with perf.action("Gerar Animação da Tabela"):
+                        from utils.position_history import previous_positions
+                        from utils.standings_animation import start_rows
 
                         liga_key = st.session_state['liga_selecionada']
-                        prefixo = prefixos.get(liga_key, 'XX')
-                        rodada_seg = "AD" if tipo_rodada_atual == "Jogos Atrasados" else f"M{rodada_num}"
-
-                        st.download_button(
-                            "📥 Baixar Tabela",
-                            f,
-                            file_name=f"{prefixo}-{rodada_seg}-T.png",
-                            width='stretch'
+                        anteriores = previous_positions(
+                            LIGA_DISPLAY_NAMES.get(liga_key, liga_key),
+                            [team['name'] for team in entradas_tabela['table_data']]
                         )
-            
+                        if not anteriores:
+                            st.session_state.pop('animacao_tabela', None)
+                            st.info("ℹ️ Não há posições da rodada anterior em posicoes.csv para animar.")
+                        else:
+                            generator = obter_gerador_imagens()
+                            linhas_iniciais = start_rows(entradas_tabela['table_data'], anteriores)
+                            st.session_state['animacao_tabela'] = (
+                                animacao_em_cache(generator, entradas_tabela, linhas_iniciais,
+                                                  PREVIEW_SCALE, "gif"),
+                                functools.partial(download_animacao, generator,
+                                                  entradas_tabela, linhas_iniciais)
+                            )
+
+                if 'animacao_tabela' in st.session_state:
+                    from utils.animated_export import ANIMATION_FORMATS
+
+                    previa_animacao, download_anim = st.session_state['animacao_tabela']
+                    st.image(previa_animacao, caption="Animação da Tabela (prévia — o download sai em resolução final)")
+
+                    formato_animacao = st.radio(
+                        "Formato da animação",
+                        list(ANIMATION_FORMATS),
+                        format_func=str.upper,
+                        horizontal=True,
+                        key="formato_animacao",
+                        help="GIF abre em qualquer lugar; WebP mantém as cores exatas da tabela"
+                    )
+                    extensao_anim, mime_anim = ANIMATION_FORMATS[formato_animacao]
+                    prefixo = prefixos.get(st.session_state['liga_selecionada'], 'XX')
+                    rodada_seg = ("AD" if st.session_state.get('tipo_rodada') == "Jogos Atrasados"
+                                  else f"M{st.session_state.get('numero_rodada')}")
+                    st.download_button(
+                        "📥 Baixar Animação da Tabela",
+                        download_anim(formato_animacao),
+                        file_name=f"{prefixo}-{rodada_seg}-T-animada.{extensao_anim}",
+                        mime=mime_anim,
+                        width='stretch'
+                    )
+
             # ================================================================
             # BOTÃO ÚNICO: FECHAR RODADA + ATUALIZAR GITHUB
             # ================================================================
             st.divider()
 
             if st.button("☁️ Atualizar Tabelas e Histórico no GitHub", type="primary", width='stretch'):
-                if 'tabela_processada' not in st.session_state:
-                    st.error("❌ Gere a tabela primeiro!")
-                elif 'GITHUB_TOKEN' not in st.secrets or 'GITHUB_REPO' not in st.secrets:
-                    st.error("❌ Configure GITHUB_TOKEN e GITHUB_REPO em .streamlit/secrets.toml")
-                else:
-                    _liga_key_uni = st.session_state.get('liga_selecionada')
-                    _liga_str_uni = LIGA_DISPLAY_NAMES.get(_liga_key_uni, _liga_key_uni)
-                    rodada_info = st.session_state.get('numero_rodada', 'atrasados')
-                    num_resultados = len(st.session_state['resultados_parseados'])
-                    liga_nome = _liga_key_uni.upper()
-                    commit_msg = f"[{liga_nome}] Rodada {rodada_info} - {num_resultados} jogo(s)"
-
-                    _summary = []
-                    _errors = []
-
-                    with st.spinner("Processando..."):
-
-                        # ── PASSO 1: Salvar histórico local ──────────────────────────
-                        # Must run BEFORE fechar rodada so that detect_matchdays
-                        # sees the new results when computing the current matchday.
-                        hist_result = _append_to_historico(
-                            st.session_state['resultados_parseados'],
-                            st.session_state.get('data_rodada', date.today()),
-                            _liga_str_uni
-                        )
-                        n_hist = hist_result['added']
-                        if hist_result['conflicts']:
-                            st.session_state['historico_conflitos'] = hist_result['conflicts']
-                            st.session_state['historico_conflitos_liga'] = _liga_key_uni
-                            st.warning(f"⚠️ {len(hist_result['conflicts'])} resultado(s) com placar diferente do registrado. Verifique abaixo.")
-
-                        # ── PASSO 2: Fechar rodada (posicoes.csv local) ──────────────
-                        _current_md = None
-                        _data_fim_uni = None
-                        _added_pos = 0
-                        try:
-                            from datetime import date as _date_cls
-                            _today = _date_cls.today()
-                            _md_map = detect_matchdays(_liga_str_uni)
-                            if not _md_map:
-                                _errors.append("Nenhum dado histórico encontrado para fechar rodada.")
-                            else:
-                                for _md_num in sorted(_md_map.keys(), reverse=True):
-                                    _last_date = max(
-                                        _date_cls.fromisoformat(d)
-                                        for d in _md_map[_md_num]
-                                    )
-                                    if _last_date <= _today:
-                                        _current_md = _md_num
-                                        _data_fim_uni = _last_date.strftime("%Y-%m-%d")
-                                        break
-                                if _current_md is None:
-                                    _errors.append("Nenhum matchday passado encontrado para registrar.")
-                                elif 'table_data_atual' not in st.session_state:
-                                    _errors.append("Gere a imagem da tabela antes de atualizar.")
-                                else:
-                                    _positions_uni = {
-                                        team['name']: team['position']
-                                        for team in st.session_state['table_data_atual']
-                                    }
-                                    _added_pos = append_matchday_positions(
-                                        _liga_str_uni,
-                                        _positions_uni,
-                                        _data_fim_uni,
-                                    )
-                                    _summary.append(
-                                        f"Rodada fechada ({_added_pos} times, data fim: {_data_fim_uni})"
-                                    )
-                        except Exception as _e_pos:
-                            _errors.append(f"Erro ao fechar rodada: {_e_pos}")
-
-                        # ── PASSO 3: Push para GitHub (commit único) ─────────────────
-                        try:
-                            github = GitHubHandler(
-                                token=st.secrets['GITHUB_TOKEN'],
-                                repo=st.secrets['GITHUB_REPO']
+                with perf.action("Atualizar Tabelas e Histórico no GitHub"):
+                    if 'tabela_processada' not in st.session_state:
+                        st.error("❌ Gere a tabela primeiro!")
+                    elif 'GITHUB_TOKEN' not in st.secrets or 'GITHUB_REPO' not in st.secrets:
+                        st.error("❌ Configure GITHUB_TOKEN e GITHUB_REPO em .streamlit/secrets.toml")
+                    else:
+                        _liga_key_uni = st.session_state.get('liga_selecionada')
+                        _liga_str_uni = LIGA_DISPLAY_NAMES.get(_liga_key_uni, _liga_key_uni)
+                        rodada_info = st.session_state.get('numero_rodada', 'atrasados')
+                        num_resultados = len(st.session_state['resultados_parseados'])
+                        liga_nome = _liga_key_uni.upper()
+                        commit_msg = f"[{liga_nome}] Rodada {rodada_info} - {num_resultados} jogo(s)"
+
+                        _summary = []
+                        _errors = []
+
+                        with st.spinner("Processando..."):
+
+                            # ── PASSO 1: Salvar histórico local ──────────────────────────
+                            # Must run BEFORE fechar rodada so that detect_matchdays
+                            # sees the new results when computing the current matchday.
+                            hist_result = _append_to_historico(
+                                st.session_state['resultados_parseados'],
+                                st.session_state.get('data_rodada', date.today()),
+                                _liga_str_uni
                             )
+                            n_hist = hist_result['added']
+                            if hist_result['conflicts']:
+                                st.session_state['historico_conflitos'] = hist_result['conflicts']
+                                st.session_state['historico_conflitos_liga'] = _liga_key_uni
+                                st.warning(f"⚠️ {len(hist_result['conflicts'])} resultado(s) com placar diferente do registrado. Verifique abaixo.")
+
+                            # ── PASSO 2: Fechar rodada (posicoes.csv local) ──────────────
+                            _current_md = None
+                            _data_fim_uni = None
+                            _added_pos = 0
+                            try:
+                                from datetime import date as _date_cls
+                                _today = _date_cls.today()
+                                _md_map = detect_matchdays(_liga_str_uni)
+                                if not _md_map:
+                                    _errors.append("Nenhum dado histórico encontrado para fechar rodada.")
+                                else:
+                                    for _md_num in sorted(_md_map.keys(), reverse=True):
+                                        _last_date = max(
+                                            _date_cls.fromisoformat(d)
+                                            for d in _md_map[_md_num]
+                                        )
+                                        if _last_date <= _today:
+                                            _current_md = _md_num
+                                            _data_fim_uni = _last_date.strftime("%Y-%m-%d")
+                                            break
+                                    if _current_md is None:
+                                        _errors.append("Nenhum matchday passado encontrado para registrar.")
+                                    elif 'table_data_atual' not in st.session_state:
+                                        _errors.append("Gere a imagem da tabela antes de atualizar.")
+                                    else:
+                                        _positions_uni = {
+                                            team['name']: team['position']
+                                            for team in st.session_state['table_data_atual']
+                                        }
+                                        _added_pos = append_matchday_positions(
+                                            _liga_str_uni,
+                                            _positions_uni,
+                                            _data_fim_uni,
+                                        )
+                                        _summary.append(
+                                            f"Rodada fechada ({_added_pos} times, data fim: {_data_fim_uni})"
+                                        )
+                            except Exception as _e_pos:
+                                _errors.append(f"Erro ao fechar rodada: {_e_pos}")
+
+                            # ── PASSO 3: Enviar ao GitHub em segundo plano (commit único) ──
+                            try:
+                                _gh_msg = (
+                                    f"{_liga_str_uni} — ({_data_fim_uni})"
+                                    if _current_md else commit_msg
+                                )
 
-                            _gh_msg = (
-                                f"{_liga_str_uni} — ({_data_fim_uni})"
-                                if _current_md else commit_msg
-                            )
+                                tabela_path_uni = f"data/tabelas/{_liga_key_uni}.txt"
+                                with open(tabela_path_uni, 'w', encoding='utf-8') as _ft:
+                                    _ft.write(st.session_state['tabela_processada'])
 
-                            tabela_path_uni = f"data/tabelas/{_liga_key_uni}.txt"
-                            with open(tabela_path_uni, 'w', encoding='utf-8') as _ft:
-                                _ft.write(st.session_state['tabela_processada'])
-
-                            with open(tabela_path_uni, 'r', encoding='utf-8') as _ft:
-                                _tab_content = _ft.read()
-                            with open("data/historico.csv", 'r', encoding='utf-8') as _fh:
-                                _hist_content = _fh.read()
-                            with open("data/posicoes.csv", 'r', encoding='utf-8') as _fp:
-                                _pos_content = _fp.read()
-
-                            _ok_multi = github.update_files(
-                                files=[
-                                    {"path": tabela_path_uni,
-                                     "content": _tab_content},
-                                    {"path": "data/historico.csv", "content": _hist_content},
-                                    {"path": "data/posicoes.csv", "content": _pos_content},
-                                ],
-                                message=_gh_msg,
-                            )
-                            if _ok_multi:
-                                _summary.append(f"Tabela, historico.csv e posicoes.csv enviados ({n_hist} novo(s))")
                                 try:
                                     rebuild_for_liga(_liga_str_uni)
                                     _summary.append("estatísticas atualizadas")
                                 except Exception:
                                     pass
-                            else:
-                                _errors.append("Falha ao enviar arquivos para o GitHub.")
 
-                            carregar_tabela_github.clear()
+                                enfileirar_github(
+                                    [tabela_path_uni, "data/historico.csv", "data/posicoes.csv",
+                                     "data/insights_cache.json"],
+                                    _gh_msg,
+                                )
+                                _summary.append(
+                                    f"Tabela, historico.csv e posicoes.csv salvos ({n_hist} novo(s)); "
+                                    "envio ao GitHub em andamento"
+                                )
+                                carregar_tabela_github.clear()
 
-                        except Exception as _e_gh:
-                            _errors.append(f"Erro de conexão com GitHub: {_e_gh}")
+                            except Exception as _e_gh:
+                                _errors.append(f"Erro ao salvar arquivos: {_e_gh}")
 
-                    for _err in _errors:
-                        st.error(f"❌ {_err}")
-                    if _summary:
-                        st.success("✅ " + " · ".join(_summary))
-                        st.balloons()
+                        for _err in _errors:
+                            st.error(f"❌ {_err}")
+                        if _summary:
+                            st.success("✅ " + " · ".join(_summary))
+                            st.balloons()
 
     # Conflict resolution — persists across reruns via session_state
     if st.session_state.get('historico_conflitos'):
@@ -1346,19 +1289,13 @@ def render_table_mode():
                     conflict['home_team'], conflict['away_team'],
                     conflict['liga'], conflict['new_score'], conflict['date_str']
                 )
-                try:
-                    github = GitHubHandler(st.secrets['GITHUB_TOKEN'], st.secrets['GITHUB_REPO'])
-                    with open("data/historico.csv", 'r', encoding='utf-8') as f:
-                        hist_content = f.read()
-                    _, hist_sha = github.get_file("data/historico.csv")
-                    github.update_file(
-                        "data/historico.csv", hist_content,
-                        f"[CORRECAO] {conflict['home_team']} {conflict['new_score']} {conflict['away_team']}",
-                        hist_sha
-                    )
-                    st.success(f"✅ Placar atualizado para {conflict['new_score']}.")
-                except Exception as e:
-                    st.warning(f"CSV atualizado localmente, mas não foi possível sincronizar: {e}")
+                if enfileirar_github(
+                    ["data/historico.csv"],
+                    f"[CORRECAO] {conflict['home_team']} {conflict['new_score']} {conflict['away_team']}",
+                ):
+                    st.success(f"✅ Placar atualizado para {conflict['new_score']}. Enviando ao GitHub.")
+                else:
+                    st.warning("CSV atualizado localmente, mas o GitHub não está configurado para sincronizar.")
             elif col3.button("❌ Ignorar", key=f"{key_base}_nao"):
                 pass  # drop from remaining
             else:
@@ -1372,45 +1309,10 @@ def compute_updated_table(liga_key: str, resultados: list) -> list:
     applies the remaining results, sorts the table, and returns a list of team dicts.
     As a side effect also stores st.session_state['tabela_processada'].
     """
-    processor = TableProcessor()
-    tabela_path = f"data/tabelas/{liga_key}.txt"
-    with open(tabela_path, 'r', encoding='utf-8') as f:
-        processor.load_from_text(f.read())
-
-    _liga_str = LIGA_DISPLAY_NAMES.get(liga_key, '')
-    _novos = [r for r in resultados
-              if not is_already_in_historico(r['home_team'], r['away_team'], _liga_str,
-                                              r.get('data'))]
-    processor.update_with_multiple_results(_novos)
-    processor.sort_table()
-
+    processor = load_table(liga_key)
+    apply_new_results(processor, liga_key, resultados)
     st.session_state['tabela_processada'] = processor.to_text()
-
-    table_data = []
-    for team in processor.teams:
-        team_dict = {
-            'name': team.name,
-            'position': team.position,
-            'games': team.games,
-            'wins': team.wins,
-            'draws': team.draws,
-            'losses': team.losses,
-            'goals_for': team.goals_for,
-            'goals_against': team.goals_against,
-            'goal_difference': team.goal_difference,
-            'points': team.points,
-        }
-        if team.name == "Sheffield Wednesday":
-            team_dict['penalty_note'] = "Sheffield Wednesday perdeu 18 pontos por adm. judicial e atraso de salários."
-        if team.name == "Leicester City":
-            team_dict['penalty_note'] = "Leicester City perdeu 6 pontos por violação das regras de lucratividade e sustentabilidade."
-        if team.name == "West Bromwich":
-            team_dict['penalty_note'] = "West Bromwich perdeu 2 pontos por violação das regras de lucratividade e sustentabilidade."
-        if liga_key == "championship" and team.name == "Southampton":
-            team_dict['penalty_note'] = "Southampton perdeu 4 pontos por Spygate."
-        table_data.append(team_dict)
-
-    return table_data
+    return build_table_data(processor, liga_key)
 
 
 def compute_mathematical_prefill(liga_key: str, table_data: list) -> None:
@@ -1962,27 +1864,18 @@ def render_confirmation_checkboxes_nationalleague():
 # UTILITÁRIOS — ESTATÍSTICAS
 # ============================================================================
 
-def process_badge_for_dark_mode(img_bytes: bytes) -> bytes:
-    """Inverts monochromatic dark badges so they remain visible in dark mode."""
-    import statistics
-    img = Image.open(io.BytesIO(img_bytes)).convert("RGBA")
-    pixels = list(img.getdata())
-    opaque = [(px[0], px[1], px[2]) for px in pixels if px[3] > 10]
-    if not opaque:
-        return img_bytes
-    all_channels = [v for p in opaque for v in p]
-    avg_brightness = sum(all_channels) / len(all_channels)
-    std_dev = statistics.stdev(all_channels)
-    if std_dev >= 30 or avg_brightness >= 80:
-        return img_bytes
-    r, g, b, a = img.split()
-    r = r.point(lambda x: 255 - x)
-    g = g.point(lambda x: 255 - x)
-    b = b.point(lambda x: 255 - x)
-    result = Image.merge("RGBA", (r, g, b, a))
-    out = io.BytesIO()
-    result.save(out, format="PNG")
-    return out.getvalue()
+def _build_badge_cache(badge_folder: str, teams: list) -> list:
+    """Returns dark-mode badge data URIs for each team ('' when the badge is missing)."""
+    from utils.badge_processing import load_dark_mode_badge
+
+    badge_cache = []
+    for team in teams:
+        processed = load_dark_mode_badge(f"{badge_folder}/{team}.png")
+        if processed is None:
+            badge_cache.append("")
+        else:
+            badge_cache.append(f"data:image/png;base64,{base64.b64encode(processed).decode()}")
+    return badge_cache
 
 
 def _get_recent_form(selected_team: str, liga_str: str, n: int = 5) -> list:
@@ -2464,18 +2357,9 @@ def render_stats_mode():
         _file_data = load_cached_stats(liga_str)
         if _file_data is not None:
             st.session_state['stats_cache'][liga_key] = _file_data
-            _badge_folder = _BADGE_FOLDERS.get(liga_key, "escudos-pl")
-            _badge_cache = []
-            for _team in _file_data['teams']:
-                _badge_path = f"{_badge_folder}/{_team}.png"
-                if os.path.exists(_badge_path):
-                    with open(_badge_path, "rb") as _f:
-                        _raw = _f.read()
-                    _b64 = base64.b64encode(process_badge_for_dark_mode(_raw)).decode()
-                    _badge_cache.append(f"data:image/png;base64,{_b64}")
-                else:
-                    _badge_cache.append("")
-            st.session_state['badges_cache'][liga_key] = _badge_cache
+            st.session_state['badges_cache'][liga_key] = _build_badge_cache(
+                _BADGE_FOLDERS.get(liga_key, "escudos-pl"), _file_data['teams']
+            )
 
     # ── Staleness indicator ───────────────────────────────────────────────────
     if is_stale(liga_str):
@@ -2489,45 +2373,26 @@ def render_stats_mode():
             st.caption(f"Atualizado em: {_meta['updated_at'].replace('T', ' ')}")
 
     if st.button("🔄 Atualizar Estatísticas", type="primary"):
-        with st.spinner("Calculando estatísticas..."):
-            try:
-                data = rebuild_for_liga(liga_str)
-                st.session_state['stats_cache'][liga_key] = data
-
-                # Pre-process and cache badge base64 strings eagerly
-                badge_folder = _BADGE_FOLDERS.get(liga_key, "escudos-pl")
-                badge_cache = []
-                for team in data['teams']:
-                    badge_path = f"{badge_folder}/{team}.png"
-                    if os.path.exists(badge_path):
-                        with open(badge_path, "rb") as _f:
-                            _raw = _f.read()
-                        _processed = process_badge_for_dark_mode(_raw)
-                        _b64 = base64.b64encode(_processed).decode()
-                        badge_cache.append(f"data:image/png;base64,{_b64}")
-                    else:
-                        badge_cache.append("")
-                st.session_state['badges_cache'][liga_key] = badge_cache
-
-                # Push insights_cache.json to GitHub so it survives app restarts
+        with perf.action("Atualizar Estatísticas"):
+            with st.spinner("Calculando estatísticas..."):
                 try:
-                    if hasattr(st, 'secrets') and 'GITHUB_TOKEN' in st.secrets:
-                        _gh = GitHubHandler(st.secrets['GITHUB_TOKEN'], st.secrets['GITHUB_REPO'])
-                        with open("data/insights_cache.json", "r", encoding="utf-8") as _f:
-                            _cache_content = _f.read()
-                        _gh.update_files(
-                            [{"path": "data/insights_cache.json", "content": _cache_content}],
-                            f"Update insights cache — {liga_str}",
-                        )
-                except Exception:
-                    pass
+                    data = rebuild_for_liga(liga_str)
+                    st.session_state['stats_cache'][liga_key] = data
+
+                    # Pre-process and cache badge base64 strings eagerly
+                    st.session_state['badges_cache'][liga_key] = _build_badge_cache(
+                        _BADGE_FOLDERS.get(liga_key, "escudos-pl"), data['teams']
+                    )
 
-                st.success("✅ Estatísticas atualizadas!")
-            except Exception as e:
-                st.error(f"❌ Erro ao calcular estatísticas: {e}")
-                import traceback
-                with st.expander("Detalhes do erro"):
-                    st.code(traceback.format_exc())
+                    # Push insights_cache.json to GitHub so it survives app restarts
+                    enfileirar_github(["data/insights_cache.json"], f"Update insights cache — {liga_str}")
+
+                    st.success("✅ Estatísticas atualizadas!")
+                except Exception as e:
+                    st.error(f"❌ Erro ao calcular estatísticas: {e}")
+                    import traceback
+                    with st.expander("Detalhes do erro"):
+                        st.code(traceback.format_exc())
 
     cache = st.session_state.get('stats_cache', {})
     if liga_key not in cache:
@@ -2622,6 +2487,8 @@ def render_stats_mode():
         with badges_col:
             images_b64 = st.session_state.get('badges_cache', {}).get(liga_key, [])
 
+            from streamlit_clickable_images import clickable_images
+
             clicked = clickable_images(
                 images_b64,
                 titles=all_teams,
@@ -2769,6 +2636,8 @@ def render_stats_mode():
             else:
                 _num_times = len(data.get('teams', []))
                 _max_pos = _num_times if _num_times > 0 else 24
+                import plotly.graph_objects as go
+
                 fig = go.Figure()
                 _team_color = TEAM_COLORS.get(selected_team, "white")
                 fig.add_trace(go.Scatter(
@@ -2826,27 +2695,94 @@ def render_stats_mode():
 
 
 # ============================================================================
-# INTERFACE PRINCIPAL
+# MODO PLACAR
 # ============================================================================
 
-st.set_page_config(
-    page_title="Gerador BBI",
-    page_icon="⚽",
-    layout="wide"
-)
+def render_placar_lote(template_escolhido):
+    """Um placar por jogo de uma rodada colada, baixados num único ZIP"""
+    resultados_texto = st.text_area(
+        "Cole os resultados (um por linha) e, se quiser, os marcadores",
+        placeholder="ARS 2-1 CHE\nC: Saka 12'\nC: Havertz 80'\nF: Palmer 45+2'\nLIV 1-1(4-3) EVE",
+        height=250,
+        help="Formato: ABV 1-0 XYZ. Abaixo de cada jogo, uma linha \"C: ...\" por marcador "
+             "do mandante e \"F: ...\" por marcador do visitante"
+    )
 
-st.title("⚽ Gerador de Conteúdo BBI")
+    background = st.file_uploader(
+        "Upload da imagem de fundo (opcional, usada em todos os placares)",
+        type=["png", "jpg", "jpeg", "webp", "avif"],
+        key="placar_lote_fundo"
+    )
+    alinhamento = st.select_slider(
+        "Posição horizontal da imagem de fundo:",
+        options=list(range(0, 101, 5)),
+        value=50,
+        key="placar_lote_alinhamento",
+    )
+    exportacao = opcoes_exportacao("placar_lote", formato_padrao="jpeg")
+
+    if st.button("🖼️ Gerar Placares da Rodada", type="primary"):
+        with perf.action("Gerar Placares da Rodada"):
+            jogos, ignoradas = parse_lote_placares(resultados_texto, obter_parser_resultados())
+            if ignoradas:
+                st.warning("⚠️ Linhas ignoradas (formato inválido ou jogo sem placar):\n\n"
+                           + "\n".join(f"- `{linha}`" for linha in ignoradas))
+            faltando = escudos_faltando(jogos)
+
+            bg_bytes = None
+            if background:
+                bg_bytes = background.getvalue()
+                try:
+                    open_background(bg_bytes)
+                except BackgroundTooLargeError:
+                    st.error("Imagem muito grande. Use uma imagem com menos de 100 MP.")
+                    st.stop()
+
+            if not jogos:
+                st.error("❌ Nenhum jogo com placar encontrado! Verifique o formato.")
+            elif faltando:
+                st.error("❌ Escudo não encontrado para: " + ", ".join(faltando))
+            else:
+                template_path = os.path.join(TEMPLATE_DIR, template_escolhido)
+                entradas = {
+                    'template': template_escolhido,
+                    'jogos': jogos,
+                    'background': bg_bytes,
+                    'alinhamento': alinhamento,
+                }
+
+                def gerar(arquivo, escala: float, exportacao_zip: ExportSettings) -> List[str]:
+                    return gerar_zip_placares(
+                        arquivo, template_path, jogos, exportacao_zip,
+                        background=bg_bytes, alinhamento=alinhamento, scale=escala
+                    )
 
-# Seleção do modo
-modo = st.radio(
-    "Escolha o modo:",
-    ["📰 Gerar Notícia", "🔢 Gerar Placar", "📊 Gerar Tabela com Resultados", "🏆 Gerar Copa", "📈 Estatísticas"],
-    horizontal=True
-)
+                with st.spinner(f"Desenhando {len(jogos)} placar(es)..."):
+                    zip_dados, arquivos = zip_em_cache(
+                        obter_cache_renders(), "placar_lote", entradas, gerar,
+                        PREVIEW_SCALE, PREVIEW_EXPORT
+                    )
 
-st.divider()
+                st.session_state['placar_lote_zip'] = zip_dados
+                st.session_state['placar_lote_arquivos'] = arquivos
+                st.session_state['placar_lote_download'] = functools.partial(
+                    download_zip_final, "placar_lote", entradas, gerar
+                )
+                st.session_state['placar_lote_template'] = template_escolhido
+                st.success(f"✅ {len(arquivos)} placar(es) gerado(s)!")
+
+    _zip_dados = st.session_state.get('placar_lote_zip')
+    if _zip_dados:
+        st.divider()
+        _nome_template = os.path.splitext(st.session_state['placar_lote_template'])[0]
+        mostrar_zip_gerado(
+            _zip_dados, st.session_state['placar_lote_arquivos'],
+            st.session_state['placar_lote_download'](exportacao), exportacao,
+            nome_zip=f"placares-{_nome_template}.zip", chave="placar_lote"
+        )
 
-if modo == "🔢 Gerar Placar":
+
+def render_placar_mode():
     # MODO ORIGINAL DE PLACAR
     st.header("Gerador de Placares")
     
@@ -2858,6 +2794,11 @@ if modo == "🔢 Gerar Placar":
     )
     
     template_escolhido = [k for k, v in TEMPLATE_LABELS.items() if v == template_escolhido_label][0]
+
+    if st.radio("Gerar", ["Um jogo", "Rodada inteira"], horizontal=True) == "Rodada inteira":
+        render_placar_lote(template_escolhido)
+        return
+
     times = carregar_escudos(template_escolhido)
     
     col1, col2 = st.columns(2)
@@ -2887,38 +2828,47 @@ if modo == "🔢 Gerar Placar":
     )
 
     if st.button("Gerar Placar", type="primary"):
-        template_path = os.path.join(TEMPLATE_DIR, template_escolhido)
-        bg_path = None
-
-        if background:
-            img = Image.open(background)
-            if img.size[0] * img.size[1] > Image.MAX_IMAGE_PIXELS:
-                st.error("Imagem muito grande. Use uma imagem com menos de 100 MP.")
-                st.stop()
-            img = img.convert("RGBA")
-            bg_path = "temp_bg.png"
-            img.save(bg_path, format="PNG")
+        with perf.action("Gerar Placar"):
+            template_path = os.path.join(TEMPLATE_DIR, template_escolhido)
+            bg_bytes = None
 
-        try:
-            img = desenhar_placar(
-                template_path, mandante, visitante, placar,
-                marcadores_mandante, marcadores_visitante,
-                background=bg_path,
-                alinhamento=alinhamento
-            )
-        finally:
-            if bg_path and os.path.exists(bg_path):
-                os.remove(bg_path)
-
-        img_rgb = img.convert("RGB")
-        img_rgb.save("placar_final.jpeg", format="JPEG", quality=100)
-
-        st.session_state['placar_gerado'] = {
-            'template': template_escolhido,
-            'mandante': mandante,
-            'visitante': visitante,
-            'placar_str': placar,
-        }
+            if background:
+                bg_bytes = background.getvalue()
+                try:
+                    # Só o cabeçalho: nada é decodificado antes da checagem
+                    open_background(bg_bytes)
+                except BackgroundTooLargeError:
+                    st.error("Imagem muito grande. Use uma imagem com menos de 100 MP.")
+                    st.stop()
+
+            def _renderizar_placar(escala: float) -> Image.Image:
+                return desenhar_placar(
+                    template_path, mandante, visitante, placar,
+                    marcadores_mandante, marcadores_visitante,
+                    background=bg_bytes,
+                    alinhamento=alinhamento,
+                    scale=escala
+                ).convert("RGB")
+
+            entradas = {
+                'template': template_escolhido,
+                'mandante': mandante,
+                'visitante': visitante,
+                'placar': placar,
+                'marcadores_mandante': marcadores_mandante,
+                'marcadores_visitante': marcadores_visitante,
+                'background': bg_bytes,
+                'alinhamento': alinhamento,
+            }
+
+            st.session_state['placar_gerado'] = {
+                'template': template_escolhido,
+                'mandante': mandante,
+                'visitante': visitante,
+                'placar_str': placar,
+                'imagem': renderizar_em_cache("placar", entradas, _renderizar_placar, PREVIEW_SCALE),
+                'download': functools.partial(download_versao_final, "placar", entradas, _renderizar_placar),
+            }
 
     _PLACAR_LIGA_MAP = {
         "premierleague.png": "Premier League",
@@ -2928,12 +2878,13 @@ if modo == "🔢 Gerar Placar":
         "nationalleague.png":"National League",
     }
 
-    if 'placar_gerado' in st.session_state and os.path.exists("placar_final.jpeg"):
+    if 'placar_gerado' in st.session_state:
         _pg = st.session_state['placar_gerado']
-        st.image("placar_final.jpeg")
-        with open("placar_final.jpeg", "rb") as f:
-            _nome_arquivo = f"{_pg['mandante']} {_pg['placar_str']} {_pg['visitante']}.jpeg".replace("/", "-")
-            st.download_button("📥 Baixar Imagem", f, file_name=_nome_arquivo)
+        st.image(_pg['imagem'], caption="Prévia — o download sai em resolução final")
+        exportacao = opcoes_exportacao("placar", formato_padrao="jpeg")
+        _nome_arquivo = f"{_pg['mandante']} {_pg['placar_str']} {_pg['visitante']}.{exportacao.extension}".replace("/", "-")
+        st.download_button("📥 Baixar Imagem", _pg['download'](exportacao), file_name=_nome_arquivo,
+                           mime=exportacao.mime)
         _liga_str_pg = _PLACAR_LIGA_MAP.get(_pg['template'])
         if _liga_str_pg:
             if st.button("💾 Salvar e Atualizar"):
@@ -3022,52 +2973,36 @@ if modo == "🔢 Gerar Placar":
                             st.error(f"❌ Erro ao fechar rodada: {_e_pos_pg}")
                             _abort_pg = True
 
-                    # Passo 4: Push para GitHub (commit único)
+                    # Passo 4: Enviar ao GitHub em segundo plano (commit único)
                     if not _abort_pg:
                         try:
-                            if 'GITHUB_TOKEN' not in st.secrets or 'GITHUB_REPO' not in st.secrets:
-                                st.error("❌ Configure GITHUB_TOKEN e GITHUB_REPO em .streamlit/secrets.toml")
-                                _abort_pg = True
-                            else:
-                                _github_pg = GitHubHandler(
-                                    token=st.secrets['GITHUB_TOKEN'],
-                                    repo=st.secrets['GITHUB_REPO']
-                                )
-                                _data_pg_str = date.today().strftime("%Y-%m-%d")
-                                _commit_pg = f"Placar — {_pg['mandante']} {_pg['placar_str']} {_pg['visitante']} ({_data_pg_str})"
-                                with open("data/historico.csv", 'r', encoding='utf-8') as _fh_pg:
-                                    _hist_content_pg = _fh_pg.read()
-                                with open("data/posicoes.csv", 'r', encoding='utf-8') as _fp_pg:
-                                    _pos_content_pg = _fp_pg.read()
-                                _ok_pg = _github_pg.update_files(
-                                    files=[
-                                        {"path": f"data/tabelas/{_liga_key_pg}.txt",
-                                         "content": _tabela_str_pg},
-                                        {"path": "data/historico.csv", "content": _hist_content_pg},
-                                        {"path": "data/posicoes.csv", "content": _pos_content_pg},
-                                    ],
-                                    message=_commit_pg,
-                                )
-                                if _ok_pg:
-                                    _steps_pg.append("enviado ao GitHub")
-                                    carregar_tabela_github.clear()
-                                    try:
-                                        rebuild_for_liga(_liga_str_pg)
-                                        _steps_pg.append("estatísticas atualizadas")
-                                    except Exception:
-                                        pass
-                                else:
-                                    st.error("❌ Falha ao enviar arquivos para o GitHub.")
-                                    _abort_pg = True
-                        except Exception as _e_gh_pg:
-                            st.error(f"❌ Erro ao enviar para GitHub: {_e_gh_pg}")
+                            rebuild_for_liga(_liga_str_pg)
+                            _steps_pg.append("estatísticas atualizadas")
+                        except Exception:
+                            pass
+                        _data_pg_str = date.today().strftime("%Y-%m-%d")
+                        _commit_pg = f"Placar — {_pg['mandante']} {_pg['placar_str']} {_pg['visitante']} ({_data_pg_str})"
+                        if enfileirar_github(
+                            [f"data/tabelas/{_liga_key_pg}.txt", "data/historico.csv",
+                             "data/posicoes.csv", "data/insights_cache.json"],
+                            _commit_pg,
+                        ):
+                            _steps_pg.append("envio ao GitHub em andamento")
+                            carregar_tabela_github.clear()
+                        else:
+                            st.error("❌ Configure GITHUB_TOKEN e GITHUB_REPO em .streamlit/secrets.toml")
                             _abort_pg = True
 
                     # Passo 5: Feedback
                     if not _abort_pg:
                         st.success("✅ " + " · ".join(_steps_pg))
 
-elif modo == "📰 Gerar Notícia":
+
+# ============================================================================
+# MODO NOTÍCIA
+# ============================================================================
+
+def render_news_mode():
     # MODO NOTÍCIA
     st.header("📰 Gerador de Notícias")
     
@@ -3104,55 +3039,61 @@ elif modo == "📰 Gerar Notícia":
         ["Centro", "Esquerda", "Direita"], 
         horizontal=True
     )
+
+    exportacao = opcoes_exportacao("noticia")
     
     if st.button("🖼️ Gerar Notícia", type="primary"):
-        if not manchete.strip():
-            st.error("❌ Digite uma manchete!")
-        else:
-            try:
-                # Salvar background temporário se foi enviado
-                bg_path = None
-                if background:
-                    _bg_img = Image.open(background)
-                    if _bg_img.size[0] * _bg_img.size[1] > Image.MAX_IMAGE_PIXELS:
-                        st.error("Imagem muito grande. Use uma imagem com menos de 100 MP.")
-                        st.stop()
-                    _bg_img.convert("RGBA").save("temp_bg_noticia.png", format="PNG")
-                    bg_path = "temp_bg_noticia.png"
-
-                generator = NewsGenerator()
-
-                img = generator.generate_news_image(
-                    league=liga_key,
-                    headline=manchete,
-                    background=bg_path,
-                    alinhamento=alinhamento
-                )
-                
-                st.image(img, caption="Notícia Gerada")
-                
-                # Salvar como PNG
-                img.save("noticia.png", format="PNG")
-                
-                with open("noticia.png", "rb") as f:
+        with perf.action("Gerar Notícia"):
+            if not manchete.strip():
+                st.error("❌ Digite uma manchete!")
+            else:
+                try:
+                    bg_bytes = None
+                    if background:
+                        bg_bytes = background.getvalue()
+                        try:
+                            open_background(bg_bytes)
+                        except BackgroundTooLargeError:
+                            st.error("Imagem muito grande. Use uma imagem com menos de 100 MP.")
+                            st.stop()
+
+                    generator = obter_gerador_noticias()
+                    entradas = {
+                        'league': liga_key,
+                        'headline': manchete,
+                        'background': bg_bytes,
+                        'alinhamento': alinhamento,
+                    }
+                    def gerar(escala: float) -> Image.Image:
+                        return generator.generate_news_image(**entradas, scale=escala)
+
+                    st.image(
+                        renderizar_em_cache("noticia", entradas, gerar, PREVIEW_SCALE),
+                        caption="Notícia Gerada (prévia — o download sai em resolução final)"
+                    )
+
                     # Nome do arquivo baseado na manchete (primeiras palavras)
                     palavras = manchete.split()[:3]
-                    nome_arquivo = "-".join(palavras).replace(" ", "-") + ".png"
-                    
+                    nome_arquivo = "-".join(palavras).replace(" ", "-") + f".{exportacao.extension}"
+
                     st.download_button(
                         "📥 Baixar Notícia",
-                        f,
+                        download_versao_final("noticia", entradas, gerar, exportacao),
                         file_name=nome_arquivo,
+                        mime=exportacao.mime,
                         width='stretch'
                     )
-                
-                # Limpar arquivo temporário
-                if bg_path and os.path.exists(bg_path):
-                    os.remove(bg_path)
+
             
-            except Exception as e:
-                st.error(f"❌ Erro ao gerar notícia: {str(e)}")
-elif modo == "🏆 Gerar Copa":
+                except Exception as e:
+                    st.error(f"❌ Erro ao gerar notícia: {str(e)}")
+
+
+# ============================================================================
+# MODO COPA
+# ============================================================================
+
+def render_cup_mode():
     # MODO COPA
     st.header("🏆 Gerador de Copas")
     
@@ -3179,107 +3120,168 @@ elif modo == "🏆 Gerar Copa":
         help="Formato: ABV 1-0 XYZ. Use D-D para jogos futuros, ADI. para adiados, ABD. para abandonados"
     )
     
+    # Opções de exportação
+    exportacao = opcoes_exportacao("copa")
+
     if st.button("🖼️ Gerar Imagens da Copa", type="primary"):
-        if not titulo_fase.strip():
-            st.error("❌ Digite um título para a fase!")
-        elif not resultados_texto.strip():
-            st.error("❌ Insira pelo menos um resultado!")
-        else:
-            try:
-                # Parse dos resultados
-                from utils.results_parser import ResultsParser
-                parser = ResultsParser()
-                resultados = parser.parse_multiple_results(resultados_texto)
+        with perf.action("Gerar Imagens da Copa"):
+            if not titulo_fase.strip():
+                st.error("❌ Digite um título para a fase!")
+            elif not resultados_texto.strip():
+                st.error("❌ Insira pelo menos um resultado!")
+            else:
+                try:
+                    # Parse dos resultados
+                    parser = obter_parser_resultados()
+                    resultados = parser.parse_multiple_results(resultados_texto)
                 
-                if not resultados:
-                    st.error("❌ Nenhum resultado válido encontrado! Verifique o formato.")
-                else:
-                    st.success(f"✅ {len(resultados)} resultado(s) processado(s)!")
-                    
-                    # Gerar imagens
-                    generator = CupGenerator()
-                    images = generator.generate_cup_images(
-                        cup=copa_key,
-                        results=resultados,
-                        title=titulo_fase
-                    )
-                    
-                    # SALVAR NA SESSÃO (para não perder após download)
-                    st.session_state['imagens_copa_geradas'] = images
-                    st.session_state['copa_selecionada'] = copa_selecionada
-                    
-                    st.success(f"✅ {len(images)} imagem(ns) gerada(s)!")
+                    if not resultados:
+                        st.error("❌ Nenhum resultado válido encontrado! Verifique o formato.")
+                    else:
+                        st.success(f"✅ {len(resultados)} resultado(s) processado(s)!")
+
+                        entradas_copa = {
+                            'cup': copa_key,
+                            'results': resultados,
+                            'title': titulo_fase,
+                            'prefixo': copa_selecionada.replace(' ', '-'),
+                        }
+                        # Prévias em escala reduzida; a versão final sai no download
+                        gerar = gerador_zip_copa(obter_gerador_copa(), entradas_copa)
+                        zip_dados, arquivos_copa = zip_em_cache(
+                            obter_cache_renders(), "copa", entradas_copa, gerar,
+                            PREVIEW_SCALE, PREVIEW_EXPORT
+                        )
+
+                        # SALVAR NA SESSÃO (para não perder após download)
+                        st.session_state['copa_zip'] = zip_dados
+                        st.session_state['copa_arquivos'] = arquivos_copa
+                        st.session_state['copa_download'] = functools.partial(
+                            download_zip_final, "copa", entradas_copa, gerar
+                        )
+                        st.session_state['copa_selecionada'] = copa_selecionada
+
+                        st.success(f"✅ {len(arquivos_copa)} imagem(ns) gerada(s)!")
             
-            except Exception as e:
-                st.error(f"❌ Erro ao gerar imagens: {str(e)}")
-                import traceback
-                with st.expander("Ver detalhes do erro"):
-                    st.code(traceback.format_exc())
+                except Exception as e:
+                    st.error(f"❌ Erro ao gerar imagens: {str(e)}")
+                    import traceback
+                    with st.expander("Ver detalhes do erro"):
+                        st.code(traceback.format_exc())
 
     # ========================================================
     # MOSTRAR E BAIXAR IMAGENS (FORA DO BOTÃO)
     # ========================================================
-    if 'imagens_copa_geradas' in st.session_state:
+    if st.session_state.get('copa_zip'):
         st.divider()
         st.subheader("📸 Imagens Geradas")
         
-        images = st.session_state['imagens_copa_geradas']
+        zip_dados = st.session_state['copa_zip']
+        arquivos = st.session_state.get('copa_arquivos', [])
         copa_nome = st.session_state.get('copa_selecionada', 'Copa')
-        
-        # BOTÃO PARA BAIXAR TODAS DE UMA VEZ
-        if len(images) > 1:
-            import io
-            import zipfile
-            
-            # Criar ZIP em memória
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for idx, img in enumerate(images, start=1):
-                    # Salvar imagem em buffer
-                    img_buffer = io.BytesIO()
-                    img.save(img_buffer, format="PNG")
-                    img_buffer.seek(0)
-                    
-                    # Adicionar ao ZIP
-                    filename = f"{copa_nome.replace(' ', '-')}-{idx}.png"
-                    zip_file.writestr(filename, img_buffer.getvalue())
-            
-            zip_buffer.seek(0)
-            
-            st.download_button(
-                "📦 Baixar Todas as Imagens (ZIP)",
-                zip_buffer,
-                file_name=f"{copa_nome.replace(' ', '-')}-todas.zip",
-                mime="application/zip",
-                width='stretch',
-                type="primary"
-            )
-            
-            st.divider()
-        
-        # Mostrar cada imagem individualmente
-        for idx, img in enumerate(images, start=1):
-            st.image(img, caption=f"Imagem {idx} de {len(images)}")
-            
-            # Salvar temporariamente
-            filename = f"copa_{idx}.png"
-            img.save(filename, format="PNG")
-            
-            # Botão de download individual
-            with open(filename, "rb") as f:
-                st.download_button(
-                    f"📥 Baixar Imagem {idx}",
-                    f,
-                    file_name=f"{copa_nome.replace(' ', '-')}-{idx}.png",
-                    mime="image/png",
+        mostrar_zip_gerado(
+            zip_dados, arquivos, st.session_state['copa_download'](exportacao), exportacao,
+            nome_zip=f"{copa_nome.replace(' ', '-')}-todas.zip", chave="copa"
+        )
+
+
+# ============================================================================
+# INTERFACE PRINCIPAL
+# ============================================================================
+
+st.set_page_config(
+    page_title="Gerador BBI",
+    page_icon="⚽",
+    layout="wide"
+)
+
+# Ações medidas nesta execução ficam com a sessão (o painel ?perf=1 mostra só as dela)
+perf.set_session(st.session_state.setdefault('perf_sessao', uuid.uuid4().hex))
+
+st.title("⚽ Gerador de Conteúdo BBI")
+mostrar_status_sincronizacao()
+
+# Seleção do modo
+modo = st.radio(
+    "Escolha o modo:",
+    ["📰 Gerar Notícia", "🔢 Gerar Placar", "📊 Gerar Tabela com Resultados", "🏆 Gerar Copa", "📈 Estatísticas"],
+    horizontal=True
+)
+
+st.divider()
+
+_RENDER_MODOS = {
+    "📰 Gerar Notícia": render_news_mode,
+    "🔢 Gerar Placar": render_placar_mode,
+    "📊 Gerar Tabela com Resultados": render_table_mode,
+    "🏆 Gerar Copa": render_cup_mode,
+    "📈 Estatísticas": render_stats_mode,
+}
+
+# Perfil opcional (BBI_PROFILE=1; ?profile=1 na URL só com BBI_PROFILE_ALLOW
+# no ambiente ou nos secrets), salvo em profiles/
+with profile(modo, profiling_enabled(st.query_params.get("profile"),
+                                     ler_secret('BBI_PROFILE_ALLOW'))) as _perfil:
+    _RENDER_MODOS.get(modo, render_table_mode)()
+
+if _perfil["path"]:
+    st.caption(f"🔬 Perfil salvo em `{_perfil['path']}`")
+    with open(_perfil["path"], "rb") as _f_perfil:
+        st.download_button(
+            "📥 Baixar perfil",
+            _f_perfil.read(),
+            file_name=os.path.basename(_perfil["path"]),
+            key="download_perfil",
+        )
+
+
+# ============================================================================
+# PAINEL DE PERFORMANCE (oculto; abrir com ?perf=1 na URL)
+# ============================================================================
+
+if st.query_params.get("perf") == "1":
+    with st.expander("⏱ Performance", expanded=False):
+        _acoes = perf.recent_actions()
+        if not _acoes:
+            st.caption("Nenhuma ação registrada ainda.")
+        for _acao in _acoes:
+            st.markdown(f"**{_acao['name']}** — {_acao['duration'] * 1000:.0f} ms ({_acao['started_at'].replace('T', ' ')})")
+            _etapas = sorted(_acao['steps'].items(), key=lambda kv: -kv[1]['seconds'])
+            if _etapas:
+                st.dataframe(
+                    [
+                        {
+                            "Etapa": _nome,
+                            "Chamadas": _e['calls'],
+                            "Total (ms)": round(_e['seconds'] * 1000, 1),
+                            "Máx (ms)": round(_e['max_seconds'] * 1000, 1),
+                            "Lido (KB)": round(_e['bytes_in'] / 1024, 1),
+                            "Escrito (KB)": round(_e['bytes_out'] / 1024, 1),
+                        }
+                        for _nome, _e in _etapas
+                    ],
                     width='stretch',
-                    key=f"download_copa_{idx}"  # ← Key única evita conflitos
+                    hide_index=True,
                 )
-            
-            if idx < len(images):
-                st.divider()
-elif modo == "📈 Estatísticas":
-    render_stats_mode()
-else:
-    # MODO TABELA COM RESULTADOS
-    render_table_mode()
\ No newline at end of file
+
+        _bg = perf.recent_spans(20, background_only=True)
+        if _bg:
+            st.markdown("**Fora de ações**, de todas as sessões (ex.: sincronização com o GitHub)")
+            st.dataframe(
+                [
+                    {"Etapa": _s['name'], "Quando": _s['at'].replace('T', ' '),
+                     "ms": round(_s['seconds'] * 1000, 1),
+                     "Lido (KB)": round(_s['bytes_in'] / 1024, 1),
+                     "Escrito (KB)": round(_s['bytes_out'] / 1024, 1)}
+                    for _s in _bg
+                ],
+                width='stretch',
+                hide_index=True,
+            )
+
+        st.download_button(
+            "📥 Exportar JSON",
+            perf.export_json(),
+            file_name=f"perf-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json",
+            mime="application/json",
+        )
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the stats, standings and rendering hot paths.
+
+Run from the project root:
+    python benchmarks/run.py                          # 1×, 10×, 100×
+    python benchmarks/run.py --scales 1 10 --repeat 3 --output bench.json
+    python benchmarks/run.py --compare bench-old.json --output bench.json
+
+Each scale gets a temporary working directory with a synthetic
+data/historico.csv (see benchmarks/synthetic.py) and links to the asset
+folders, so nothing in the repo is modified. Rendering benchmarks do not
+depend on the historico size and only run once (scale null in the output).
+
+The output is JSON: one entry per (benchmark, scale) with min / median /
+mean seconds, plus metadata (commit, Python, platform) to compare runs.
+Cold import times of the app's modules are reported as "import:<module>"
+(cumulative time from `python -X importtime` in a fresh interpreter).
+At 100× the data benchmarks take minutes each; use --scales 1 10 for a
+quick run.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import prepare_workdir  # noqa: E402
+
+LIGA_STR = "Premier League"
+LIGA_KEY = "premierleague"
+
+# Modules whose cold import time is tracked; the first group is what app.py
+# imports at startup, the rest are loaded lazily by the mode that needs them
+IMPORT_MODULES = [
+    "utils.round_processing",
+    "utils.insights_cache",
+    "utils.position_history",
+    "utils.github_handler",
+    "utils.image_generator",
+    "utils.cup_generator",
+    "utils.news_generator",
+    "utils.stats_engine",
+    "utils.table_validator",
+]
+
+
+def _time(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _summarize(samples)
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "repeat": len(samples),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# ── Inputs ──────────────────────────────────────────────────────────────────
+
+def _results_text() -> str:
+    """One Premier League round in the pasted "ARS 2-1 CHE" format."""
+    with open(os.path.join("config", "team_abbreviations.json"), encoding="utf-8") as f:
+        codes = list(json.load(f))[:20]
+    lines = []
+    for i in range(0, len(codes) - 1, 2):
+        lines.append(f"{codes[i]} {i % 4}-{(i // 2) % 3} {codes[i + 1]}")
+    return "\n".join(lines)
+
+
+def _table_data(liga_key: str) -> List[dict]:
+    from utils.table_processor import TableProcessor
+
+    processor = TableProcessor()
+    with open(os.path.join("data", "tabelas", f"{liga_key}.txt"), encoding="utf-8") as f:
+        processor.load_from_text(f.read())
+    processor.sort_table()
+    return [
+        {
+            "name": t.name, "position": t.position, "games": t.games,
+            "wins": t.wins, "draws": t.draws, "losses": t.losses,
+            "goals_for": t.goals_for, "goals_against": t.goals_against,
+            "goal_difference": t.goal_difference, "points": t.points,
+        }
+        for t in processor.teams
+    ]
+
+
+def _background_bytes() -> bytes:
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    img = Image.fromarray(rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8))
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+# ── Benchmarks ──────────────────────────────────────────────────────────────
+
+def data_benchmarks() -> Dict[str, Callable[[], object]]:
+    """Benchmarks whose cost grows with historico.csv. Run inside the workdir."""
+    from utils.bbi_functions import allinsights
+    from utils.position_history import compute_table_at_matchday, detect_matchdays
+    from utils.stats_engine import _build_team_df, compute_league_stats, load_historico
+
+    df_full = load_historico(LIGA_STR)
+    teams = sorted(set(df_full["casa"]) | set(df_full["fora"]))
+    results_full = {team: _build_team_df(df_full, team) for team in teams}
+    team = teams[0]
+
+    def standings_full_season():
+        md_map = detect_matchdays(LIGA_STR)
+        for md in sorted(md_map):
+            compute_table_at_matchday(LIGA_STR, md, md_map)
+
+    return {
+        "compute_league_stats": lambda: compute_league_stats(LIGA_STR),
+        "allinsights_liga": lambda: allinsights(results_full, LIGA_STR, "liga", df_full=results_full),
+        "allinsights_time": lambda: allinsights(results_full[team], team, "time",
+                                                df_full=results_full[team]),
+        "detect_matchdays": lambda: detect_matchdays(LIGA_STR),
+        "compute_table_at_matchday_season": standings_full_season,
+    }
+
+
+def render_benchmarks() -> Dict[str, Callable[[], object]]:
+    """Benchmarks independent of the historico size."""
+    from utils.cup_generator import CupGenerator
+    from utils.image_generator import ImageGenerator, ResultsRenderState
+    from utils.news_generator import NewsGenerator
+    from utils.results_parser import ResultsParser
+    from utils.standings_animation import render_standings_animation
+
+    parser = ResultsParser()
+    text = _results_text()
+    results = parser.parse_multiple_results(text)
+    table_data = _table_data(LIGA_KEY)
+    background = _background_bytes()
+
+    # One generator and state across calls, flipping one score each time,
+    # as when an editor corrects a single result
+    incremental_generator = ImageGenerator()
+    incremental_state = ResultsRenderState()
+    edited = [dict(r) for r in results]
+    edited[0].update(status="normal", home_score=0, away_score=0)
+
+    # Every team starts a few rows away from where it ends, as after a matchday
+    rows_from = [(idx + 3) % len(table_data) for idx in range(len(table_data))]
+
+    def standings_animation(fmt: str):
+        layers = ImageGenerator().generate_table_layers(LIGA_KEY, table_data, round_number=10)
+        return render_standings_animation(io.BytesIO(), layers, rows_from, fmt)
+
+    def results_one_slot_changed():
+        edited[0]["home_score"] ^= 1
+        return incremental_generator.generate_results_image(
+            LIGA_KEY, edited, round_number=10, state=incremental_state)
+
+    return {
+        "parse_multiple_results": lambda: parser.parse_multiple_results(text),
+        "generate_results_image": lambda: ImageGenerator().generate_results_image(
+            LIGA_KEY, results, round_number=10),
+        "generate_results_image_one_slot": results_one_slot_changed,
+        "generate_table_image": lambda: ImageGenerator().generate_table_image(
+            LIGA_KEY, table_data, round_number=10),
+        "standings_animation_gif": lambda: standings_animation("gif"),
+        "standings_animation_webp": lambda: standings_animation("webp"),
+        "generate_cup_images": lambda: CupGenerator().generate_cup_images(
+            "facup", results, "3ª FASE - RESULTADOS"),
+        "generate_news_image": lambda: NewsGenerator().generate_news_image(
+            LIGA_KEY, "Manchete de teste para medir a quebra de linhas do gerador",
+            background=background),
+    }
+
+
+def _import_seconds(module: str) -> float:
+    """Cumulative import time of module in a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    # Lines look like "import time:  self [us] | cumulative | name"; the
+    # module itself is the last top-level (unindented) entry
+    for line in reversed(out.stderr.splitlines()):
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"no importtime entry for {module}")
+
+
+def import_benchmarks() -> Dict[str, Callable[[], float]]:
+    return {f"import:{m}": (lambda m=m: _import_seconds(m)) for m in IMPORT_MODULES}
+
+
+def _run_imports(repeat: int, only: Optional[List[str]]) -> List[dict]:
+    """Like _run_group, but timing comes from -X importtime, not wall clock."""
+    entries = []
+    for name, fn in import_benchmarks().items():
+        if only and name not in only:
+            continue
+        timing = _summarize([fn() for _ in range(repeat)])
+        entries.append({"name": name, "scale": None, "rows": None, **timing})
+        print(f"  {name:<45} median {timing['median'] * 1000:10.2f} ms", file=sys.stderr)
+    return entries
+
+
+def _run_group(benchmarks: Dict[str, Callable[[], object]], scale: Optional[int],
+               rows: Optional[int], repeat: int, only: Optional[List[str]],
+               warmup: int) -> List[dict]:
+    entries = []
+    for name, fn in benchmarks.items():
+        if only and name not in only:
+            continue
+        timing = _time(fn, repeat, warmup)
+        entries.append({"name": name, "scale": scale, "rows": rows, **timing})
+        label = f"{name} @ {scale}×" if scale is not None else name
+        print(f"  {label:<45} median {timing['median'] * 1000:10.2f} ms", file=sys.stderr)
+    return entries
+
+
+def _compare(current: List[dict], baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(e["name"], e["scale"]): e for e in json.load(f)["results"]}
+    print(f"\nComparison with {baseline_path} (median, new / old):", file=sys.stderr)
+    for entry in current:
+        old = baseline.get((entry["name"], entry["scale"]))
+        if old and old["median"] > 0:
+            ratio = entry["median"] / old["median"]
+            print(f"  {entry['name']:<35} {str(entry['scale']):>5}  {ratio:6.2f}×", file=sys.stderr)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                    help="historico.csv sizes, as multiples of the real file")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    ap.add_argument("--only", nargs="+", help="run only these benchmarks")
+    ap.add_argument("--output", help="write JSON here (default: stdout)")
+    ap.add_argument("--compare", help="previous JSON output to compare against")
+    args = ap.parse_args()
+
+    original_cwd = os.getcwd()
+    print("imports", file=sys.stderr)
+    results: List[dict] = _run_imports(args.repeat, args.only)
+    try:
+        for scale in args.scales:
+            with tempfile.TemporaryDirectory(prefix=f"bbi-bench-{scale}x-") as workdir:
+                rows = prepare_workdir(ROOT, workdir, scale)
+                os.chdir(workdir)
+                print(f"historico.csv {scale}× ({rows} rows)", file=sys.stderr)
+                # No warm-up: these take seconds each at 100× and have no lazy caches
+                results += _run_group(data_benchmarks(), scale, rows, args.repeat, args.only, warmup=0)
+                os.chdir(original_cwd)
+
+        with tempfile.TemporaryDirectory(prefix="bbi-bench-render-") as workdir:
+            prepare_workdir(ROOT, workdir, 1)
+            os.chdir(workdir)
+            print("rendering", file=sys.stderr)
+            # One warm-up run so font and template loading is not counted
+            results += _run_group(render_benchmarks(), None, None, args.repeat, args.only, warmup=1)
+    finally:
+        os.chdir(original_cwd)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": args.scales,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.compare:
+        _compare(results, args.compare)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
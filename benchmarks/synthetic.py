@@ -0,0 +1,93 @@
+"""
+Synthetic data for the benchmarks.
+
+The fullest season in data/historico.csv is used as a template. It is
+re-dated to the current season, so the current-season code paths (stats,
+matchdays, standings) see a complete season regardless of today's date.
+Shifted copies of it are then added as older seasons until the file has
+`scale` times as many rows as the real historico.csv.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+
+import pandas as pd
+
+from utils.season import _season_start
+
+# Folders read (never written) by the generators; linked into the workdir
+ASSET_DIRS = [
+    "config", "templates", "resultados", "tabela", "noticias", "fontes", "selecoes",
+    "escudos-pl", "escudos-ch", "escudos-l1", "escudos-l2", "escudos-nl",
+    "escudos-nonleague", "escudos-ucl", "escudos-uel", "escudos-uecl",
+]
+
+# Copied, since the code under test may write to them
+DATA_FILES = ["data/posicoes.csv", "data/insights_cache.json"]
+DATA_DIRS = ["data/tabelas"]
+
+
+def _season_start_year(label: str) -> int:
+    return int(label.split("-")[0])
+
+
+def _season_block(template: pd.DataFrame, years_back: int) -> pd.DataFrame:
+    """Template season moved so that it starts `years_back` seasons before the current one."""
+    block = template.copy()
+    target_year = _season_start().year - years_back
+    offset = target_year - _season_start_year(template["temporada"].iloc[0])
+    block["data"] = block["data"] + pd.DateOffset(years=offset)
+    block["temporada"] = f"{target_year}-{str(target_year + 1)[-2:]}"
+    return block
+
+
+def build_historico(source_csv: str, scale: int) -> pd.DataFrame:
+    """Synthetic historico with ~scale × the rows of source_csv (current season always complete)."""
+    real = pd.read_csv(source_csv, parse_dates=["data"])
+    template_label = real["temporada"].value_counts().idxmax()
+    template = real[real["temporada"] == template_label].sort_values("data")
+
+    target_rows = max(len(real) * scale, len(template))
+    blocks = []
+    rows = 0
+    years_back = 0
+    while rows < target_rows:
+        block = _season_block(template, years_back)
+        # Older seasons are trimmed from their start so the total matches exactly
+        if rows + len(block) > target_rows:
+            block = block.iloc[len(block) - (target_rows - rows):]
+        blocks.append(block)
+        rows += len(block)
+        years_back += 1
+
+    df = pd.concat(blocks[::-1], ignore_index=True)
+    df["data"] = df["data"].dt.strftime("%Y-%m-%d")
+    return df
+
+
+def prepare_workdir(repo_root: str, workdir: str, scale: int) -> int:
+    """
+    Creates a working directory mirroring the repo layout with a synthetic
+    data/historico.csv. Returns the number of synthetic rows.
+    """
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    for name in ASSET_DIRS:
+        src = os.path.join(repo_root, name)
+        dst = os.path.join(workdir, name)
+        if os.path.exists(src) and not os.path.exists(dst):
+            os.symlink(src, dst)
+    for rel in DATA_FILES:
+        src = os.path.join(repo_root, rel)
+        if os.path.exists(src):
+            shutil.copy(src, os.path.join(workdir, rel))
+    for rel in DATA_DIRS:
+        src = os.path.join(repo_root, rel)
+        dst = os.path.join(workdir, rel)
+        if os.path.exists(src) and not os.path.exists(dst):
+            shutil.copytree(src, dst)
+
+    df = build_historico(os.path.join(repo_root, "data", "historico.csv"), scale)
+    df.to_csv(os.path.join(workdir, "data", "historico.csv"), index=False)
+    return len(df)
+
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Headless rendering of a whole matchday, without the Streamlit app.
+
+Run from the project root:
+    python scripts/render_round.py --liga championship --results ch.txt --date 2026-10-18
+    python scripts/render_round.py \\
+        --liga championship --results ch.txt \\
+        --liga leagueone --results l1.txt \\
+        --liga facup --results fa.txt --title "3ª FASE - RESULTADOS" \\
+        --date 2026-10-18 --output saida/ --profiles story landscape
+
+Each --liga is paired with the --results file that follows it (same format
+as the app's text box, including "-N" day-offset prefixes). For a league the
+script renders the results image and the updated table image and also writes
+the updated table text; for facup/eflcup it renders the cup images. Results
+already recorded in data/historico.csv are not applied twice. Nothing under
+data/ is modified. Leagues are rendered in parallel processes. With
+--profiles, each league image is also written in those layout profiles
+(see "layout_profiles" in config/leagues_config.json), composed from the
+same render.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.image_export import QUALITY_PRESETS, ExportSettings, available_formats, encode_image  # noqa: E402
+from utils.layout_profiles import compose_profiles, load_layout_profiles  # noqa: E402
+from utils.round_processing import (  # noqa: E402
+    LIGA_DISPLAY_NAMES,
+    apply_new_results,
+    build_table_data,
+    load_table,
+    parse_results_text,
+    suggested_round,
+)
+
+CUPS = {"facup", "eflcup"}
+
+
+def render_job(job: dict) -> list:
+    """Renders one league (or cup) and returns the paths written."""
+    # Imported here so each worker process loads fonts/templates on its own
+    from utils.cup_generator import CupGenerator
+    from utils.image_generator import ImageGenerator
+
+    os.chdir(ROOT)
+    liga = job["liga"]
+    with open(job["results"], "r", encoding="utf-8") as f:
+        resultados = parse_results_text(f.read(), job["date"])
+    if not resultados:
+        raise ValueError(f"{job['results']}: nenhum resultado válido")
+
+    written = []
+    os.makedirs(job["output"], exist_ok=True)
+    export = job["export"]
+
+    def save(img, name: str) -> str:
+        path = os.path.join(job["output"], f"{name}.{export.extension}")
+        with open(path, "wb") as f:
+            f.write(encode_image(img, export))
+        return path
+
+    if liga in CUPS:
+        for idx, img in enumerate(CupGenerator().iter_cup_images(liga, resultados, job["title"]), start=1):
+            written.append(save(img, f"{liga}-{idx}"))
+        return written
+
+    processor = load_table(liga)
+    round_number = None if job["postponed"] else (job["round"] or suggested_round(processor))
+    apply_new_results(processor, liga, resultados)
+
+    generator = ImageGenerator()
+    results_img = generator.generate_results_image(
+        league=liga,
+        results=resultados,
+        round_number=round_number,
+        is_postponed=job["postponed"],
+    )
+    table_img = generator.generate_table_image(
+        league=liga,
+        table_data=build_table_data(processor, liga),
+        round_number=round_number,
+    )
+
+    for suffix, img in (("rodada", results_img.convert("RGB")), ("tabela", table_img)):
+        written.append(save(img, f"{liga}-{suffix}"))
+        for profile, variant in compose_profiles(img, job["profiles"]).items():
+            written.append(save(variant, f"{liga}-{suffix}-{profile}"))
+
+    path = os.path.join(job["output"], f"{liga}-tabela.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(processor.to_text())
+    written.append(path)
+    return written
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--liga", action="append", required=True,
+                    choices=sorted(set(LIGA_DISPLAY_NAMES) | CUPS),
+                    help="liga (ou copa) a renderizar; pode ser repetido")
+    ap.add_argument("--results", action="append", required=True,
+                    help="arquivo de resultados da --liga correspondente")
+    ap.add_argument("--date", type=date.fromisoformat, default=date.today(),
+                    help="data da rodada (AAAA-MM-DD, padrão: hoje)")
+    ap.add_argument("--round", type=int, help="número da rodada (padrão: sugerido pela tabela)")
+    ap.add_argument("--postponed", action="store_true", help="jogos atrasados (sem número de rodada)")
+    ap.add_argument("--title", default="RESULTADOS", help="título da fase (copas)")
+    ap.add_argument("--output", default="saida", help="pasta de saída (padrão: saida/)")
+    ap.add_argument("--format", default="png", choices=available_formats(),
+                    help="formato das imagens (padrão: png)")
+    ap.add_argument("--quality", default="alta", choices=sorted(QUALITY_PRESETS),
+                    help="predefinição de qualidade (padrão: alta)")
+    ap.add_argument("--max-kb", type=int, help="tamanho máximo de cada imagem, em KB")
+    ap.add_argument("--profiles", nargs="+", default=[], metavar="PERFIL",
+                    help="perfis de layout extras para rodada e tabela (ex.: story landscape)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="processos em paralelo")
+    args = ap.parse_args()
+
+    if len(args.liga) != len(args.results):
+        ap.error("cada --liga precisa de um --results")
+
+    layout_profiles = load_layout_profiles(os.path.join(ROOT, "config", "leagues_config.json"))
+    unknown = [name for name in args.profiles if name not in layout_profiles]
+    if unknown:
+        ap.error(f"perfis desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(layout_profiles)})")
+
+    output = os.path.abspath(args.output)
+    export = ExportSettings.from_preset(
+        args.format, args.quality, args.max_kb * 1024 if args.max_kb else None
+    )
+    jobs = [
+        {
+            "liga": liga,
+            "results": os.path.abspath(results),
+            "date": args.date,
+            "round": args.round,
+            "postponed": args.postponed,
+            "title": args.title,
+            "output": output,
+            "export": export,
+            "profiles": {name: layout_profiles[name] for name in args.profiles},
+        }
+        for liga, results in zip(args.liga, args.results)
+    ]
+
+    failures = 0
+    workers = max(1, min(args.workers, len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(render_job, job): job["liga"] for job in jobs}
+        for future in as_completed(futures):
+            liga = futures[future]
+            try:
+                for path in future.result():
+                    print(f"[{liga}] {path}")
+            except Exception as e:
+                failures += 1
+                print(f"[{liga}] erro: {e}", file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+O último quadro da animação da tabela tem que ser a própria tabela estática
+
+Rodar da raiz do repositório: python -m pytest tests  (ou python -m unittest)
+"""
+import io
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image, ImageChops, ImageSequence
+
+from utils.image_generator import ImageGenerator
+from utils.round_processing import build_table_data, load_table
+from utils.standings_animation import render_standings_animation, start_rows
+
+
+class UltimoQuadroTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Templates, escudos e fontes são lidos por caminho relativo à raiz
+        cls._cwd = os.getcwd()
+        os.chdir(ROOT)
+        cls.generator = ImageGenerator()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls._cwd)
+
+    def _assert_ultimo_quadro_igual(self, league: str, penalty_rows=()):
+        # Escala final e a da prévia (PREVIEW_SCALE), com arredondamentos diferentes
+        for scale in (1.0, 0.4):
+            with self.subTest(scale=scale):
+                self._comparar(league, penalty_rows, scale)
+
+    def _comparar(self, league: str, penalty_rows, scale: float):
+        table_data = build_table_data(load_table(league), league)
+        for row in penalty_rows:
+            table_data[row]['penalty_note'] = f"{table_data[row]['name']} perdeu 6 pontos."
+        # Todos de ponta-cabeça: cada linha se move
+        rows_from = list(reversed(range(len(table_data))))
+
+        estatica = self.generator.generate_table_image(league, table_data, round_number=7,
+                                                       scale=scale)
+        layers = self.generator.generate_table_layers(league, table_data, round_number=7,
+                                                      scale=scale)
+        buffer = io.BytesIO()
+        render_standings_animation(buffer, layers, rows_from, "webp", move_frames=4)
+
+        with Image.open(buffer) as animacao:
+            ultimo = [frame.convert("RGB") for frame in ImageSequence.Iterator(animacao)][-1]
+        self.assertEqual(ultimo.size, estatica.size)
+        self.assertIsNone(ImageChops.difference(ultimo, estatica.convert("RGB")).getbbox())
+
+    def test_premier_league_com_nota_de_punicao(self):
+        self._assert_ultimo_quadro_igual('premierleague', penalty_rows=(3,))
+
+    def test_national_league_com_notas_de_punicao(self):
+        self._assert_ultimo_quadro_igual('nationalleague', penalty_rows=(5, 12))
+
+    def test_championship_sem_notas(self):
+        self._assert_ultimo_quadro_igual('championship')
+
+    def test_league_one_sem_notas(self):
+        self._assert_ultimo_quadro_igual('leagueone')
+
+
+class LinhasIniciaisTest(unittest.TestCase):
+    def test_posicoes_parciais_nao_repetem_linha(self):
+        table_data = [{'name': f"Time {i}"} for i in range(1, 7)]
+        # Só quatro times na rodada anterior; 5 e 6 não podem cair sobre 3 e 4
+        anteriores = {"Time 1": 3, "Time 2": 4, "Time 3": 5, "Time 4": 6}
+        linhas = start_rows(table_data, anteriores)
+        self.assertEqual(linhas[:4], [2, 3, 4, 5])
+        self.assertEqual(sorted(linhas), list(range(6)))
+
+    def test_sem_historico_todos_parados(self):
+        table_data = [{'name': f"Time {i}"} for i in range(1, 5)]
+        self.assertEqual(start_rows(table_data, {}), [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+Codificação de animações (GIF e WebP animado) quadro a quadro
+
+O save_all do Pillow só monta o arquivo depois de receber todos os quadros
+(o WebP transforma append_images numa lista; o GIF guarda cada quadro até o
+fim). Aqui cada quadro é codificado e gravado assim que chega, e só a
+região que mudou em relação ao anterior: a memória fica no tamanho de um
+quadro, não importa quantos sejam.
+"""
+from PIL import GifImagePlugin, Image
+from abc import ABC, abstractmethod
+from typing import IO, Optional, Tuple
+import io
+import struct
+
+# formato -> (extensão, tipo MIME)
+ANIMATION_FORMATS = {
+    "gif": ("gif", "image/gif"),
+    "webp": ("webp", "image/webp"),
+}
+
+# Esforço do WebP sem perdas (quality, method): para arte chapada (texto,
+# faixas de cor) sai menor que o WebP com perdas e ainda rápido
+_LOSSLESS_EFFORT = (25, 0)
+
+Box = Tuple[int, int, int, int]
+
+
+class AnimationWriter(ABC):
+    """
+    Grava quadros em fileobj à medida que chegam
+
+    Uso:
+        with open_animation_writer(f, "gif", size) as writer:
+            writer.add(frame, 40)               # quadro inteiro
+            writer.add(frame, 40, box=(x0, y0, x1, y1))  # só a região alterada
+
+    frame é sempre o quadro inteiro (size); box diz qual parte dele mudou
+    desde o quadro anterior. O primeiro quadro é gravado inteiro.
+
+    Se o bloco with termina com exceção, o arquivo não é fechado (ficaria um
+    GIF/WebP cortado que parece válido): failed vira True e, se fileobj
+    aceitar seek, o que foi gravado é apagado. Quem recebeu fileobj deve
+    descartá-lo.
+    """
+
+    def __init__(self, fileobj: IO[bytes], size: Tuple[int, int], loop: int = 0):
+        self.fileobj = fileobj
+        self.size = size
+        self.loop = loop
+        self.frames = 0
+        self.failed = False
+        self._start = fileobj.tell() if fileobj.seekable() else None
+
+    def add(self, frame: Image.Image, duration: int, box: Optional[Box] = None) -> None:
+        if frame.size != self.size:
+            raise ValueError(f"Quadro de {frame.size}, esperado {self.size}")
+        if self.frames == 0 or box is None:
+            box = (0, 0) + self.size
+        self._write_frame(frame, int(duration), self._clip(box))
+        self.frames += 1
+
+    def close(self) -> None:
+        if self.frames == 0:
+            raise ValueError("Animação sem quadros")
+        self._finish()
+
+    def __enter__(self) -> "AnimationWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        self.failed = True
+        if self._start is not None:
+            self.fileobj.seek(self._start)
+            self.fileobj.truncate()
+
+    def _clip(self, box: Box) -> Box:
+        x0, y0, x1, y1 = box
+        return (max(0, x0), max(0, y0), min(self.size[0], x1), min(self.size[1], y1))
+
+    @abstractmethod
+    def _write_frame(self, frame: Image.Image, duration: int, box: Box) -> None:
+        """Codifica e grava a região box de frame"""
+
+    @abstractmethod
+    def _finish(self) -> None:
+        """Completa o arquivo depois do último quadro"""
+
+
+class GifStreamWriter(AnimationWriter):
+    """
+    GIF com paleta global tirada do primeiro quadro e sem pontilhado, para a
+    mesma cor sair igual em todos os quadros (sem cintilar nas regiões
+    regravadas)
+    """
+
+    def __init__(self, fileobj: IO[bytes], size: Tuple[int, int], loop: int = 0):
+        super().__init__(fileobj, size, loop)
+        self._palette: Optional[Image.Image] = None
+
+    def _write_frame(self, frame: Image.Image, duration: int, box: Box) -> None:
+        region = frame.crop(box).convert("RGB")
+        if self._palette is None:
+            indexed = region.quantize(256, method=Image.Quantize.MEDIANCUT,
+                                      dither=Image.Dither.NONE)
+            self._palette = indexed
+            header, _ = GifImagePlugin.getheader(indexed, info={"loop": self.loop})
+            self.fileobj.write(b"".join(header))
+        else:
+            indexed = region.quantize(palette=self._palette, dither=Image.Dither.NONE)
+        # disposal=1: o quadro fica na tela e o próximo só cobre a sua região
+        for chunk in GifImagePlugin.getdata(indexed, offset=box[:2],
+                                            duration=duration, disposal=1):
+            self.fileobj.write(chunk)
+
+    def _finish(self) -> None:
+        self.fileobj.write(b";")
+
+
+class WebPStreamWriter(AnimationWriter):
+    """
+    WebP animado montado à mão: cada região é codificada pelo Pillow como um
+    WebP estático e os dados dela vão num chunk ANMF. Sem quality os quadros
+    são sem perdas. fileobj precisa aceitar seek (o tamanho do RIFF só é
+    conhecido no fim).
+    """
+
+    def __init__(self, fileobj: IO[bytes], size: Tuple[int, int], loop: int = 0,
+                 quality: Optional[int] = None):
+        super().__init__(fileobj, size, loop)
+        self.quality = quality
+        if self._start is None:
+            raise ValueError("O WebP animado precisa de um arquivo com seek")
+        width, height = size
+        vp8x = struct.pack("<B3x", 0x02) + _uint24(width - 1) + _uint24(height - 1)
+        anim = struct.pack("<IH", 0xFFFFFFFF, loop)
+        fileobj.write(b"RIFF\0\0\0\0WEBP")
+        fileobj.write(_chunk(b"VP8X", vp8x))
+        fileobj.write(_chunk(b"ANIM", anim))
+
+    def _write_frame(self, frame: Image.Image, duration: int, box: Box) -> None:
+        # O ANMF guarda a posição dividida por 2: a região começa em x/y pares
+        box = (box[0] - box[0] % 2, box[1] - box[1] % 2, box[2], box[3])
+        region = frame.crop(box).convert("RGB")
+        buffer = io.BytesIO()
+        if self.quality is None:
+            effort, method = _LOSSLESS_EFFORT
+            region.save(buffer, format="WEBP", lossless=True, quality=effort, method=method)
+        else:
+            region.save(buffer, format="WEBP", quality=self.quality, method=2)
+        data = b"".join(
+            _chunk(fourcc, payload)
+            for fourcc, payload in _riff_chunks(buffer.getvalue())
+            if fourcc in (b"ALPH", b"VP8 ", b"VP8L")
+        )
+        header = (_uint24(box[0] // 2) + _uint24(box[1] // 2)
+                  + _uint24(region.width - 1) + _uint24(region.height - 1)
+                  + _uint24(min(duration, 0xFFFFFF))
+                  + bytes([0x02]))  # sem mescla com o quadro anterior, sem descarte
+        self.fileobj.write(_chunk(b"ANMF", header + data))
+
+    def _finish(self) -> None:
+        end = self.fileobj.tell()
+        self.fileobj.seek(self._start + 4)
+        self.fileobj.write(struct.pack("<I", end - self._start - 8))
+        self.fileobj.seek(end)
+
+
+def _uint24(value: int) -> bytes:
+    return struct.pack("<I", value)[:3]
+
+
+def _chunk(fourcc: bytes, payload: bytes) -> bytes:
+    pad = b"\0" if len(payload) % 2 else b""
+    return fourcc + struct.pack("<I", len(payload)) + payload + pad
+
+
+def _riff_chunks(data: bytes):
+    """(fourcc, payload) de cada chunk de um arquivo WebP"""
+    pos = 12
+    while pos + 8 <= len(data):
+        fourcc = data[pos:pos + 4]
+        (size,) = struct.unpack("<I", data[pos + 4:pos + 8])
+        yield fourcc, data[pos + 8:pos + 8 + size]
+        pos += 8 + size + (size % 2)
+
+
+def open_animation_writer(fileobj: IO[bytes], fmt: str, size: Tuple[int, int],
+                          quality: Optional[int] = None, loop: int = 0) -> AnimationWriter:
+    """
+    Codificador de animação em fmt ("gif" ou "webp"); quality (com perdas)
+    só vale para o WebP, que sem ela é sem perdas
+
+    Raises:
+        ValueError: formato desconhecido
+    """
+    if fmt == "gif":
+        return GifStreamWriter(fileobj, size, loop)
+    if fmt == "webp":
+        return WebPStreamWriter(fileobj, size, loop, quality)
+    raise ValueError(f"Formato de animação desconhecido: {fmt}")
@@ -0,0 +1,155 @@
+"""
+Imagens de fundo enviadas pelo usuário (placar e notícia)
+
+A decodificação e o redimensionamento "cover" (escala para cobrir todo o
+template) são os passos caros; o resultado fica em memória, indexado pelo
+hash do arquivo enviado e pelo tamanho do template. Trocar o alinhamento só
+refaz o recorte.
+
+O upload nunca é decodificado em resolução cheia sem necessidade: o tamanho
+é conferido pelo cabeçalho (antes de decodificar), JPEGs usam draft() para o
+próprio decodificador já entregar a imagem reduzida em 1/2, 1/4 ou 1/8, e os
+demais formatos passam por reduce() inteiro antes do LANCZOS final. Uma foto
+de 40 MP deixa de ocupar 160 MB em RGBA só para virar um fundo de 1080×1350.
+"""
+from PIL import Image
+from collections import OrderedDict
+from typing import IO, Tuple, Union
+import hashlib
+import io
+import math
+import threading
+import warnings
+
+# Caminho, bytes do upload ou arquivo aberto
+BackgroundSource = Union[str, bytes, IO[bytes]]
+
+# Quantos fundos já escalados manter em memória
+_COVER_CACHE_SIZE = 4
+
+# O reduce() inteiro para quando a imagem ainda tem esta folga sobre o
+# tamanho final, para o LANCZOS ter pixels de sobra (mesmo padrão do
+# reducing_gap de Image.thumbnail)
+_REDUCING_GAP = 2.0
+
+_cover_cache: "OrderedDict[Tuple[str, Tuple[int, int]], Image.Image]" = OrderedDict()
+_cover_lock = threading.Lock()  # o lote de placares desenha em várias threads
+
+
+class BackgroundTooLargeError(ValueError):
+    """Imagem de fundo acima de Image.MAX_IMAGE_PIXELS"""
+
+
+def _read_source(background: BackgroundSource) -> bytes:
+    """Lê os bytes da imagem de fundo, qualquer que seja a origem"""
+    if isinstance(background, (bytes, bytearray)):
+        return bytes(background)
+    if isinstance(background, str):
+        with open(background, "rb") as f:
+            return f.read()
+    if hasattr(background, "getvalue"):
+        return background.getvalue()
+    background.seek(0)
+    return background.read()
+
+
+def open_background(data: bytes) -> Image.Image:
+    """
+    Abre o upload lendo só o cabeçalho e recusa imagens acima de
+    Image.MAX_IMAGE_PIXELS antes de qualquer decodificação
+
+    Raises:
+        BackgroundTooLargeError: imagem grande demais (ou bomba de descompressão)
+    """
+    limit = Image.MAX_IMAGE_PIXELS
+    try:
+        with warnings.catch_warnings():
+            # O limite é conferido logo abaixo, com uma mensagem melhor
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            img = Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError as e:
+        raise BackgroundTooLargeError(str(e)) from e
+    if limit and img.width * img.height > limit:
+        raise BackgroundTooLargeError(
+            f"Imagem de {img.width}×{img.height} px acima do limite de {limit // 1_000_000} MP"
+        )
+    return img
+
+
+def _decode_cover(data: bytes, size: Tuple[int, int]) -> Image.Image:
+    """Decodifica e escala o upload para cobrir size, sem passar pela resolução cheia"""
+    img = open_background(data)
+    width, height = size
+    scale = max(width / img.width, height / img.height)
+    new_size = (int(img.width * scale), int(img.height * scale))
+
+    if img.format == "JPEG" and scale < 1:
+        # O decodificador entrega direto a menor escala DCT >= new_size
+        img.draft("RGB", (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+
+    if img.mode not in ("RGB", "RGBA", "L", "LA"):
+        img = img.convert("RGBA")
+
+    factor = int(min(img.width / new_size[0], img.height / new_size[1]) / _REDUCING_GAP)
+    if factor > 1:
+        img = img.reduce(factor)
+
+    return img.resize(new_size, Image.LANCZOS).convert("RGBA")
+
+
+def prepare_cover_background(background: BackgroundSource,
+                             size: Tuple[int, int]) -> Image.Image:
+    """
+    Decodifica o fundo e o escala (LANCZOS) para cobrir a área size
+
+    O resultado é compartilhado pelo cache: não modifique a imagem retornada
+    (crop_cover devolve sempre uma nova imagem).
+    """
+    data = _read_source(background)
+    key = (hashlib.sha1(data).hexdigest(), tuple(size))
+
+    with _cover_lock:
+        cached = _cover_cache.get(key)
+        if cached is not None:
+            _cover_cache.move_to_end(key)
+            return cached
+
+    bg_resized = _decode_cover(data, size)
+
+    with _cover_lock:
+        _cover_cache[key] = bg_resized
+        while len(_cover_cache) > _COVER_CACHE_SIZE:
+            _cover_cache.popitem(last=False)
+    return bg_resized
+
+
+def crop_cover(bg_resized: Image.Image, size: Tuple[int, int],
+               alinhamento: Union[str, int, float] = "Centro") -> Image.Image:
+    """
+    Recorta o fundo já escalado no tamanho do template
+
+    Args:
+        bg_resized: Fundo retornado por prepare_cover_background
+        size: (largura, altura) do template
+        alinhamento: 'Centro', 'Esquerda', 'Direita' ou posição horizontal
+            em porcentagem (0 = esquerda, 100 = direita)
+    """
+    width, height = size
+    max_left = max(0, bg_resized.width - width)
+    if isinstance(alinhamento, (int, float)):
+        left = int(max_left * alinhamento / 100)
+    elif alinhamento == "Esquerda":
+        left = 0
+    elif alinhamento == "Direita":
+        left = max_left
+    else:  # Centro
+        left = max_left // 2
+
+    top = max(0, (bg_resized.height - height) // 2)
+    return bg_resized.crop((left, top, left + width, top + height))
+
+
+def cover_background(background: BackgroundSource, size: Tuple[int, int],
+                     alinhamento: Union[str, int, float] = "Centro") -> Image.Image:
+    """Fundo escalado (em cache) e recortado para o template"""
+    return crop_cover(prepare_cover_background(background, size), size, alinhamento)
@@ -0,0 +1,94 @@
+"""
+Badge post-processing for the stats page.
+
+Dark, monochromatic crests (e.g. all-black badges) disappear on the dark
+theme, so they are inverted before being shown. Results are memoized on disk
+under BADGE_CACHE_DIR, keyed by the SHA-1 of the source file, so each badge is
+analysed once per content change rather than on every stats cache load.
+"""
+import hashlib
+import io
+import os
+import tempfile
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from utils.perf import timed
+
+BADGE_CACHE_DIR = ".cache/badges"
+
+# Bump when the processing rules change so stale cache entries are ignored.
+_CACHE_VERSION = "1"
+
+_ALPHA_THRESHOLD = 10
+_MAX_STD_DEV = 30
+_MAX_BRIGHTNESS = 80
+
+
+def process_badge_for_dark_mode(img_bytes: bytes) -> bytes:
+    """Inverts monochromatic dark badges so they remain visible in dark mode."""
+    img = Image.open(io.BytesIO(img_bytes)).convert("RGBA")
+    arr = np.asarray(img)
+
+    opaque = arr[..., :3][arr[..., 3] > _ALPHA_THRESHOLD]
+    if opaque.size == 0:
+        return img_bytes
+
+    channels = opaque.astype(np.float64).ravel()
+    avg_brightness = channels.mean()
+    # ddof=1 → sample standard deviation, same as statistics.stdev
+    std_dev = channels.std(ddof=1) if channels.size > 1 else 0.0
+    if std_dev >= _MAX_STD_DEV or avg_brightness >= _MAX_BRIGHTNESS:
+        return img_bytes
+
+    inverted = arr.copy()
+    inverted[..., :3] = 255 - inverted[..., :3]
+    out = io.BytesIO()
+    Image.fromarray(inverted, "RGBA").save(out, format="PNG")
+    return out.getvalue()
+
+
+def _cache_path(img_bytes: bytes) -> str:
+    digest = hashlib.sha1(img_bytes).hexdigest()
+    return os.path.join(BADGE_CACHE_DIR, f"{digest}-v{_CACHE_VERSION}.png")
+
+
+def load_dark_mode_badge(badge_path: str) -> Optional[bytes]:
+    """
+    Returns the dark-mode version of the badge at badge_path, or None if the
+    file does not exist. Uses the on-disk memo when available.
+    """
+    if not os.path.exists(badge_path):
+        return None
+    with timed("badge dark mode") as span:
+        with open(badge_path, "rb") as f:
+            raw = f.read()
+        span.bytes_in = len(raw)
+
+        cached = _cache_path(raw)
+        if os.path.exists(cached):
+            try:
+                with open(cached, "rb") as f:
+                    return f.read()
+            except OSError:
+                pass
+
+        processed = process_badge_for_dark_mode(raw)
+        try:
+            os.makedirs(BADGE_CACHE_DIR, exist_ok=True)
+            # Unique per writer: threads of the same process may store the same badge
+            fd, tmp = tempfile.mkstemp(dir=BADGE_CACHE_DIR, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(processed)
+                os.replace(tmp, cached)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            span.bytes_out = len(processed)
+        except OSError:
+            pass  # read-only filesystem: still return the processed badge
+        return processed
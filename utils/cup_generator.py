@@ -2,11 +2,15 @@
 Gerador de imagens para copas (FA Cup e EFL Cup)
 """
 from PIL import Image, ImageDraw, ImageFont
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Tuple
 import json
 import os
 import math
 
+from utils.perf import instrument
+from utils.scaling import fitted_badge, load_scaled, scaled, scaled_font_size
+from utils.text_layout import get_text_layout
+
 class CupGenerator:
     def __init__(self, config_path: str = "config/leagues_config.json"):
         """Inicializa o gerador de copas"""
@@ -28,20 +32,9 @@ class CupGenerator:
     def _resize_badge(self, badge_path: str, target_size: Tuple[int, int]) -> Image.Image:
         """
         Redimensiona um escudo mantendo proporções e centralizando
-        O escudo NUNCA ultrapassa o target_size
+        O escudo NUNCA ultrapassa o target_size (em cache; só para colar)
         """
-        badge = self._load_image(badge_path)
-        
-        # Usar thumbnail para manter proporções SEM ultrapassar o target
-        badge.thumbnail(target_size, Image.LANCZOS)
-        
-        # Centralizar em canvas transparente
-        canvas = Image.new("RGBA", target_size, (0, 0, 0, 0))
-        pos_x = (target_size[0] - badge.width) // 2
-        pos_y = (target_size[1] - badge.height) // 2
-        canvas.paste(badge, (pos_x, pos_y), badge)
-        
-        return canvas
+        return fitted_badge(badge_path, target_size)
    
 
     def _get_badge_path(self, team_name: str, cup: str) -> str:
@@ -193,15 +186,11 @@ class CupGenerator:
         Returns:
             Nome ajustado
         """
-        from PIL import ImageDraw
-        
         # Verificar se está no display_names (manual)
         display_name = self._get_display_name(team_name, cup)
         
-        # Medir largura
-        draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
-        bbox = draw.textbbox((0, 0), display_name, font=font)
-        width = bbox[2] - bbox[0]
+        # Medir largura (métricas da fonte em cache, sem imagem descartável)
+        width = get_text_layout(font).text_width(display_name)
         
         # Se cabe, retorna
         if width <= max_width:
@@ -236,8 +225,9 @@ class CupGenerator:
         
         return display_name
     
+    @instrument()
     def generate_cup_images(self, cup: str, results: List[Dict], 
-                           title: str) -> List[Image.Image]:
+                           title: str, scale: float = 1.0) -> List[Image.Image]:
         """
         Gera imagens de copa (pode gerar múltiplas imagens)
         
@@ -245,10 +235,21 @@ class CupGenerator:
             cup: 'facup' ou 'eflcup'
             results: Lista de resultados parseados
             title: Título da fase (ex: "3ª FASE - RESULTADOS")
+            scale: Fator de escala das artes (ex.: PREVIEW_SCALE para prévias)
         
         Returns:
             Lista de imagens PIL geradas
         """
+        return list(self.iter_cup_images(cup, results, title, scale))
+
+    def iter_cup_images(self, cup: str, results: List[Dict],
+                        title: str, scale: float = 1.0) -> Iterator[Image.Image]:
+        """
+        Gera as imagens de copa uma a uma (mesmos argumentos de generate_cup_images)
+
+        Cada arte é entregue assim que fica pronta, para que quem consome
+        possa codificá-la e descartá-la antes da próxima ser desenhada.
+        """
         # Configuração por copa
         if cup == 'facup':
             template_file = "facup-template.png"
@@ -272,24 +273,26 @@ class CupGenerator:
         layers = self.calcular_layers(distribuicao, max_matches)
         
         # Gerar imagens
-        images = []
         match_index = 0
         
         for arte_idx, slots_usados in enumerate(layers):
-            # Carregar template
+            # Carregar template (cópia: vamos desenhar sobre ela)
             template_path = os.path.join("resultados", template_file)
-            base = self._load_image(template_path)
+            base = load_scaled(template_path, scale).copy()
             
             # Carregar rect
             rect_path = os.path.join("resultados", rect_file)
-            rect_base = self._load_image(rect_path)
+            rect_base = load_scaled(rect_path, scale)
             
             draw = ImageDraw.Draw(base)
             
             # Carregar fontes
-            font_team = ImageFont.truetype(self._get_font_for_cup(cup, bold=False), font_size_team)
-            font_score = ImageFont.truetype(self._get_font_for_cup(cup, bold=True), font_size_score)
-            font_title = ImageFont.truetype(self._get_font_for_cup(cup, bold=True), font_size_title)
+            font_team = ImageFont.truetype(self._get_font_for_cup(cup, bold=False),
+                                           scaled_font_size(font_size_team, scale))
+            font_score = ImageFont.truetype(self._get_font_for_cup(cup, bold=True),
+                                            scaled_font_size(font_size_score, scale))
+            font_title = ImageFont.truetype(self._get_font_for_cup(cup, bold=True),
+                                            scaled_font_size(font_size_title, scale))
             
             # Desenhar título (centralizado)
             title_upper = title.upper()
@@ -298,7 +301,7 @@ class CupGenerator:
             title_x = (base.width - title_width) // 2
             
             # Posição do título (ajustar conforme template)
-            title_y = 200 if cup == 'facup' else 192
+            title_y = scaled(200 if cup == 'facup' else 192, scale)
             
             draw.text((title_x, title_y), title_upper, font=font_title, fill="#FFFFFF")
             
@@ -350,6 +353,21 @@ class CupGenerator:
                 # Layout compacto: nome fica entre o escudo e a caixa do
                 # placar, um espaço bem menor que o da FA Cup
                 team_name_max_width = 260
+
+            # Medidas acima são da arte em tamanho real
+            (rect_start_y, rect_gap, rect_x, badge_home_x, badge_away_x, badge_y,
+             team_name_home_x, team_name_away_x, team_name_y, score_x, score_y,
+             team_name_max_width) = (
+                scaled(v, scale) for v in (
+                    rect_start_y, rect_gap, rect_x, badge_home_x, badge_away_x, badge_y,
+                    team_name_home_x, team_name_away_x, team_name_y, score_x, score_y,
+                    team_name_max_width,
+                )
+            )
+            badge_size = (scaled(badge_size[0], scale), scaled(badge_size[1], scale))
+            extra_font_size = scaled_font_size(extra_font_size, scale)
+            if extra_y_offset is not None:
+                extra_y_offset = scaled(extra_y_offset, scale)
             
             # Desenhar cada jogo nos slots usados
             for slot_idx, slot in enumerate(slots_usados):
@@ -497,6 +515,4 @@ class CupGenerator:
                         fill="#FFFFFF"
                     )
             
-            images.append(base)
-        
-        return images
\ No newline at end of file
+            yield base
\ No newline at end of file
@@ -4,24 +4,124 @@ Permite ler e atualizar arquivos de tabelas no repositório
 """
 import requests
 import base64
-from typing import Optional, Tuple
+import hashlib
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, Tuple
+
+from utils.perf import timed
+
+DEFAULT_API_URL = "https://api.github.com"
+
+# Sessão HTTP compartilhada entre instâncias: o app cria um handler por ação,
+# mas as conexões (TLS + keep-alive) continuam reaproveitadas
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Respostas de get_file por URL: {url: (etag, conteúdo, sha)}
+_etag_cache: Dict[str, Tuple[str, str, str]] = {}
+
+# Espera máxima entre tentativas (segundos), mesmo que o servidor peça mais
+_MAX_RETRY_WAIT = 30.0
+
+
+def _shared_session() -> requests.Session:
+    """Retorna a sessão HTTP do módulo, criando-a na primeira chamada"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _is_retryable(response: requests.Response) -> bool:
+    """5xx, 429 e 403 por limite de requisições podem ser repetidos"""
+    if response.status_code >= 500 or response.status_code == 429:
+        return True
+    return (response.status_code == 403
+            and response.headers.get("X-RateLimit-Remaining") == "0")
+
+
+def _retry_wait(response: Optional[requests.Response], attempt: int, backoff: float) -> float:
+    """Tempo de espera antes da próxima tentativa"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), _MAX_RETRY_WAIT)
+        reset = response.headers.get("X-RateLimit-Reset")
+        if response.headers.get("X-RateLimit-Remaining") == "0" and reset and reset.isdigit():
+            return min(max(0.0, int(reset) - time.time()), _MAX_RETRY_WAIT)
+    return min(backoff * (2 ** attempt), _MAX_RETRY_WAIT)
+
+
+def git_blob_sha(content: bytes) -> str:
+    """SHA do blob como o git calcula: sha1("blob <tamanho>\\0" + conteúdo)"""
+    header = f"blob {len(content)}\0".encode()
+    return hashlib.sha1(header + content).hexdigest()
+
 
 class GitHubHandler:
-    def __init__(self, token: str, repo: str):
+    def __init__(self, token: str, repo: str, api_url: str = DEFAULT_API_URL,
+                 session: Optional[requests.Session] = None,
+                 max_retries: int = 3, backoff: float = 0.5):
         """
         Inicializa o handler do GitHub
         
         Args:
             token: Personal access token do GitHub
             repo: Repositório no formato "usuario/repo"
+            api_url: URL base da API (permite apontar para um servidor local em testes)
+            session: Sessão HTTP (padrão: sessão compartilhada do módulo)
+            max_retries: Tentativas extras em erros 5xx / limite de requisições
+            backoff: Espera inicial (segundos) do backoff exponencial
         """
         self.token = token
         self.repo = repo
-        self.base_url = f"https://api.github.com/repos/{repo}/contents"
+        self.api_url = api_url.rstrip("/")
+        self.base_url = f"{self.api_url}/repos/{repo}/contents"
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        self.session = session if session is not None else _shared_session()
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def _request(self, method: str, url: str, headers: Optional[dict] = None,
+                 **kwargs) -> requests.Response:
+        """
+        Faz uma requisição pela sessão, repetindo com backoff exponencial em
+        erros de servidor, de rede e de limite de requisições (respeita Retry-After)
+
+        Retorna a última resposta; erros de rede da última tentativa são propagados.
+        """
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        kwargs.setdefault("timeout", 10)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                with timed(f"github {method}") as span:
+                    response = self.session.request(method, url, headers=request_headers, **kwargs)
+                    body = response.request.body
+                    span.bytes_out = len(body) if body else 0
+                    span.bytes_in = len(response.content)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last_attempt:
+                    raise
+                time.sleep(_retry_wait(None, attempt, self.backoff))
+                continue
+
+            if last_attempt or not _is_retryable(response):
+                return response
+            time.sleep(_retry_wait(response, attempt, self.backoff))
+        return response
     
     def get_file(self, file_path: str) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -34,15 +134,25 @@ class GitHubHandler:
             (conteúdo: str, sha: str) ou (None, None) se erro
         """
         url = f"{self.base_url}/{file_path}"
+        cached = _etag_cache.get(url)
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            # GET condicional: se o arquivo não mudou, o GitHub responde 304
+            # sem corpo (e sem consumir o limite de requisições)
+            conditional = {"If-None-Match": cached[0]} if cached else None
+            response = self._request("GET", url, headers=conditional)
+            if response.status_code == 304 and cached:
+                return cached[1], cached[2]
             response.raise_for_status()
 
             data = response.json()
             content = base64.b64decode(data['content']).decode('utf-8')
             sha = data['sha']
 
+            etag = response.headers.get("ETag")
+            if etag:
+                _etag_cache[url] = (etag, content, sha)
+
             return content, sha
 
         except requests.exceptions.RequestException as e:
@@ -75,7 +185,7 @@ class GitHubHandler:
         }
         
         try:
-            response = requests.put(url, headers=self.headers, json=data, timeout=10)
+            response = self._request("PUT", url, json=data)
             response.raise_for_status()
             return True
 
@@ -107,7 +217,7 @@ class GitHubHandler:
         }
         
         try:
-            response = requests.put(url, headers=self.headers, json=data, timeout=10)
+            response = self._request("PUT", url, json=data)
             response.raise_for_status()
             return True
 
@@ -128,7 +238,7 @@ class GitHubHandler:
         url = f"{self.base_url}/{file_path}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._request("GET", url)
             return response.status_code == 200
 
         except requests.exceptions.RequestException:
@@ -138,60 +248,74 @@ class GitHubHandler:
         """
         Commita múltiplos arquivos em um único commit via Git Trees API.
 
+        Cada arquivo é comparado com a árvore remota pelo SHA do blob
+        (calculado localmente): só os que mudaram são enviados como blobs, e
+        se nenhum mudou nenhum commit é criado.
+
         Args:
             files: lista de dicts com {"path": str, "content": str}
             message: mensagem do commit
             branch: branch alvo (padrão: "main")
 
         Retorna:
-            True se sucesso, False se erro
+            True se sucesso (inclusive sem mudanças), False se erro
         """
-        api_base = f"https://api.github.com/repos/{self.repo}"
+        api_base = f"{self.api_url}/repos/{self.repo}"
         try:
             # 1. SHA do commit HEAD
-            ref_resp = requests.get(
-                f"{api_base}/git/ref/heads/{branch}", headers=self.headers, timeout=10
-            )
+            ref_resp = self._request("GET", f"{api_base}/git/ref/heads/{branch}")
             ref_resp.raise_for_status()
             head_sha = ref_resp.json()["object"]["sha"]
 
             # 2. SHA da árvore atual
-            commit_resp = requests.get(
-                f"{api_base}/git/commits/{head_sha}", headers=self.headers, timeout=10
-            )
+            commit_resp = self._request("GET", f"{api_base}/git/commits/{head_sha}")
             commit_resp.raise_for_status()
             base_tree_sha = commit_resp.json()["tree"]["sha"]
 
-            # 3. Criar nova árvore
-            tree_entries = [
-                {"path": f["path"], "mode": "100644", "type": "blob", "content": f["content"]}
-                for f in files
-            ]
-            tree_resp = requests.post(
+            # 3. Comparar com os blobs remotos e enviar só os arquivos alterados
+            remote_shas = self._remote_blob_shas(api_base, base_tree_sha)
+            tree_entries = []
+            for f in files:
+                raw = f["content"].encode("utf-8")
+                if remote_shas.get(f["path"]) == git_blob_sha(raw):
+                    continue
+                blob_resp = self._request(
+                    "POST",
+                    f"{api_base}/git/blobs",
+                    json={"content": base64.b64encode(raw).decode(), "encoding": "base64"},
+                )
+                blob_resp.raise_for_status()
+                tree_entries.append(
+                    {"path": f["path"], "mode": "100644", "type": "blob", "sha": blob_resp.json()["sha"]}
+                )
+
+            if not tree_entries:
+                print("Nenhum arquivo alterado; commit não necessário")
+                return True
+
+            # 4. Criar nova árvore
+            tree_resp = self._request(
+                "POST",
                 f"{api_base}/git/trees",
-                headers=self.headers,
                 json={"base_tree": base_tree_sha, "tree": tree_entries},
-                timeout=10,
             )
             tree_resp.raise_for_status()
             new_tree_sha = tree_resp.json()["sha"]
 
-            # 4. Criar novo commit
-            new_commit_resp = requests.post(
+            # 5. Criar novo commit
+            new_commit_resp = self._request(
+                "POST",
                 f"{api_base}/git/commits",
-                headers=self.headers,
                 json={"message": message, "tree": new_tree_sha, "parents": [head_sha]},
-                timeout=10,
             )
             new_commit_resp.raise_for_status()
             new_commit_sha = new_commit_resp.json()["sha"]
 
-            # 5. Atualizar referência do branch
-            patch_resp = requests.patch(
+            # 6. Atualizar referência do branch
+            patch_resp = self._request(
+                "PATCH",
                 f"{api_base}/git/refs/heads/{branch}",
-                headers=self.headers,
                 json={"sha": new_commit_sha},
-                timeout=10,
             )
             patch_resp.raise_for_status()
             return True
@@ -200,6 +324,24 @@ class GitHubHandler:
             print(f"Erro ao criar commit multi-arquivo: {e}")
             return False
 
+    def _remote_blob_shas(self, api_base: str, tree_sha: str) -> Dict[str, str]:
+        """
+        Mapa {caminho: sha do blob} da árvore remota
+
+        Se a API truncar a listagem (repositório muito grande), retorna vazio
+        e todos os arquivos são tratados como alterados.
+        """
+        resp = self._request("GET", f"{api_base}/git/trees/{tree_sha}", params={"recursive": "1"})
+        resp.raise_for_status()
+        data = resp.json()
+        if data.get("truncated"):
+            return {}
+        return {
+            entry["path"]: entry["sha"]
+            for entry in data.get("tree", [])
+            if entry.get("type") == "blob"
+        }
+
     @staticmethod
     def get_raw_url(repo: str, file_path: str, branch: str = "main") -> str:
         """
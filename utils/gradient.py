@@ -0,0 +1,49 @@
+"""
+Gradientes de sombra aplicados sobre imagens de fundo
+"""
+from PIL import Image
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+
+
+@lru_cache(maxsize=16)
+def _bottom_gradient_layer(size: Tuple[int, int], intensity: float,
+                           color: Tuple[int, int, int], start: float) -> Image.Image:
+    """
+    Monta (uma única vez por combinação de parâmetros) a camada RGBA do gradiente
+
+    A rampa de alpha é calculada como um vetor de uma coluna e replicada na
+    largura por broadcasting, com a mesma fórmula linha a linha usada antes.
+    """
+    width, height = size
+    start_y = int(height * start)
+
+    alpha = np.zeros(height, dtype=np.uint8)
+    if height > start_y:
+        ys = np.arange(start_y, height, dtype=np.float64)
+        alpha[start_y:] = (255 * intensity * ((ys - start_y) / (height - start_y))).astype(np.uint8)
+
+    layer = np.empty((height, width, 4), dtype=np.uint8)
+    layer[..., :3] = color
+    layer[..., 3] = alpha[:, None]
+    return Image.fromarray(layer, "RGBA")
+
+
+def apply_bottom_gradient(image: Image.Image, intensity: float = 0.9,
+                          color: Tuple[int, int, int] = (0, 0, 0),
+                          start: float = 0.4) -> Image.Image:
+    """
+    Cria o efeito de sombra na parte inferior para destacar o texto
+
+    Args:
+        image: Imagem RGBA de fundo
+        intensity: Opacidade máxima do gradiente (no rodapé)
+        color: Cor RGB da sombra
+        start: Fração da altura onde o gradiente começa (0 = topo)
+
+    Returns:
+        Nova imagem com o gradiente composto
+    """
+    layer = _bottom_gradient_layer(image.size, float(intensity), tuple(color), float(start))
+    return Image.alpha_composite(image, layer)
@@ -0,0 +1,288 @@
+"""
+Exportação de imagens geradas (PNG, JPEG, WebP, AVIF e pacotes ZIP)
+
+encode_image codifica uma arte segundo um ExportSettings: formato, qualidade
+(ou uma predefinição de QUALITY_PRESETS) e, opcionalmente, um tamanho máximo
+em bytes, atingido por busca binária na qualidade. encode_async faz o mesmo
+num pool de threads (os codificadores do Pillow liberam o GIL), o que deixa
+o ImageZipWriter codificar uma arte enquanto a próxima é desenhada.
+"""
+from PIL import Image, features
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import IO, Deque, List, Optional, Tuple
+from collections import deque
+import contextvars
+import io
+import os
+import threading
+import zipfile
+
+try:
+    # Pillow sem AVIF nativo (anterior à 11.2) usa o plugin dos requirements
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+# Nível padrão de compressão zlib do PNG (0 = sem compressão, 9 = máxima)
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+
+# formato -> (formato do Pillow, extensão, tipo MIME)
+FORMATS = {
+    "png": ("PNG", "png", "image/png"),
+    "jpeg": ("JPEG", "jpeg", "image/jpeg"),
+    "webp": ("WEBP", "webp", "image/webp"),
+    "avif": ("AVIF", "avif", "image/avif"),
+}
+
+# Qualidade de cada predefinição nos formatos com perda. O PNG é sempre sem
+# perda, exceto em "compacta", que reduz para paleta de 256 cores; no WebP,
+# qualidade 100 vira lossless.
+QUALITY_PRESETS = {
+    "maxima": {"jpeg": 100, "webp": 100, "avif": 90},
+    "alta": {"jpeg": 92, "webp": 90, "avif": 75},
+    "compacta": {"jpeg": 80, "webp": 78, "avif": 55},
+}
+DEFAULT_PRESET = "alta"
+
+# Piso da busca por tamanho: abaixo disso os textos ficam borrados
+MIN_QUALITY = 30
+
+# JPEG com qualidade a partir daqui mantém a cor em resolução cheia (4:4:4),
+# sem o borrão vermelho/azul em volta dos textos finos
+_FULL_CHROMA_QUALITY = 90
+
+
+def available_formats() -> List[str]:
+    """Formatos que o Pillow instalado consegue gravar"""
+    return [fmt for fmt in FORMATS if fmt != "avif" or features.check("avif")]
+
+
+@dataclass(frozen=True)
+class ExportSettings:
+    """Como uma arte deve ser codificada (também entra na chave do cache de renders)"""
+    fmt: str = "png"
+    quality: Optional[int] = None
+    max_bytes: Optional[int] = None
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL
+    optimize_palette: bool = False
+
+    @classmethod
+    def from_preset(cls, fmt: str, preset: str = DEFAULT_PRESET,
+                    max_bytes: Optional[int] = None) -> "ExportSettings":
+        if fmt == "png":
+            return cls("png", max_bytes=max_bytes, optimize_palette=preset == "compacta")
+        return cls(fmt, QUALITY_PRESETS[preset][fmt], max_bytes)
+
+    @property
+    def extension(self) -> str:
+        return FORMATS[self.fmt][1]
+
+    @property
+    def mime(self) -> str:
+        return FORMATS[self.fmt][2]
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+# Prévias da interface: rápidas de codificar e leves para o navegador
+PREVIEW_EXPORT = ExportSettings("jpeg", quality=85)
+
+
+def _to_palette(img: Image.Image) -> Image.Image:
+    """
+    Reduz a imagem para uma paleta otimizada de até 256 cores
+
+    RGBA usa FASTOCTREE (único método que preserva a transparência);
+    as demais passam por RGB com MEDIANCUT, que dá degradês mais limpos.
+    """
+    if img.mode == "RGBA":
+        return img.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    return img.convert("RGB").quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+
+
+def save_png(img: Image.Image, fp: IO[bytes],
+             compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+             optimize_palette: bool = False) -> None:
+    """
+    Codifica uma imagem como PNG diretamente em um arquivo/stream
+
+    Args:
+        img: Imagem PIL
+        fp: Destino (arquivo, BytesIO ou entrada de ZIP aberta para escrita)
+        compress_level: Nível de compressão zlib (0-9)
+        optimize_palette: Se True, reduz para paleta de 256 cores (arquivo menor)
+    """
+    if optimize_palette:
+        img = _to_palette(img)
+    img.save(fp, format="PNG", compress_level=compress_level, optimize=optimize_palette)
+
+
+def encode_png(img: Image.Image,
+               compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+               optimize_palette: bool = False) -> bytes:
+    """Codifica uma imagem como PNG e retorna os bytes"""
+    buffer = io.BytesIO()
+    save_png(img, buffer, compress_level=compress_level, optimize_palette=optimize_palette)
+    return buffer.getvalue()
+
+
+def _save(img: Image.Image, fp: IO[bytes], fmt: str, quality: Optional[int],
+          compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+          optimize_palette: bool = False) -> None:
+    if fmt == "png":
+        save_png(img, fp, compress_level=compress_level, optimize_palette=optimize_palette)
+    elif fmt == "jpeg":
+        img.convert("RGB").save(
+            fp, format="JPEG", quality=quality, optimize=True, progressive=True,
+            subsampling=0 if quality >= _FULL_CHROMA_QUALITY else 2,
+        )
+    elif fmt == "webp":
+        img.save(fp, format="WEBP", quality=quality, method=4, lossless=quality >= 100)
+    elif fmt == "avif":
+        img.save(fp, format="AVIF", quality=quality, speed=6)
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+
+
+def _encode(img: Image.Image, settings: ExportSettings,
+            quality: Optional[int] = None, optimize_palette: Optional[bool] = None) -> bytes:
+    buffer = io.BytesIO()
+    _save(
+        img, buffer, settings.fmt,
+        quality if quality is not None else _quality(settings),
+        compress_level=settings.compress_level,
+        optimize_palette=settings.optimize_palette if optimize_palette is None else optimize_palette,
+    )
+    return buffer.getvalue()
+
+
+def _quality(settings: ExportSettings) -> Optional[int]:
+    if settings.fmt == "png":
+        return None
+    if settings.quality is not None:
+        return settings.quality
+    return QUALITY_PRESETS[DEFAULT_PRESET][settings.fmt]
+
+
+def _fit_to_size(img: Image.Image, settings: ExportSettings) -> bytes:
+    """
+    Maior qualidade cujo arquivo cabe em settings.max_bytes (busca binária
+    entre MIN_QUALITY e a qualidade pedida). Se nem o piso couber, devolve o
+    menor arquivo obtido; no PNG a única alavanca é a paleta de 256 cores.
+    """
+    data = _encode(img, settings)
+    if len(data) <= settings.max_bytes:
+        return data
+
+    if settings.fmt == "png":
+        if settings.optimize_palette:
+            return data
+        return min(data, _encode(img, settings, optimize_palette=True), key=len)
+
+    lo, hi = MIN_QUALITY, _quality(settings) - 1
+    best: Optional[bytes] = None
+    smallest = data
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        candidate = _encode(img, settings, quality=mid)
+        if len(candidate) <= settings.max_bytes:
+            best, lo = candidate, mid + 1
+        else:
+            hi = mid - 1
+            if len(candidate) < len(smallest):
+                smallest = candidate
+    return best if best is not None else smallest
+
+
+def encode_image(img: Image.Image, settings: ExportSettings = ExportSettings()) -> bytes:
+    """Codifica uma imagem segundo settings e retorna os bytes"""
+    if settings.max_bytes:
+        return _fit_to_size(img, settings)
+    return _encode(img, settings)
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _encoder_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="encoder",
+            )
+        return _pool
+
+
+def encode_async(img: Image.Image, settings: ExportSettings = ExportSettings()) -> "Future[bytes]":
+    """
+    encode_image numa thread do pool de codificação (no contexto de quem
+    chamou, para o tempo ir para a mesma ação do perf). img não deve ser
+    alterada até o Future terminar.
+    """
+    return _encoder_pool().submit(contextvars.copy_context().run, encode_image, img, settings)
+
+
+def read_zip_entry(zip_source, filename: str) -> bytes:
+    """Lê os bytes de uma entrada de um ZIP (caminho ou arquivo aberto)"""
+    with zipfile.ZipFile(zip_source, "r") as zf:
+        return zf.read(filename)
+
+
+class ImageZipWriter:
+    """
+    Escreve imagens em um ZIP à medida que são geradas
+
+    Cada imagem vai para o pool de codificação assim que chega e é gravada
+    no arquivo de destino, na ordem de chegada, quando fica pronta; no máximo
+    max_pending artes ficam decodificadas em memória ao mesmo tempo, e a
+    codificação de uma corre enquanto a próxima é desenhada. As imagens já
+    são comprimidas, por isso as entradas usam ZIP_STORED (recomprimir com
+    DEFLATE só gastaria CPU).
+
+    Uso:
+        with ImageZipWriter(arquivo, settings) as zip_writer:
+            for idx, img in enumerate(gerador, start=1):
+                zip_writer.add(f"arte-{idx}.{settings.extension}", img)
+    """
+
+    def __init__(self, fileobj: IO[bytes], settings: ExportSettings = ExportSettings(),
+                 max_pending: int = 2):
+        self.settings = settings
+        self.max_pending = max_pending
+        self.filenames: List[str] = []
+        self._pending: Deque[Tuple[str, "Future[bytes]"]] = deque()
+        self._zip = zipfile.ZipFile(fileobj, "w", zipfile.ZIP_STORED)
+
+    def add(self, filename: str, img: Image.Image) -> None:
+        """Agenda a codificação da imagem; grava as que já terminaram"""
+        self._pending.append((filename, encode_async(img, self.settings)))
+        while len(self._pending) > self.max_pending:
+            self._write_oldest()
+
+    def _write_oldest(self) -> None:
+        filename, future = self._pending.popleft()
+        self._zip.writestr(filename, future.result())
+        self.filenames.append(filename)
+
+    def close(self) -> None:
+        try:
+            while self._pending:
+                self._write_oldest()
+        finally:
+            self._zip.close()
+
+    def __enter__(self) -> "ImageZipWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            # Erro no meio da geração: descarta o que ainda está na fila
+            for _, future in self._pending:
+                future.cancel()
+            self._pending.clear()
+        self.close()
@@ -1,14 +1,94 @@
 """
 Gerador de imagens para resultados e tabelas
 """
-from PIL import Image, ImageDraw, ImageFont
-from typing import List, Dict, Optional, Tuple
+from PIL import Image, ImageDraw
+from collections import OrderedDict
+from typing import List, Dict, NamedTuple, Optional, Tuple
+import copy
 import json
+import math
 import os
+import threading
+
+from utils.perf import instrument
+from utils.scaling import fitted_badge, load_scaled, scale_geometry, scaled, scaled_font_size
+from utils.text_sprites import draw_text, get_font, text_bbox
 
 # Ligas que compartilham o design unificado da Premier League.
 DESIGN_UNIFICADO = {'premierleague', 'championship', 'leagueone', 'leaguetwo'}
 
+# Ordem de prioridade das confirmações por liga: (chave da confirmação, zona)
+_EFL_PRIORITY = (
+    ('champion', 'champion'),
+    ('promoted', 'promoted'),
+    ('playoffs', 'playoffs'),
+    ('relegated', 'relegation'),
+)
+_CONFIRMATION_PRIORITY = {
+    'premierleague': (
+        ('champion', 'champion'),
+        ('ucl', 'ucl'),
+        ('uel', 'uel'),
+        ('uecl', 'uecl'),
+        ('relegated', 'relegation'),
+    ),
+    'championship': _EFL_PRIORITY,
+    'leagueone': _EFL_PRIORITY,
+    'leaguetwo': _EFL_PRIORITY,
+    'nationalleague': (
+        ('champion', 'champion'),
+        ('playoffs_semi', 'playoffs_semi'),        # Semi-finals (2º e 3º)
+        ('playoffs_quarter', 'playoffs_quarter'),  # Quarter-finals (4º-7º)
+        ('relegated', 'relegation'),
+    ),
+}
+
+# Quantas combinações (liga, modo, confirmações) de rects manter compiladas
+_ZONE_RECTS_CACHE_SIZE = 16
+
+
+def _union_box(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _boxes_overlap(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class ResultsRenderState:
+    """
+    Última arte de resultados de uma sessão, guardada para repintar só os
+    jogos que mudarem (ver ImageGenerator.generate_results_image)
+
+    Guarda o fundo sem jogos (template + texto da rodada), a arte pronta e,
+    por jogo, o resultado desenhado, as operações de desenho e a caixa que
+    elas ocupam. Não é compartilhado entre sessões: cada uma tem o seu.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key: Optional[tuple] = None
+        self.background: Optional[Image.Image] = None
+        self.image: Optional[Image.Image] = None
+        self.results: List[Dict] = []
+        self.slots: List[Tuple[List[tuple], Tuple[int, int, int, int]]] = []
+
+
+class TableLayers(NamedTuple):
+    """
+    Tabela em camadas (ver ImageGenerator.generate_table_layers): o sprite de
+    cada time (na ordem de table_data) vai em (dx, floor(table_top + linha *
+    row_height) + dy). final é a tabela estática (generate_table_image): o
+    texto composto a partir de um sprite transparente pode diferir dela em um
+    nível de cor nas bordas suavizadas.
+    """
+    background: Image.Image
+    sprites: List[Tuple[Image.Image, Tuple[int, int]]]
+    table_top: float
+    row_height: float
+    final: Image.Image
+
+
 class ImageGenerator:
     def __init__(self, config_path: str = "config/leagues_config.json"):
         """Inicializa o gerador com as configurações das ligas"""
@@ -22,6 +102,11 @@ class ImageGenerator:
                 self.display_names = json.load(f)
         else:
             self.display_names = {}
+
+        # Rects de zona compilados (por posição)
+        self._zone_rects: "OrderedDict[tuple, List[Optional[Image.Image]]]" = OrderedDict()
+        # A instância é compartilhada entre as sessões (threads) do app
+        self._zone_rects_lock = threading.Lock()
         
     def _load_image(self, path: str) -> Image.Image:
         """Carrega uma imagem e converte para RGBA"""
@@ -30,17 +115,11 @@ class ImageGenerator:
     def _resize_badge(self, badge_path: str, target_size: Tuple[int, int]) -> Image.Image:
         """
         Redimensiona um escudo mantendo proporções e centralizando
+
+        O resultado fica em cache por (arquivo, tamanho) e é compartilhado:
+        serve só para colar, não para desenhar por cima.
         """
-        badge = self._load_image(badge_path)
-        badge.thumbnail(target_size, Image.LANCZOS)
-        
-        # Centralizar em canvas transparente
-        canvas = Image.new("RGBA", target_size, (0, 0, 0, 0))
-        pos_x = (target_size[0] - badge.width) // 2
-        pos_y = (target_size[1] - badge.height) // 2
-        canvas.paste(badge, (pos_x, pos_y), badge)
-        
-        return canvas
+        return fitted_badge(badge_path, target_size)
     
     def _get_badge_path(self, team_name: str, badges_folder: str) -> str:
         """
@@ -106,8 +185,9 @@ class ImageGenerator:
         if not table_mode_name:
             return zones
 
-        # Criar cópia para não modificar o original
-        adjusted_zones = zones.copy()
+        # Cópia profunda: as listas de posições são compartilhadas com a
+        # configuração da instância (reaproveitada entre renderizações)
+        adjusted_zones = copy.deepcopy(zones)
 
         # Mapear modos para configurações
         if "G6" in table_mode_name:
@@ -165,9 +245,12 @@ class ImageGenerator:
         
         return positions
     
+    @instrument()
     def generate_results_image(self, league: str, results: List[Dict], 
                               round_number: Optional[int] = None,
-                              is_postponed: bool = False) -> Image.Image:
+                              is_postponed: bool = False,
+                              scale: float = 1.0,
+                              state: Optional["ResultsRenderState"] = None) -> Image.Image:
         """
         Gera imagem de resultados de uma rodada
         
@@ -176,42 +259,69 @@ class ImageGenerator:
             results: Lista de resultados parseados
             round_number: Número da rodada (ou None para "Jogos Atrasados")
             is_postponed: Se True, mostra "Jogos Atrasados" ao invés do número
+            scale: Fator de escala da arte (ex.: PREVIEW_SCALE para prévias)
+            state: Última renderização desta sessão (ResultsRenderState). Se
+                liga, rodada, escala e número de jogos forem os mesmos, só os
+                jogos que mudaram são repintados sobre a arte anterior
         
         Retorna:
             Imagem PIL gerada
         """
         config = self.leagues_config[league]
-        rt = config['results_template']
-        
-        # Carregar template base
-        template_path = os.path.join("resultados", rt['template_file'])
-        base = self._load_image(template_path)
+        results_to_display = results[:config['max_results_display']]
 
-        # Carregar rect base
-        rect_path = os.path.join("resultados", rt['rect_file'])
-        rect_base = self._load_image(rect_path)
-        
-        # Limitar número de resultados exibidos
-        max_display = config['max_results_display']
-        results_to_display = results[:max_display]
-        
-        # Calcular posições centralizadas
-        rect_positions = self._calculate_centered_rects(
-            total_slots=max_display,
-            num_matches=len(results_to_display),
-            start_y=rt['rect_start_position']['y'],
-            gap=rt['rect_gap']
-        )
-        
-        # Preparar fonte
+        if state is None:
+            return self._render_results(league, results_to_display, round_number,
+                                        is_postponed, scale).image
+
+        key = (id(self), league, round_number, is_postponed, scale, len(results_to_display))
+        with state.lock:
+            if state.key == key:
+                self._repaint_results(state, league, results_to_display, scale)
+            else:
+                fresh = self._render_results(league, results_to_display, round_number,
+                                             is_postponed, scale, keep_background=True)
+                state.key = key
+                state.background = fresh.background
+                state.image = fresh.image
+                state.results = fresh.results
+                state.slots = fresh.slots
+            return state.image.copy()
+
+    def _results_layout(self, league: str, num_matches: int, scale: float) -> Dict:
+        """Geometria, fontes e rect da arte de resultados (tudo já escalado)"""
+        config = self.leagues_config[league]
+        rt = scale_geometry(config['results_template'], scale)
         font_path = self._get_font_for_league(league, bold=False)
-        font_team = ImageFont.truetype(font_path, rt['font_team_size'])
-        font_score = ImageFont.truetype(self._get_font_for_league(league, bold=True), rt['font_score_size'])
         # Fonte do texto de rodada: usa arquivo específico se definido na config
         round_font_path = (os.path.join("fontes", rt['round_font_file'])
                            if rt.get('round_font_file') else font_path)
-        font_round = ImageFont.truetype(round_font_path, rt['font_round_size'])
-        
+        return {
+            'rt': rt,
+            'badges_folder': config['badges_folder'],
+            'rect': load_scaled(os.path.join("resultados", rt['rect_file']), scale),
+            'font_team': get_font(font_path, rt['font_team_size']),
+            'font_score': get_font(self._get_font_for_league(league, bold=True), rt['font_score_size']),
+            'font_round': get_font(round_font_path, rt['font_round_size']),
+            # Calcular posições centralizadas
+            'positions': self._calculate_centered_rects(
+                total_slots=config['max_results_display'],
+                num_matches=num_matches,
+                start_y=rt['rect_start_position']['y'],
+                gap=rt['rect_gap']
+            ),
+        }
+
+    def _render_results(self, league: str, results_to_display: List[Dict],
+                        round_number: Optional[int], is_postponed: bool,
+                        scale: float, keep_background: bool = False) -> "ResultsRenderState":
+        """Arte de resultados completa (template, texto da rodada e todos os jogos)"""
+        layout = self._results_layout(league, len(results_to_display), scale)
+        rt = layout['rt']
+
+        # Carregar template base (cópia: vamos desenhar sobre ela)
+        template_path = os.path.join("resultados", rt['template_file'])
+        base = load_scaled(template_path, scale).copy()
         draw = ImageDraw.Draw(base)
         
         # Desenhar texto da rodada
@@ -221,8 +331,9 @@ class ImageGenerator:
             round_text = f"RODADA {round_number}" if round_number else ""
         
         if round_text:
+            font_round = layout['font_round']
             # Medir largura do texto
-            bbox = draw.textbbox((0, 0), round_text, font=font_round)
+            bbox = text_bbox(font_round, round_text)
             text_width = bbox[2] - bbox[0]
             
             # CONDIÇÃO: National League usa X do JSON, outras centralizam
@@ -233,130 +344,211 @@ class ImageGenerator:
                 # Outras ligas: centralizar
                 x_pos = (base.width - text_width) // 2
             
-            draw.text(
+            draw_text(
+                draw,
                 (x_pos, rt['round_text_position']['y']),
                 round_text,
-                font=font_round,
-                fill=rt['color_text']
+                font_round,
+                rt['color_text']
             )
+
+        render = ResultsRenderState()
+        render.background = base.copy() if keep_background else None
+        render.results = copy.deepcopy(results_to_display)
         
         # Desenhar cada resultado
-        badges_folder = config['badges_folder']
-        
         for idx, result in enumerate(results_to_display):
-            y_pos = rect_positions[idx]
-            x_pos = rt['rect_start_position']['x']
-            
-            # Colar rect
-            base.paste(rect_base, (x_pos, y_pos), rect_base)
-            
-            # Carregar e colar escudos
-            home_badge = self._resize_badge(
-                self._get_badge_path(result['home_team'], badges_folder),  # ← Nome original
-                (rt['badge_size']['width'], rt['badge_size']['height'])
-            )
+            ops, box = self._result_slot_ops(league, layout, result, layout['positions'][idx])
+            self._apply_slot_ops(base, draw, ops)
+            render.slots.append((ops, box))
 
-            away_badge = self._resize_badge(
-                self._get_badge_path(result['away_team'], badges_folder),  # ← Nome original
-                (rt['badge_size']['width'], rt['badge_size']['height'])
-            )
-                        
-            base.paste(
-                home_badge,
-                (x_pos + rt['badge_home_offset']['x'], 
-                 y_pos + rt['badge_home_offset']['y']),
-                home_badge
-            )
-            base.paste(
-                away_badge,
-                (x_pos + rt['badge_away_offset']['x'],
-                 y_pos + rt['badge_away_offset']['y']),
-                away_badge
-            )
-            
-            # Desenhar nomes dos times
-            home_name = self._get_display_name(result['home_team'], league, 'results').upper()
-            away_name = self._get_display_name(result['away_team'], league, 'results').upper()
-
-            # Alinhamento configurável: 'left', 'right' ou 'center' (padrão).
-            # O offset X é a âncora: borda esquerda ('left'), direita ('right')
-            # ou centro ('center') do texto.
-            home_align = rt.get('team_name_home_align', 'center')
-            away_align = rt.get('team_name_away_align', 'center')
-
-            # NOME DO TIME MANDANTE
-            bbox_home = draw.textbbox((0, 0), home_name, font=font_team)
-            home_width = bbox_home[2] - bbox_home[0]
-            home_anchor_x = x_pos + rt['team_name_home_offset']['x']
-            if home_align == 'left':
-                home_x = home_anchor_x
-            elif home_align == 'right':
-                home_x = home_anchor_x - home_width
-            else:
-                home_x = home_anchor_x - (home_width // 2)
-
-            draw.text(
-                (home_x,
-                y_pos + rt['team_name_home_offset']['y']),
-                home_name,
-                font=font_team,
-                fill=rt['color_text']
-            )
+        render.image = base
+        return render
 
-            # NOME DO TIME VISITANTE
-            bbox_away = draw.textbbox((0, 0), away_name, font=font_team)
-            away_width = bbox_away[2] - bbox_away[0]
-            away_anchor_x = x_pos + rt['team_name_away_offset']['x']
-            if away_align == 'left':
-                away_x = away_anchor_x
-            elif away_align == 'right':
-                away_x = away_anchor_x - away_width
-            else:
-                away_x = away_anchor_x - (away_width // 2)
-
-            draw.text(
-                (away_x,
-                y_pos + rt['team_name_away_offset']['y']),
-                away_name,
-                font=font_team,
-                fill=rt['color_text']
-            )
+    def _repaint_results(self, state: "ResultsRenderState", league: str,
+                         results_to_display: List[Dict], scale: float) -> None:
+        """
+        Repinta na arte do estado só os jogos que mudaram
+
+        Cada região alterada (caixa do jogo antigo ∪ caixa do novo) é refeita a
+        partir do fundo sem jogos, redesenhando nela, em ordem, todos os jogos
+        que a tocam; o resultado é idêntico ao de uma renderização completa.
+        """
+        changed = [idx for idx, (old, new) in enumerate(zip(state.results, results_to_display))
+                   if old != new]
+        if not changed:
+            return
+
+        layout = self._results_layout(league, len(results_to_display), scale)
+        regions = []
+        for idx in changed:
+            ops, box = self._result_slot_ops(league, layout, results_to_display[idx],
+                                             layout['positions'][idx])
+            regions.append(_union_box(state.slots[idx][1], box))
+            state.slots[idx] = (ops, box)
+            state.results[idx] = copy.deepcopy(results_to_display[idx])
+
+        width, height = state.image.size
+        for left, top, right, bottom in regions:
+            region = (max(0, left), max(0, top), min(width, right), min(height, bottom))
+            if region[0] >= region[2] or region[1] >= region[3]:
+                continue
+            canvas = state.background.crop(region)
+            draw = ImageDraw.Draw(canvas)
+            for ops, box in state.slots:
+                if _boxes_overlap(box, region):
+                    self._apply_slot_ops(canvas, draw, ops, offset=(-region[0], -region[1]))
+            state.image.paste(canvas, region[:2])
+
+    def _result_slot_ops(self, league: str, layout: Dict, result: Dict,
+                         y_pos: int) -> Tuple[List[tuple], Tuple[int, int, int, int]]:
+        """
+        Operações de desenho de um jogo (colagens e textos) e a caixa que elas
+        ocupam na arte
+        """
+        rt = layout['rt']
+        font_team = layout['font_team']
+        font_score = layout['font_score']
+        badges_folder = layout['badges_folder']
+        x_pos = rt['rect_start_position']['x']
+        rect_base = layout['rect']
+
+        # Colar rect
+        ops = [('paste', rect_base, (x_pos, y_pos))]
+        
+        # Carregar e colar escudos
+        home_badge = self._resize_badge(
+            self._get_badge_path(result['home_team'], badges_folder),  # ← Nome original
+            (rt['badge_size']['width'], rt['badge_size']['height'])
+        )
+
+        away_badge = self._resize_badge(
+            self._get_badge_path(result['away_team'], badges_folder),  # ← Nome original
+            (rt['badge_size']['width'], rt['badge_size']['height'])
+        )
+                    
+        ops.append((
+            'paste',
+            home_badge,
+            (x_pos + rt['badge_home_offset']['x'], 
+             y_pos + rt['badge_home_offset']['y'])
+        ))
+        ops.append((
+            'paste',
+            away_badge,
+            (x_pos + rt['badge_away_offset']['x'],
+             y_pos + rt['badge_away_offset']['y'])
+        ))
+        
+        # Desenhar nomes dos times
+        home_name = self._get_display_name(result['home_team'], league, 'results').upper()
+        away_name = self._get_display_name(result['away_team'], league, 'results').upper()
+
+        # Alinhamento configurável: 'left', 'right' ou 'center' (padrão).
+        # O offset X é a âncora: borda esquerda ('left'), direita ('right')
+        # ou centro ('center') do texto.
+        home_align = rt.get('team_name_home_align', 'center')
+        away_align = rt.get('team_name_away_align', 'center')
+
+        # NOME DO TIME MANDANTE
+        bbox_home = text_bbox(font_team, home_name)
+        home_width = bbox_home[2] - bbox_home[0]
+        home_anchor_x = x_pos + rt['team_name_home_offset']['x']
+        if home_align == 'left':
+            home_x = home_anchor_x
+        elif home_align == 'right':
+            home_x = home_anchor_x - home_width
+        else:
+            home_x = home_anchor_x - (home_width // 2)
+
+        ops.append((
+            'text',
+            (home_x,
+            y_pos + rt['team_name_home_offset']['y']),
+            home_name,
+            font_team,
+            rt['color_text']
+        ))
+
+        # NOME DO TIME VISITANTE
+        bbox_away = text_bbox(font_team, away_name)
+        away_width = bbox_away[2] - bbox_away[0]
+        away_anchor_x = x_pos + rt['team_name_away_offset']['x']
+        if away_align == 'left':
+            away_x = away_anchor_x
+        elif away_align == 'right':
+            away_x = away_anchor_x - away_width
+        else:
+            away_x = away_anchor_x - (away_width // 2)
+
+        ops.append((
+            'text',
+            (away_x,
+            y_pos + rt['team_name_away_offset']['y']),
+            away_name,
+            font_team,
+            rt['color_text']
+        ))
+        
+        # Desenhar placar centralizado
+        status = result.get('status', 'normal')
+
+        if status == 'normal':
+            # Placar normal — separador configurável por liga (padrão " - ")
+            score_sep = rt.get('score_separator', ' - ')
+            score_text = f"{result['home_score']}{score_sep}{result['away_score']}"
+        elif status == 'future':
+            # Jogo futuro - não mostrar nada
+            score_text = ""
+        elif status == 'vs':
+            # Jogo futuro com vs.
+            score_text = "vs."
+        elif status == 'postponed':
+            # Jogo adiado
+            score_text = "ADI."
+        elif status == 'abandoned':
+            # Jogo abandonado
+            score_text = "ABD."
+        else:
+            score_text = ""
+
+        if score_text:  # Só desenha se tiver texto
+            bbox_score = text_bbox(font_score, score_text)
+            score_width = bbox_score[2] - bbox_score[0]
             
-            # Desenhar placar centralizado
-            status = result.get('status', 'normal')
-
-            if status == 'normal':
-                # Placar normal — separador configurável por liga (padrão " - ")
-                score_sep = rt.get('score_separator', ' - ')
-                score_text = f"{result['home_score']}{score_sep}{result['away_score']}"
-            elif status == 'future':
-                # Jogo futuro - não mostrar nada
-                score_text = ""
-            elif status == 'vs':
-                # Jogo futuro com vs.
-                score_text = "vs."
-            elif status == 'postponed':
-                # Jogo adiado
-                score_text = "ADI."
-            elif status == 'abandoned':
-                # Jogo abandonado
-                score_text = "ABD."
+            ops.append((
+                'text',
+                (x_pos + rt['score_offset']['x'] - score_width // 2,
+                y_pos + rt['score_offset']['y']),
+                score_text,
+                font_score,
+                rt['color_score']
+            ))
+
+        box = None
+        for op in ops:
+            if op[0] == 'paste':
+                img, (x, y) = op[1], op[2]
+                op_box = (x, y, x + img.width, y + img.height)
             else:
-                score_text = ""
-
-            if score_text:  # Só desenha se tiver texto
-                bbox_score = draw.textbbox((0, 0), score_text, font=font_score)
-                score_width = bbox_score[2] - bbox_score[0]
-                
-                draw.text(
-                    (x_pos + rt['score_offset']['x'] - score_width // 2,
-                    y_pos + rt['score_offset']['y']),
-                    score_text,
-                    font=font_score,
-                    fill=rt['color_score']
-                )
-        
-        return base
+                (x, y), text, font = op[1], op[2], op[3]
+                left, top, right, bottom = text_bbox(font, text)
+                # 1px de folga para a suavização das bordas do texto
+                op_box = (x + left - 1, y + top - 1, x + right + 1, y + bottom + 1)
+            box = op_box if box is None else _union_box(box, op_box)
+        return ops, box
+
+    @staticmethod
+    def _apply_slot_ops(base: Image.Image, draw: ImageDraw.ImageDraw, ops: List[tuple],
+                        offset: Tuple[int, int] = (0, 0)) -> None:
+        dx, dy = offset
+        for op in ops:
+            if op[0] == 'paste':
+                img, (x, y) = op[1], op[2]
+                base.paste(img, (x + dx, y + dy), img)
+            else:
+                (x, y), text, font, fill = op[1], op[2], op[3], op[4]
+                draw_text(draw, (x + dx, y + dy), text, font, fill)
     
     def _get_font_for_league(self, league: str, bold : bool) -> str:
         """Retorna o caminho da fonte para uma liga"""
@@ -379,10 +571,12 @@ class ImageGenerator:
             }
         return font_map.get(league, 'fontes/FontePlacar.ttf')
     
+    @instrument()
     def generate_table_image(self, league: str, table_data: List[Dict],
                             confirmations: Optional[Dict] = None,
                             table_mode: Optional[Dict] = None,
-                            round_number: Optional[int] = None) -> Image.Image:
+                            round_number: Optional[int] = None,
+                            scale: float = 1.0) -> Image.Image:
         """
         Gera imagem da tabela de classificação
         
@@ -391,24 +585,97 @@ class ImageGenerator:
             table_data: Lista de dicionários com dados dos times
             confirmations: Dict com confirmações {position: {'champion': True, 'ucl': True, ...}}
             table_mode: Para PL, dict com configuração de vagas europeias
+            scale: Fator de escala da arte (ex.: PREVIEW_SCALE para prévias)
         
         Retorna:
             Imagem PIL gerada
         """
+        base, layout = self._table_base(
+            league, len(table_data), confirmations, table_mode, round_number, scale
+        )
+        draw = ImageDraw.Draw(base)
+        tt = layout['tt']
+        # Notas de punição sob as linhas, como no fundo de generate_table_layers
+        self._draw_penalty_notes(draw, league, layout, table_data, scale)
+
+        # Desenhar cada linha da tabela
+        for idx, team in enumerate(table_data):
+            y_pos = tt['table_start']['y'] + (idx * tt['row_height'])
+            self._draw_table_row(base, draw, league, layout, team, y_pos)
+
+        return base
+
+    def generate_table_layers(self, league: str, table_data: List[Dict],
+                              confirmations: Optional[Dict] = None,
+                              table_mode: Optional[Dict] = None,
+                              round_number: Optional[int] = None,
+                              scale: float = 1.0) -> "TableLayers":
+        """
+        A tabela separada em camadas, para animar as linhas (ver
+        utils/standings_animation.py)
+
+        O fundo traz tudo o que pertence à posição e não ao time (template,
+        rodada, cabeçalho, rects de zona, números e notas de punição); cada
+        time vira um sprite RGBA com escudo, nome e estatísticas, desenhado
+        uma vez só e colado em qualquer altura. final traz a tabela estática,
+        para o quadro parado do fim.
+        """
+        background, layout = self._table_base(
+            league, len(table_data), confirmations, table_mode, round_number, scale
+        )
+        self._draw_penalty_notes(ImageDraw.Draw(background), league, layout, table_data, scale)
+        final = background.copy()
+        final_draw = ImageDraw.Draw(final)
+
+        tt = layout['tt']
+        row_height = tt['row_height']
+        # Margem de uma linha acima e abaixo para o que sai da faixa da linha
+        pad = math.ceil(row_height)
+        sprites = []
+        for idx, team in enumerate(table_data):
+            # Origem local com a mesma fração e paridade da linha final: os
+            # arredondamentos (round arredonda .5 para o par) saem iguais aos
+            # de generate_table_image e o sprite parado coincide com a tabela
+            y_final = tt['table_start']['y'] + idx * row_height
+            self._draw_table_row(final, final_draw, league, layout, team, y_final)
+            origin = pad + (math.floor(y_final) - pad) % 2
+            canvas = Image.new("RGBA", (background.width, origin + pad * 2), (0, 0, 0, 0))
+            self._draw_table_row(canvas, ImageDraw.Draw(canvas), league, layout, team,
+                                 origin + y_final % 1, composite=True)
+            bbox = canvas.getbbox() or (0, 0, 1, 1)
+            sprites.append((canvas.crop(bbox), (bbox[0], bbox[1] - origin)))
+
+        return TableLayers(
+            background=background.convert("RGB"),
+            sprites=sprites,
+            table_top=tt['table_start']['y'],
+            row_height=row_height,
+            final=final.convert("RGB"),
+        )
+
+    def _table_base(self, league: str, num_rows: int,
+                    confirmations: Optional[Dict],
+                    table_mode: Optional[Dict],
+                    round_number: Optional[int],
+                    scale: float) -> Tuple[Image.Image, Dict]:
+        """
+        Template da tabela com o que não depende dos times (rodada, cabeçalho,
+        rects de zona e números das posições) e o layout usado pelas linhas
+        """
         config = self.leagues_config[league]
-        tt = config['table_template']
+        tt = scale_geometry(config['table_template'], scale)
         
         # Carregar template da tabela como base
         template_file = tt.get('template_file', f'{league}-template.png')
         template_path = os.path.join("tabela", template_file)
         
         if os.path.exists(template_path):
-            base = self._load_image(template_path)
+            base = load_scaled(template_path, scale).copy()
         else:
             # Se não existir template específico, tentar usar o template geral
             fallback_path = os.path.join("tabela", f"template-{league}.png")
             if os.path.exists(fallback_path):
-                base = self._load_image(fallback_path)
+                base = load_scaled(fallback_path, scale).copy()
             else:
                 raise FileNotFoundError(f"Template de tabela não encontrado: {template_path} ou {fallback_path}")
         
@@ -423,10 +690,10 @@ class ImageGenerator:
             mw_font_path = (os.path.join("fontes", tt['matchweek_font_file'])
                             if tt.get('matchweek_font_file')
                             else self._get_font_for_league(league, bold=False))
-            mw_font = ImageFont.truetype(mw_font_path, tt.get('matchweek_font_size', 40))
+            mw_font = get_font(mw_font_path, tt.get('matchweek_font_size', scaled_font_size(40, scale)))
             mw_color = tt.get('matchweek_color', tt['color_text'])
 
-            bbox_mw = mw_font.getbbox(mw_text)
+            bbox_mw = text_bbox(mw_font, mw_text)
             mw_w = bbox_mw[2] - bbox_mw[0]
             mw_h = bbox_mw[3] - bbox_mw[1]
             txt_img = Image.new("RGBA", (mw_w, mw_h), (0, 0, 0, 0))
@@ -443,14 +710,7 @@ class ImageGenerator:
         else:
             font_path = self._get_font_for_league(league, bold=False)
             font_bold_path = self._get_font_for_league(league, bold=True)
-        font_normal = ImageFont.truetype(font_path, tt['font_size'])
-        font_bold = ImageFont.truetype(font_bold_path, tt['font_bold_size'])
-
-        badges_folder = config['badges_folder']
-        # AJUSTAR ZONAS EUROPEIAS PARA PREMIER LEAGUE
-        zones = config['promotion_zones'].copy()
-        if league == 'premierleague' and table_mode:
-            zones = self._adjust_european_zones_for_mode(zones, table_mode)
+        font_bold = get_font(font_bold_path, tt['font_bold_size'])
 
         # Templates "zerados" já trazem cabeçalho, números de posição e faixas de
         # zona embutidos no PNG; nesse caso só preenchemos escudos, nomes e stats.
@@ -458,9 +718,9 @@ class ImageGenerator:
 
         if not baked_template:
             if league == 'nationalleague':
-                header_y = tt['table_start']['y'] - 35  # Nacional precisa de mais espaço
+                header_y = tt['table_start']['y'] - scaled(35, scale)  # Nacional precisa de mais espaço
             else:
-                header_y = tt['table_start']['y'] - 30
+                header_y = tt['table_start']['y'] - scaled(30, scale)
             header_labels = {
                 'J': 'J',
                 'V': 'V',
@@ -475,25 +735,25 @@ class ImageGenerator:
                     x_pos = tt['stats_columns'][key]
 
                     # Centralizar texto
-                    bbox = draw.textbbox((0, 0), label, font=font_bold)
+                    bbox = text_bbox(font_bold, label)
                     label_width = bbox[2] - bbox[0]
 
-                    draw.text(
+                    draw_text(
+                        draw,
                         (x_pos - label_width // 2, header_y),
                         label,
-                        font=font_bold,
-                        fill=tt['color_text']
+                        font_bold,
+                        tt['color_text']
                     )
 
-        # Desenhar cada linha da tabela
-        for idx, team in enumerate(table_data):
-            y_pos = tt['table_start']['y'] + (idx * tt['row_height'])
-            
-            if not baked_template:
-                # Determinar qual rect usar baseado na posição
-                rect_img = self._get_rect_for_position(
-                    league, idx + 1, confirmations, zones
-                )
+            # Rect de cada posição (zonas já ajustadas ao modo da Premier League)
+            zone_rects = self._compile_zone_rects(
+                league, num_rows, confirmations, table_mode, scale
+            )
+
+            for idx in range(num_rows):
+                y_pos = tt['table_start']['y'] + (idx * tt['row_height'])
+                rect_img = zone_rects[idx]
 
                 if rect_img:
                     rect_x = tt['table_start']['x']
@@ -501,183 +761,204 @@ class ImageGenerator:
 
                 # DESENHAR NÚMERO DA POSIÇÃO (BOLD, BRANCO)
                 position_number = str(idx + 1)
-                position_x = tt['table_start']['x'] + tt.get('position_offset', {}).get('x', 30)
-                position_y = y_pos + tt.get('position_offset', {}).get('y', 18)
+                position_x = tt['table_start']['x'] + tt.get('position_offset', {}).get('x', scaled(30, scale))
+                position_y = y_pos + tt.get('position_offset', {}).get('y', scaled(18, scale))
 
                 # Medir largura para centralizar
-                bbox_pos = font_bold.getbbox(position_number)
+                bbox_pos = text_bbox(font_bold, position_number)
                 pos_width = bbox_pos[2] - bbox_pos[0]
 
                 # Desenhar texto branco, bold
-                draw.text(
+                draw_text(
+                    draw,
                     (position_x - pos_width // 2, position_y),
                     position_number,
-                    font=font_bold,
-                    fill=tt['color_text']
+                    font_bold,
+                    tt['color_text']
                 )
 
-            # Escudo
-            badge = self._resize_badge(
-                self._get_badge_path(team['name'], badges_folder),
-                (tt['badge_size']['width'], tt['badge_size']['height'])
-            )
+        layout = {
+            'tt': tt,
+            'font_path': font_path,
+            'font_normal': get_font(font_path, tt['font_size']),
+            'font_bold': font_bold,
+            'badges_folder': config['badges_folder'],
+        }
+        return base, layout
+
+    def _draw_table_row(self, base: Image.Image, draw: ImageDraw.ImageDraw, league: str,
+                        layout: Dict, team: Dict, y_pos: float,
+                        composite: bool = False) -> None:
+        """
+        Escudo, nome e estatísticas de um time na linha que começa em y_pos
 
-            # Calcular posição Y centralizada no row_height
-            # (row_height pode ser fracionário — paste exige inteiro)
-            badge_y = y_pos + (tt['row_height'] - tt['badge_size']['height']) / 2 + tt['badge_offset']['y']
+        composite=True compõe o escudo (alpha_composite) em vez de colá-lo com
+        máscara, para desenhar sobre um canvas transparente (sprites)
+        """
+        tt = layout['tt']
+        font_normal = layout['font_normal']
+        font_bold = layout['font_bold']
+
+        # Escudo
+        badge = self._resize_badge(
+            self._get_badge_path(team['name'], layout['badges_folder']),
+            (tt['badge_size']['width'], tt['badge_size']['height'])
+        )
 
-            base.paste(
-                badge,
-                (round(tt['table_start']['x'] + tt['badge_offset']['x']), round(badge_y)),
-                badge
-            )
-            
-            # Nome do time
-            team_name = self._get_display_name(team['name'], league, 'table')
+        # Calcular posição Y centralizada no row_height
+        # (row_height pode ser fracionário — paste exige inteiro)
+        badge_y = y_pos + (tt['row_height'] - tt['badge_size']['height']) / 2 + tt['badge_offset']['y']
+        badge_xy = (round(tt['table_start']['x'] + tt['badge_offset']['x']), round(badge_y))
 
+        if composite:
+            base.alpha_composite(badge, badge_xy)
+        else:
+            base.paste(badge, badge_xy, badge)
+        
+        # Nome do time
+        team_name = self._get_display_name(team['name'], league, 'table')
 
-            # Verificar se time tem penalidade (nota não exibida em Championship/L1/L2 — sem espaço no layout)
-            if league not in ('championship', 'leagueone', 'leaguetwo') and 'penalty_note' in team and team['penalty_note']:
-                team_name += "*"  # Adiciona asterisco
 
-            # Ligas do design unificado (PL/EFL) escrevem o nome como está;
-            # as demais usam caixa alta.
-            if league not in DESIGN_UNIFICADO:
-                team_name = team_name.upper()
+        # Verificar se time tem penalidade (nota não exibida em Championship/L1/L2 — sem espaço no layout)
+        if league not in ('championship', 'leagueone', 'leaguetwo') and 'penalty_note' in team and team['penalty_note']:
+            team_name += "*"  # Adiciona asterisco
 
-            draw.text(
-                (tt['table_start']['x'] + tt['team_name_offset']['x'], y_pos + tt['team_name_offset']['y']),
-                team_name,  # ← Nome completo
-                font=font_normal,
-                fill=tt['color_text']
-            )
+        # Ligas do design unificado (PL/EFL) escrevem o nome como está;
+        # as demais usam caixa alta.
+        if league not in DESIGN_UNIFICADO:
+            team_name = team_name.upper()
 
-            
-            # Estatísticas
-            stats = [
-                str(team['games']),
-                str(team['wins']),
-                str(team['draws']),
-                str(team['losses']),
-                str(team['goal_difference']),
-                str(team['points'])
-            ]
-
-            stat_keys = ['J', 'V', 'E', 'D', 'SG', 'PTS']
-
-            for stat, key in zip(stats, stat_keys):
-                x_pos = tt['stats_columns'][key]
-                
-                # Pontos em negrito
-                current_font = font_bold if key == 'PTS' else font_normal
-                
-                # Centralizar texto na coluna
-                bbox = draw.textbbox((0, 0), stat, font=current_font)
-                stat_width = bbox[2] - bbox[0]
-                
-                draw.text(
-                    (x_pos - stat_width // 2, y_pos + tt['team_name_offset']['y']),
-                    stat,
-                    font=current_font,
-                    fill=tt['color_text']
-                )
+        draw_text(
+            draw,
+            (tt['table_start']['x'] + tt['team_name_offset']['x'], y_pos + tt['team_name_offset']['y']),
+            team_name,  # ← Nome completo
+            font_normal,
+            tt['color_text']
+        )
 
-            penalty_notes = []
-            if league not in ('championship', 'leagueone', 'leaguetwo'):
-                for team in table_data:
-                    if 'penalty_note' in team and team['penalty_note']:
-                        penalty_notes.append(f"* {team['penalty_note']}")
-
-            if penalty_notes:
-                # Posição da primeira nota
-                notes_y = tt['table_start']['y'] + (len(table_data) * tt['row_height']) + 5
-                font_note = ImageFont.truetype(font_path, tt.get('font_note_size', 20))
-
-                for idx, note in enumerate(penalty_notes):
-                    draw.text(
-                        (tt['table_start']['x'] - 50, notes_y + (idx * 25)),  # ← -30 em vez de +20 (mais à esquerda)
-                        note,
-                        font=font_note,
-                        fill=tt['color_text']
-                    )
-            
-        return base
-    
-    def _get_rect_for_position(self, league: str, position: int,
-                           confirmations: Optional[Dict],
-                           table_mode: Optional[Dict]) -> Optional[Image.Image]:
-        """
-        Retorna a imagem do rect apropriado para uma posição
-        """
-        config = self.leagues_config[league]
-        zones = config['promotion_zones']
         
-        # Verificar confirmações se disponíveis
-        if confirmations and position in confirmations:
-            pos_conf = confirmations[position]
-            rect_file = None
-            
-            # PREMIER LEAGUE
-            if league == "premierleague":
-                # Verificar na ordem: champion > ucl > uel > uecl > relegation
-                if pos_conf.get('champion'):
-                    rect_file = zones['champion']['rect_confirmed']
-                elif pos_conf.get('ucl'):
-                    rect_file = zones['ucl']['rect_confirmed']
-                elif pos_conf.get('uel'):
-                    rect_file = zones['uel']['rect_confirmed']
-                elif pos_conf.get('uecl'):
-                    rect_file = zones['uecl']['rect_confirmed']
-                elif pos_conf.get('relegated'):
-                    rect_file = zones['relegation']['rect_confirmed']
+        # Estatísticas
+        stats = [
+            str(team['games']),
+            str(team['wins']),
+            str(team['draws']),
+            str(team['losses']),
+            str(team['goal_difference']),
+            str(team['points'])
+        ]
+
+        stat_keys = ['J', 'V', 'E', 'D', 'SG', 'PTS']
+
+        for stat, key in zip(stats, stat_keys):
+            x_pos = tt['stats_columns'][key]
             
-            # CHAMPIONSHIP, LEAGUE ONE, LEAGUE TWO
-            elif league in ["championship", "leagueone", "leaguetwo"]:
-                # Verificar na ordem: champion > promoted > playoffs > relegation
-                if pos_conf.get('champion'):
-                    rect_file = zones['champion']['rect_confirmed']
-                elif pos_conf.get('promoted'):
-                    rect_file = zones['promoted']['rect_confirmed']
-                elif pos_conf.get('playoffs'):
-                    rect_file = zones['playoffs']['rect_confirmed']
-                elif pos_conf.get('relegated'):
-                    rect_file = zones['relegation']['rect_confirmed']
+            # Pontos em negrito
+            current_font = font_bold if key == 'PTS' else font_normal
             
-            # NATIONAL LEAGUE
-            elif league == "nationalleague":
-                # Verificar na ordem: champion > playoffs_semi > playoffs_quarter > relegation
-                if pos_conf.get('champion'):
-                    rect_file = zones['champion']['rect_confirmed']
-                elif pos_conf.get('playoffs_semi'):  # Semi-finals (2º e 3º)
-                    rect_file = zones['playoffs_semi']['rect_confirmed']
-                elif pos_conf.get('playoffs_quarter'):  # Quarter-finals (4º-7º)
-                    rect_file = zones['playoffs_quarter']['rect_confirmed']
-                elif pos_conf.get('relegated'):
-                    rect_file = zones['relegation']['rect_confirmed']
+            # Centralizar texto na coluna
+            bbox = text_bbox(current_font, stat)
+            stat_width = bbox[2] - bbox[0]
             
-            # Se encontrou um rect confirmado, carregar e retornar
-            if rect_file:
-                rect_path = os.path.join("tabela", rect_file)
-                if os.path.exists(rect_path):
-                    return self._load_image(rect_path)
-        
-        # Lógica padrão: sem confirmação ou confirmação não encontrada
-        return self._get_default_rect_for_position(league, position, zones)
-
-    def _get_default_rect_for_position(self, league: str, position: int, zones: dict):
-        """Retorna rect padrão baseado na posição"""
-        # Primeiro tenta encontrar em alguma zona específica
-        for zone_name, zone_config in zones.items():
-            if position in zone_config['positions']:
-                rect_file = zone_config['rect']
-                rect_path = os.path.join("tabela", rect_file)
-                if os.path.exists(rect_path):
-                    return self._load_image(rect_path)
-        
-        # Se não estiver em nenhuma zona, usar rect neutro
-        neutral_rect = f"{league}-rect.png"
-        rect_path = os.path.join("tabela", neutral_rect)
-        if os.path.exists(rect_path):
-            return self._load_image(rect_path)
-        
-        return None
\ No newline at end of file
+            draw_text(
+                draw,
+                (x_pos - stat_width // 2, y_pos + tt['team_name_offset']['y']),
+                stat,
+                current_font,
+                tt['color_text']
+            )
+
+    def _draw_penalty_notes(self, draw: ImageDraw.ImageDraw, league: str, layout: Dict,
+                            table_data: List[Dict], scale: float) -> None:
+        """Notas de punição ("* ...") abaixo da última linha"""
+        tt = layout['tt']
+        penalty_notes = []
+        if league not in ('championship', 'leagueone', 'leaguetwo'):
+            for team in table_data:
+                if 'penalty_note' in team and team['penalty_note']:
+                    penalty_notes.append(f"* {team['penalty_note']}")
+
+        if penalty_notes:
+            # Posição da primeira nota
+            notes_y = tt['table_start']['y'] + (len(table_data) * tt['row_height']) + scaled(5, scale)
+            font_note = get_font(layout['font_path'], tt.get('font_note_size', scaled_font_size(20, scale)))
+
+            for idx, note in enumerate(penalty_notes):
+                draw_text(
+                    draw,
+                    (tt['table_start']['x'] - scaled(50, scale), notes_y + idx * scaled(25, scale)),  # ← -30 em vez de +20 (mais à esquerda)
+                    note,
+                    font_note,
+                    tt['color_text']
+                )
+    
+    def _load_rect(self, rect_file: str, scale: float = 1.0) -> Optional[Image.Image]:
+        """Rect decodificado (e escalado) de tabela/, ou None se não existir"""
+        rect_path = os.path.join("tabela", rect_file)
+        if not os.path.exists(rect_path):
+            return None
+        return load_scaled(rect_path, scale)
+
+    def _compile_zone_rects(self, league: str, num_rows: int,
+                            confirmations: Optional[Dict],
+                            table_mode: Optional[str],
+                            scale: float = 1.0) -> List[Optional[Image.Image]]:
+        """
+        Rect de cada posição da tabela (índice = posição - 1)
+
+        Compilado uma vez por (liga, modo, confirmações, nº de linhas, escala); as
+        imagens são compartilhadas, então cada rect distinto é decodificado
+        uma única vez.
+        """
+        frozen_confirmations = tuple(sorted(
+            (position, tuple(sorted(k for k, v in conf.items() if v)))
+            for position, conf in (confirmations or {}).items()
+        ))
+        key = (league, num_rows, table_mode if league == 'premierleague' else None,
+               frozen_confirmations, scale)
+        with self._zone_rects_lock:
+            cached = self._zone_rects.get(key)
+            if cached is not None:
+                self._zone_rects.move_to_end(key)
+                return cached
+
+        zones = self.leagues_config[league]['promotion_zones']
+        if league == 'premierleague' and table_mode:
+            zones = self._adjust_european_zones_for_mode(zones, table_mode)
+
+        # Posição -> arquivo do rect padrão (primeira zona que contém a posição)
+        default_files = {}
+        for zone_config in zones.values():
+            if not os.path.exists(os.path.join("tabela", zone_config['rect'])):
+                continue
+            for position in zone_config['positions']:
+                default_files.setdefault(position, zone_config['rect'])
+        neutral_file = f"{league}-rect.png"
+
+        rects = []
+        for position in range(1, num_rows + 1):
+            rect = None
+            confirmed_file = self._confirmed_rect_file(
+                league, zones, (confirmations or {}).get(position)
+            )
+            if confirmed_file:
+                rect = self._load_rect(confirmed_file, scale)
+            if rect is None:
+                rect = self._load_rect(default_files.get(position, neutral_file), scale)
+            rects.append(rect)
+
+        with self._zone_rects_lock:
+            self._zone_rects[key] = rects
+            while len(self._zone_rects) > _ZONE_RECTS_CACHE_SIZE:
+                self._zone_rects.popitem(last=False)
+        return rects
+
+    @staticmethod
+    def _confirmed_rect_file(league: str, zones: dict,
+                             pos_conf: Optional[Dict]) -> Optional[str]:
+        """Rect confirmado da posição, seguindo a prioridade da liga (ex.: champion > ucl > ...)"""
+        if not pos_conf:
+            return None
+        for flag, zone_name in _CONFIRMATION_PRIORITY.get(league, ()):
+            if pos_conf.get(flag):
+                return zones[zone_name]['rect_confirmed']
+        return None
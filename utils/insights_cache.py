@@ -9,7 +9,7 @@ import os
 from datetime import datetime
 from typing import Optional
 
-import pandas as pd
+from utils.perf import instrument, timed
 
 CACHE_PATH = "data/insights_cache.json"
 HISTORICO_PATH = "data/historico.csv"
@@ -19,15 +19,18 @@ def _load_raw() -> dict:
     if not os.path.exists(CACHE_PATH):
         return {}
     try:
-        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+        with timed("json insights_cache", bytes_in=os.path.getsize(CACHE_PATH)), \
+                open(CACHE_PATH, "r", encoding="utf-8") as f:
             return json.load(f)
     except (json.JSONDecodeError, OSError):
         return {}
 
 
 def _save_raw(raw: dict) -> None:
-    with open(CACHE_PATH, "w", encoding="utf-8") as f:
-        json.dump(raw, f, ensure_ascii=False, indent=2)
+    payload = json.dumps(raw, ensure_ascii=False, indent=2)
+    with timed("json insights_cache", bytes_out=len(payload.encode("utf-8"))), \
+            open(CACHE_PATH, "w", encoding="utf-8") as f:
+        f.write(payload)
 
 
 def historico_last_date(liga_str: str) -> Optional[str]:
@@ -35,7 +38,9 @@ def historico_last_date(liga_str: str) -> Optional[str]:
     if not os.path.exists(HISTORICO_PATH):
         return None
     try:
-        df = pd.read_csv(HISTORICO_PATH, parse_dates=["data"])
+        import pandas as pd
+        with timed("csv historico.csv", bytes_in=os.path.getsize(HISTORICO_PATH)):
+            df = pd.read_csv(HISTORICO_PATH, parse_dates=["data"])
         df = df[df["liga"] == liga_str]
         if df.empty:
             return None
@@ -83,6 +88,8 @@ def _serialize_data(data: dict) -> dict:
 
 def _deserialize_data(data: dict) -> dict:
     """Restores DataFrame fields from list-of-records after JSON deserialisation."""
+    import pandas as pd
+
     out = {}
     for k, v in data.items():
         if k in _DATAFRAME_FIELDS and isinstance(v, list):
@@ -112,6 +119,7 @@ def load_cached_stats(liga_str: str) -> Optional[dict]:
     return _deserialize_data(raw_data) if raw_data else None
 
 
+@instrument()
 def rebuild_for_liga(liga_str: str) -> dict:
     """Computes stats via stats_engine, saves to cache, returns the data dict."""
     from utils.stats_engine import compute_league_stats
@@ -0,0 +1,80 @@
+"""
+Variantes de formato (feed, story, paisagem) de uma arte já desenhada
+
+Os perfis ficam em "layout_profiles" no leagues_config.json: tamanho do
+canvas e, para os que não têm a proporção da arte, o desfoque e o
+escurecimento do fundo. A arte é montada uma única vez (escudos, textos e
+rects desenhados uma vez só) e cada perfil é uma composição dela: a arte
+inteira, escalada para caber no canvas, sobre uma versão ampliada e
+desfocada dela mesma preenchendo as sobras.
+"""
+from PIL import Image, ImageFilter
+from typing import Dict, Iterable, Optional
+import json
+
+# Proporção da arte-base (1080×1350): o perfil com esse tamanho é a própria arte
+DEFAULT_PROFILE = "feed"
+
+# O desfoque do fundo é feito nesta fração do tamanho do canvas (bem mais
+# rápido e, depois de ampliado, visualmente igual)
+_BLUR_WORK_SCALE = 0.25
+
+
+def load_layout_profiles(config_path: str = "config/leagues_config.json") -> Dict[str, dict]:
+    """Perfis de layout definidos no leagues_config.json"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("layout_profiles", {})
+
+
+def _blurred_fill(art: Image.Image, size, blur_radius: float, darken: float) -> Image.Image:
+    """A arte escalada para cobrir size, desfocada e escurecida"""
+    width, height = size
+    work = (max(1, round(width * _BLUR_WORK_SCALE)), max(1, round(height * _BLUR_WORK_SCALE)))
+    cover = max(work[0] / art.width, work[1] / art.height)
+    small = art.convert("RGB").resize(
+        (max(1, round(art.width * cover)), max(1, round(art.height * cover))),
+        Image.BILINEAR, reducing_gap=2.0,
+    )
+    left = (small.width - work[0]) // 2
+    top = (small.height - work[1]) // 2
+    small = small.crop((left, top, left + work[0], top + work[1]))
+    small = small.filter(ImageFilter.GaussianBlur(blur_radius * _BLUR_WORK_SCALE))
+    if darken:
+        small = Image.blend(small, Image.new("RGB", small.size, (0, 0, 0)), darken)
+    return small.resize(size, Image.BICUBIC)
+
+
+def compose_profile(art: Image.Image, profile: dict) -> Image.Image:
+    """
+    A arte no canvas do perfil: escalada para caber inteira (LANCZOS) e
+    centralizada sobre o fundo desfocado
+    """
+    size = (profile["width"], profile["height"])
+    if art.size == size:
+        return art
+
+    fit = min(size[0] / art.width, size[1] / art.height)
+    fitted = art.resize(
+        (round(art.width * fit), round(art.height * fit)), Image.LANCZOS
+    ) if fit != 1 else art
+
+    canvas = _blurred_fill(art, size, profile.get("blur_radius", 30), profile.get("darken", 0.35))
+    position = ((size[0] - fitted.width) // 2, (size[1] - fitted.height) // 2)
+    if fitted.mode == "RGBA":
+        canvas.paste(fitted, position, fitted)
+    else:
+        canvas.paste(fitted, position)
+    return canvas
+
+
+def compose_profiles(art: Image.Image, profiles: Dict[str, dict],
+                     names: Optional[Iterable[str]] = None) -> Dict[str, Image.Image]:
+    """
+    Uma composição por perfil pedido (todos, se names for None), a partir da
+    mesma arte
+
+    Raises:
+        KeyError: perfil inexistente em profiles
+    """
+    names = list(profiles) if names is None else list(names)
+    return {name: compose_profile(art, profiles[name]) for name in names}
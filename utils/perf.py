@@ -0,0 +1,167 @@
+"""
+Lightweight timing instrumentation for the app's hot paths.
+
+Wrap work in `timed("name")` (or decorate it with `@instrument("name")`) to
+record wall time and bytes read/written. Spans are grouped under the
+user-facing `action(...)` that is active in the current context (e.g. one
+button click). Work handed to a thread pool keeps its action when it is
+submitted through `contextvars.copy_context().run`; spans from other threads,
+such as the GitHub sync worker, are recorded without an action.
+
+Actions are kept per session (`set_session`, once per script run), so a
+session only sees its own; raw spans carry the session too. Both live in
+bounded ring buffers, so instrumentation is always on and never grows
+without limit.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+MAX_ACTIONS = 20
+MAX_SPANS = 500
+# Sessions whose actions are kept (least recently active dropped first)
+MAX_SESSIONS = 32
+
+_lock = threading.Lock()
+_actions: "OrderedDict[Optional[str], deque]" = OrderedDict()
+_spans: deque = deque(maxlen=MAX_SPANS)
+_current_action: ContextVar[Optional[dict]] = ContextVar("perf_action", default=None)
+_current_session: ContextVar[Optional[str]] = ContextVar("perf_session", default=None)
+
+
+class Span:
+    """Handle yielded by timed(); callers add byte counts as they learn them."""
+
+    __slots__ = ("name", "bytes_in", "bytes_out")
+
+    def __init__(self, name: str, bytes_in: int = 0, bytes_out: int = 0):
+        self.name = name
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+
+
+def set_session(session: Optional[str]) -> None:
+    """Tags the actions and spans recorded from now on in this context."""
+    _current_session.set(session)
+
+
+@contextmanager
+def action(name: str) -> Iterator[dict]:
+    """Groups every span recorded inside the block under one named action."""
+    record = {
+        "name": name,
+        "session": _current_session.get(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "duration": 0.0,
+        "steps": {},
+    }
+    token = _current_action.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["duration"] = time.perf_counter() - start
+        _current_action.reset(token)
+        with _lock:
+            session = record["session"]
+            if session not in _actions:
+                _actions[session] = deque(maxlen=MAX_ACTIONS)
+            _actions.move_to_end(session)
+            _actions[session].append(record)
+            while len(_actions) > MAX_SESSIONS:
+                _actions.popitem(last=False)
+
+
+@contextmanager
+def timed(name: str, bytes_in: int = 0, bytes_out: int = 0) -> Iterator[Span]:
+    """Records the wall time (and optional byte counts) of the block."""
+    span = Span(name, bytes_in, bytes_out)
+    start = time.perf_counter()
+    try:
+        yield span
+    finally:
+        _record(span, time.perf_counter() - start)
+
+
+def instrument(name: Optional[str] = None) -> Callable:
+    """Decorator form of timed(); defaults to module.qualname."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or f"{fn.__module__.split('.')[-1]}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _record(span: Span, elapsed: float) -> None:
+    current = _current_action.get()
+    with _lock:
+        _spans.append({
+            "name": span.name,
+            "action": current["name"] if current else None,
+            "session": current["session"] if current else _current_session.get(),
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": elapsed,
+            "bytes_in": span.bytes_in,
+            "bytes_out": span.bytes_out,
+        })
+        if current is not None:
+            step = current["steps"].setdefault(
+                span.name,
+                {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes_in": 0, "bytes_out": 0},
+            )
+            step["calls"] += 1
+            step["seconds"] += elapsed
+            step["max_seconds"] = max(step["max_seconds"], elapsed)
+            step["bytes_in"] += span.bytes_in
+            step["bytes_out"] += span.bytes_out
+
+
+def recent_actions(n: int = MAX_ACTIONS, session: Optional[str] = None) -> list[dict]:
+    """Last n actions of the session (default: the current one), newest first."""
+    if session is None:
+        session = _current_session.get()
+    with _lock:
+        actions = list(_actions.get(session, ()))[-n:]
+        return [dict(a, steps=dict(a["steps"])) for a in actions][::-1]
+
+
+def recent_spans(n: int = MAX_SPANS, background_only: bool = False,
+                 session: Optional[str] = None) -> list[dict]:
+    """
+    Last n spans, newest first: those of the session (default: the current
+    one), or only those outside any action and session with background_only.
+    """
+    if session is None:
+        session = _current_session.get()
+    with _lock:
+        if background_only:
+            spans = [s for s in _spans if s["action"] is None and s["session"] is None]
+        else:
+            spans = [s for s in _spans if s["session"] == session]
+    return [dict(s) for s in spans[-n:]][::-1]
+
+
+def export_json(session: Optional[str] = None) -> str:
+    """The session's actions and spans (default: the current one), as JSON."""
+    return json.dumps(
+        {"actions": recent_actions(session=session), "spans": recent_spans(session=session)},
+        ensure_ascii=False, indent=2,
+    )
+
+
+def reset() -> None:
+    with _lock:
+        _actions.clear()
+        _spans.clear()
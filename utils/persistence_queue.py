@@ -0,0 +1,213 @@
+"""
+Write-behind persistence of local data files to GitHub.
+
+Callers write files locally as before and then enqueue their paths with a
+commit message. A daemon worker batches everything enqueued within a short
+window and pushes it as a single commit (one GitHubHandler.update_files
+call), reading the current file contents at flush time. Failed pushes are
+retried with exponential backoff.
+
+Pending paths and messages are kept in an on-disk journal, so changes
+enqueued before an app restart are pushed when the queue is recreated.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+JOURNAL_PATH = ".cache/persistence_journal.json"
+
+# Seconds to wait after an enqueue so that related changes share a commit
+DEFAULT_BATCH_DELAY = 2.0
+_RETRY_BASE = 5.0
+_RETRY_MAX = 300.0
+
+
+def coalesce_messages(messages: list[str]) -> str:
+    """Builds one commit message out of the messages of a batch."""
+    unique = list(dict.fromkeys(m for m in messages if m))
+    if not unique:
+        return "Atualização de dados"
+    if len(unique) == 1:
+        return unique[0]
+    body = "\n".join(f"- {m}" for m in unique)
+    return f"{unique[0]} (+{len(unique) - 1} atualizações)\n\n{body}"
+
+
+class PersistenceQueue:
+    """
+    Batches local file changes and pushes them to GitHub in the background.
+
+    `handler_factory` returns an object with GitHubHandler's
+    update_files(files, message, branch) -> bool signature.
+    """
+
+    def __init__(
+        self,
+        handler_factory: Callable[[], object],
+        journal_path: str = JOURNAL_PATH,
+        batch_delay: float = DEFAULT_BATCH_DELAY,
+        branch: str = "main",
+    ):
+        self._handler_factory = handler_factory
+        self._journal_path = journal_path
+        self._batch_delay = batch_delay
+        self._branch = branch
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+
+        # path -> generation of its latest enqueue; a path is only cleared by
+        # a flush that pushed that same generation
+        self._paths: dict[str, int] = {}
+        self._messages: list[str] = []
+        self._generation = 0
+        self._attempts = 0
+        self._next_attempt = 0.0
+        self._last_error: Optional[str] = None
+        self._last_success: Optional[str] = None
+
+        self._load_journal()
+        self._worker = threading.Thread(
+            target=self._run, name="persistence-queue", daemon=True
+        )
+        self._worker.start()
+        if self._paths:
+            self._idle.clear()
+            self._wakeup.set()
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def enqueue(self, paths: Iterable[str], message: str) -> None:
+        """Schedules local files to be pushed with the given commit message."""
+        with self._lock:
+            self._generation += 1
+            for path in paths:
+                self._paths[path] = self._generation
+            if message:
+                self._messages.append(message)
+            # A new change should not wait for a previous failure's backoff
+            self._next_attempt = 0.0
+            self._idle.clear()
+            self._save_journal()
+        self._wakeup.set()
+
+    def is_pending(self, path: str) -> bool:
+        """True while a local change to path has not been pushed yet."""
+        with self._lock:
+            return path in self._paths
+
+    def status(self) -> dict:
+        """Snapshot of the queue for display."""
+        with self._lock:
+            return {
+                "pending": sorted(self._paths),
+                "messages": list(self._messages),
+                "attempts": self._attempts,
+                "last_error": self._last_error,
+                "last_success": self._last_success,
+                "next_attempt": self._next_attempt or None,
+            }
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every enqueued change is pushed (or timeout)."""
+        return self._idle.wait(timeout)
+
+    # ── Journal ───────────────────────────────────────────────────────────────
+
+    def _load_journal(self) -> None:
+        if not os.path.exists(self._journal_path):
+            return
+        try:
+            with open(self._journal_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for path in data.get("paths", []):
+            self._generation += 1
+            self._paths[path] = self._generation
+        self._messages = list(data.get("messages", []))
+
+    def _save_journal(self) -> None:
+        """Writes pending state atomically. Must be called with the lock held."""
+        data = {"paths": sorted(self._paths), "messages": self._messages}
+        try:
+            directory = os.path.dirname(self._journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self._journal_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self._journal_path)
+        except OSError as e:
+            print(f"Could not write persistence journal: {e}")
+
+    # ── Worker ────────────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            # Debounce: let related enqueues land in the same batch
+            time.sleep(self._batch_delay)
+            with self._lock:
+                self._wakeup.clear()
+                delay = self._next_attempt - time.time()
+            if delay > 0:
+                # Backing off; an enqueue resets the delay and wakes us up
+                if self._wakeup.wait(delay):
+                    continue
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            if not self._paths:
+                self._idle.set()
+                return
+            batch = dict(self._paths)
+            messages = list(self._messages)
+
+        files = []
+        for path in sorted(batch):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    files.append({"path": path, "content": f.read()})
+            except OSError:
+                continue  # removed locally; nothing to push
+
+        error = None
+        if files:
+            try:
+                ok = self._handler_factory().update_files(
+                    files=files, message=coalesce_messages(messages), branch=self._branch
+                )
+                if not ok:
+                    error = "Falha ao enviar arquivos para o GitHub."
+            except Exception as e:
+                error = str(e)
+
+        with self._lock:
+            if error is None:
+                for path, generation in batch.items():
+                    if self._paths.get(path) == generation:
+                        del self._paths[path]
+                self._messages = self._messages[len(messages):]
+                self._attempts = 0
+                self._next_attempt = 0.0
+                self._last_error = None
+                self._last_success = datetime.now().isoformat(timespec="seconds")
+            else:
+                self._attempts += 1
+                wait = min(_RETRY_BASE * 2 ** (self._attempts - 1), _RETRY_MAX)
+                self._next_attempt = time.time() + wait
+                self._last_error = error
+            self._save_journal()
+            if self._paths:
+                self._wakeup.set()
+            else:
+                self._idle.set()
@@ -11,7 +11,8 @@ import os
 from datetime import datetime, timedelta
 from typing import Optional
 
-from utils.bbi_functions import _season_label
+from utils.season import _season_label
+from utils.perf import instrument
 
 POSICOES_CSV = "data/posicoes.csv"
 POSICOES_FIELDNAMES = ["time", "liga", "matchday", "posicao", "data_fim_matchday"]
@@ -100,6 +101,7 @@ def _anchor_date(data_fim: str) -> str:
     return d.strftime("%Y-%m-%d")
 
 
+@instrument()
 def detect_matchdays(liga_str: str) -> dict[int, list[str]]:
     """
     Reads data/historico.csv, filters by liga_str, and groups game dates into
@@ -176,6 +178,7 @@ def _all_teams_in_liga(liga_str: str) -> set[str]:
     return teams
 
 
+@instrument()
 def compute_table_at_matchday(
     liga_str: str,
     up_to_matchday: int,
@@ -268,6 +271,7 @@ def _has_games_on_date(liga_str: str, date_str: str) -> bool:
     return False
 
 
+@instrument()
 def append_matchday_positions(
     liga_str: str,
     positions: dict[str, int],
@@ -417,3 +421,37 @@ def compute_position_delta(team: str, liga_str: str) -> Optional[int]:
     pos_last = records[0][1]
     pos_prev = records[1][1]
     return pos_prev - pos_last
+
+
+def previous_positions(liga_str: str, current_order: list[str]) -> dict[str, int]:
+    """
+    Positions each team held before the current table, from data/posicoes.csv.
+
+    Only matchdays that list every team in current_order are used (a partial
+    record would leave teams without a starting row). Uses the last such
+    matchday, or the one before it when the last one already matches
+    current_order (the round has been closed and its positions recorded).
+    Returns {} when there is no usable history.
+    """
+    if not os.path.exists(POSICOES_CSV):
+        return {}
+
+    by_matchday: dict[int, dict[str, int]] = {}
+    with open(POSICOES_CSV, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if row.get("liga") != liga_str:
+                continue
+            try:
+                by_matchday.setdefault(int(row["matchday"]), {})[row["time"]] = int(row["posicao"])
+            except (ValueError, KeyError):
+                continue
+
+    current = {team: pos for pos, team in enumerate(current_order, start=1)}
+    complete = [md for md in sorted(by_matchday, reverse=True)
+                if all(team in by_matchday[md] for team in current)]
+    for md in complete[:2]:
+        positions = by_matchday[md]
+        if any(positions.get(team) != pos for team, pos in current.items()):
+            return positions
+    return {}
@@ -0,0 +1,111 @@
+"""
+Opt-in profiling of Streamlit actions.
+
+Enabled by the BBI_PROFILE environment variable. The ?profile=1 query
+parameter is honoured only where BBI_PROFILE_ALLOW is set (environment
+variable or Streamlit secret), so a slow action can be captured in
+production without a redeploy but a visitor cannot turn it on. Uses pyinstrument (sampling, HTML output) when installed and falls
+back to cProfile (.prof, open with snakeviz or pstats) otherwise. Only the
+newest MAX_PROFILES files are kept.
+"""
+from __future__ import annotations
+
+import cProfile
+import os
+import re
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+try:
+    from pyinstrument import Profiler as _SamplingProfiler
+except ImportError:  # optional dependency
+    _SamplingProfiler = None
+
+PROFILES_DIR = "profiles"
+MAX_PROFILES = 20
+
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+def _truthy(value: Optional[object]) -> bool:
+    return str(value or "").strip().lower() in _TRUTHY
+
+
+def profiling_enabled(query_value: Optional[str] = None,
+                      allow_query: Optional[object] = None) -> bool:
+    """
+    True if BBI_PROFILE is set, or if the query parameter asks for it and
+    query profiling is allowed (allow_query, e.g. a secret, or the
+    BBI_PROFILE_ALLOW environment variable).
+    """
+    if _truthy(os.environ.get("BBI_PROFILE")):
+        return True
+    if not (_truthy(allow_query) or _truthy(os.environ.get("BBI_PROFILE_ALLOW"))):
+        return False
+    return _truthy(query_value)
+
+
+def _slug(name: str) -> str:
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    text = re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower()
+    return text or "acao"
+
+
+def _prune(directory: str, keep: int) -> None:
+    """Deletes the oldest profiles beyond the retention limit."""
+    try:
+        files = [
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.endswith((".html", ".prof"))
+        ]
+    except OSError:
+        return
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+@contextmanager
+def profile(name: str, enabled: bool, directory: str = PROFILES_DIR,
+            keep: int = MAX_PROFILES) -> Iterator[dict]:
+    """
+    Profiles the block when enabled and saves the result under directory.
+
+    Yields a dict whose "path" is filled in once the block exits (None when
+    profiling is disabled). The profile is written even if the block raises,
+    e.g. on st.stop().
+    """
+    result: dict = {"path": None}
+    if not enabled:
+        yield result
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{_slug(name)}")
+
+    if _SamplingProfiler is not None:
+        profiler = _SamplingProfiler()
+        profiler.start()
+        try:
+            yield result
+        finally:
+            profiler.stop()
+            result["path"] = f"{base}.html"
+            with open(result["path"], "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+            _prune(directory, keep)
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            result["path"] = f"{base}.prof"
+            profiler.dump_stats(result["path"])
+            _prune(directory, keep)
@@ -0,0 +1,161 @@
+"""
+Content-addressed on-disk cache of finished images.
+
+A render is identified by a SHA-256 of its kind, RENDER_CACHE_VERSION, a
+fingerprint of the asset folders (templates, badges, fonts, config) and the
+canonical JSON of its inputs; raw bytes inputs such as uploaded backgrounds
+are hashed first. The encoded output (PNG, JPEG, ZIP) is stored under
+.cache/renders/<key> and reused by every session, so reruns and repeated
+clicks return immediately. Writes are atomic (temp file + rename) and the
+folder is trimmed least-recently-used first once it exceeds max_bytes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Iterable, Optional
+
+from utils.perf import timed
+
+RENDER_CACHE_DIR = ".cache/renders"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Bump whenever a generator change alters the output for the same inputs
+RENDER_CACHE_VERSION = 3
+
+# Folders the generators read; any added, removed or edited file changes the key
+ASSET_DIRS = (
+    "config", "templates", "resultados", "tabela", "noticias", "fontes", "selecoes",
+    "escudos-pl", "escudos-ch", "escudos-l1", "escudos-l2", "escudos-nl",
+    "escudos-nonleague", "escudos-ucl", "escudos-uel", "escudos-uecl",
+)
+
+
+def _canonical(value):
+    """json.dumps default: bytes become their hash, sets become sorted lists."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"cannot hash render input of type {type(value).__name__}")
+
+
+def assets_fingerprint(dirs: Iterable[str] = ASSET_DIRS) -> str:
+    """Hash of (path, size, mtime) of every file in the asset folders."""
+    h = hashlib.sha256()
+    for d in dirs:
+        try:
+            entries = sorted(os.scandir(d), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_file():
+                st = entry.stat()
+                h.update(f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def render_key(kind: str, inputs: dict, assets: Optional[str] = None) -> str:
+    """Cache key for a render of kind from inputs (JSON-serialisable or bytes)."""
+    payload = json.dumps(
+        {
+            "kind": kind,
+            "version": RENDER_CACHE_VERSION,
+            "assets": assets if assets is not None else assets_fingerprint(),
+            "inputs": inputs,
+        },
+        sort_keys=True, ensure_ascii=False, default=_canonical,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Encoded renders on disk, keyed by render_key, with an LRU size cap."""
+
+    def __init__(self, directory: str = RENDER_CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Path of the cached entry (marked as recently used), or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        self._write(key, lambda f: f.write(data))
+
+    def get_or_render(self, kind: str, inputs: dict, render: Callable[[], bytes]) -> bytes:
+        """Cached bytes for (kind, inputs); calls render() and stores it on a miss."""
+        key = render_key(kind, inputs)
+        data = self.get(key)
+        if data is not None:
+            with timed(f"render_cache hit {kind}", bytes_out=len(data)):
+                return data
+        data = render()
+        self.put(key, data)
+        return data
+
+    def _write(self, key: str, write: Callable) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    write(f)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        except OSError as e:
+            # A failed cache write must never fail the render itself
+            print(f"render cache: could not store {key[:12]}: {e}")
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Deletes least-recently-used entries until the folder fits max_bytes."""
+        with self._lock:
+            try:
+                entries = [
+                    e for e in os.scandir(self.directory)
+                    if e.is_file() and not e.name.startswith(".tmp-")
+                ]
+            except OSError:
+                return
+            stats = [(e.path, e.stat()) for e in entries]
+            total = sum(st.st_size for _, st in stats)
+            if total <= self.max_bytes:
+                return
+            stats.sort(key=lambda item: item[1].st_mtime)
+            for path, st in stats:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= st.st_size
+                except OSError:
+                    pass
@@ -0,0 +1,154 @@
+"""
+Matchday processing shared by the Streamlit app and the command-line tools.
+
+Parses pasted results (with optional "-N" day-offset prefixes), applies the
+ones not yet recorded in historico.csv to a league table, and builds the
+table_data list consumed by ImageGenerator.generate_table_image. Nothing
+here depends on Streamlit.
+"""
+from __future__ import annotations
+
+import csv
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from utils.season import _season_label
+from utils.perf import instrument
+from utils.results_parser import ResultsParser
+from utils.table_processor import TableProcessor
+
+HISTORICO_PATH = "data/historico.csv"
+TABELAS_DIR = "data/tabelas"
+
+LIGA_DISPLAY_NAMES = {
+    "premierleague": "Premier League",
+    "championship":  "Championship",
+    "leagueone":     "League One",
+    "leaguetwo":     "League Two",
+    "nationalleague":"National League",
+}
+
+# Notes shown under the table for teams with point deductions.
+# Keys are team names; a (liga_key, team) key restricts the note to one league.
+PENALTY_NOTES = {
+    "Sheffield Wednesday": "Sheffield Wednesday perdeu 18 pontos por adm. judicial e atraso de salários.",
+    "Leicester City": "Leicester City perdeu 6 pontos por violação das regras de lucratividade e sustentabilidade.",
+    "West Bromwich": "West Bromwich perdeu 2 pontos por violação das regras de lucratividade e sustentabilidade.",
+    ("championship", "Southampton"): "Southampton perdeu 4 pontos por Spygate.",
+}
+
+_DATE_PREFIX_RE = re.compile(r'^(-\d+)\s+')
+
+
+def parse_results_text(text: str, data_rodada: date,
+                       parser: Optional[ResultsParser] = None) -> list[dict]:
+    """
+    Parses one result per line. A line may start with "-N" to date that game
+    N days before data_rodada; every parsed result gets a 'data' (YYYY-MM-DD).
+    """
+    parser = parser or ResultsParser()
+    resultados = []
+    for line in text.strip().split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        m = _DATE_PREFIX_RE.match(line)
+        if m:
+            resolved_date = data_rodada + timedelta(days=int(m.group(1)))
+            line = line[m.end():]
+        else:
+            resolved_date = data_rodada
+        result = parser.parse_single_result(line)
+        if result:
+            result['data'] = resolved_date.strftime('%Y-%m-%d')
+            resultados.append(result)
+    return resultados
+
+
+@instrument()
+def is_already_in_historico(home_team: str, away_team: str, liga_str: str,
+                            match_date: str = None) -> bool:
+    """Returns True if (home_team, away_team, liga_str, temporada) exists in
+    data/historico.csv, where temporada is derived from match_date.
+
+    Fixture pairings repeat from one season to the next, so the check must be
+    scoped to the current season (the 'temporada' column) — otherwise a
+    new-season result gets treated as a duplicate of the same fixture played
+    the previous year.
+    """
+    path = HISTORICO_PATH
+    if not os.path.exists(path):
+        return False
+
+    ref = datetime.strptime(match_date, '%Y-%m-%d') if match_date else datetime.now()
+    temporada_atual = _season_label(ref)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if (row.get('casa') == home_team and
+                    row.get('fora') == away_team and
+                    row.get('liga') == liga_str and
+                    row.get('temporada') == temporada_atual):
+                return True
+    return False
+
+
+def load_table(liga_key: str, table_text: Optional[str] = None) -> TableProcessor:
+    """TableProcessor loaded from table_text, or from data/tabelas/{liga_key}.txt."""
+    if table_text is None:
+        with open(os.path.join(TABELAS_DIR, f"{liga_key}.txt"), 'r', encoding='utf-8') as f:
+            table_text = f.read()
+    processor = TableProcessor()
+    processor.load_from_text(table_text)
+    return processor
+
+
+def apply_new_results(processor: TableProcessor, liga_key: str, resultados: list) -> list:
+    """
+    Applies the results not yet in historico to processor and sorts it.
+    Returns the results that were applied.
+    """
+    liga_str = LIGA_DISPLAY_NAMES.get(liga_key, '')
+    novos = [r for r in resultados
+             if not is_already_in_historico(r['home_team'], r['away_team'], liga_str,
+                                            r.get('data'))]
+    processor.update_with_multiple_results(novos)
+    processor.sort_table()
+    return novos
+
+
+def penalty_note(liga_key: str, team_name: str) -> Optional[str]:
+    return PENALTY_NOTES.get((liga_key, team_name)) or PENALTY_NOTES.get(team_name)
+
+
+def build_table_data(processor: TableProcessor, liga_key: str) -> list[dict]:
+    """Team dicts in the format expected by ImageGenerator.generate_table_image."""
+    table_data = []
+    for team in processor.teams:
+        team_dict = {
+            'name': team.name,
+            'position': team.position,
+            'games': team.games,
+            'wins': team.wins,
+            'draws': team.draws,
+            'losses': team.losses,
+            'goals_for': team.goals_for,
+            'goals_against': team.goals_against,
+            'goal_difference': team.goal_difference,
+            'points': team.points,
+        }
+        note = penalty_note(liga_key, team.name)
+        if note:
+            team_dict['penalty_note'] = note
+        table_data.append(team_dict)
+    return table_data
+
+
+def suggested_round(processor: TableProcessor) -> int:
+    """Next round number: most games played by any team, plus one."""
+    if not processor.teams:
+        return 1
+    return max(team.games for team in processor.teams) + 1
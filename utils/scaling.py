@@ -0,0 +1,103 @@
+"""
+Renderização em escala reduzida (prévias) e cache de recursos já escalados
+
+Os geradores aceitam um fator de escala: com scale=1.0 a arte sai idêntica
+à de sempre; com PREVIEW_SCALE, coordenadas, tamanhos de fonte e recursos
+(templates, rects, escudos) são reduzidos na mesma proporção, o que deixa a
+prévia várias vezes mais rápida. Templates, rects e escudos ficam em
+memória já decodificados e escalados, então também a arte final deixa de
+decodificar os mesmos PNGs a cada clique.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple, Union
+
+from PIL import Image
+
+# Fator usado nas prévias da interface
+PREVIEW_SCALE = 0.4
+
+# Quantos recursos escalados manter em memória (templates, rects, escudos)
+_ASSET_CACHE_SIZE = 256
+
+_asset_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+_asset_lock = threading.Lock()
+
+Number = Union[int, float]
+
+
+def scaled(value: Number, scale: float) -> Number:
+    """Escala uma medida: inteiros continuam inteiros, decimais continuam decimais"""
+    if scale == 1:
+        return value
+    if isinstance(value, int):
+        return round(value * scale)
+    return value * scale
+
+
+def scaled_font_size(size: int, scale: float) -> int:
+    return max(1, round(size * scale))
+
+
+def scale_geometry(config, scale: float):
+    """Cópia de um bloco de configuração com todos os números escalados"""
+    if scale == 1:
+        return config
+    if isinstance(config, dict):
+        return {k: scale_geometry(v, scale) for k, v in config.items()}
+    if isinstance(config, (list, tuple)):
+        return type(config)(scale_geometry(v, scale) for v in config)
+    if isinstance(config, (int, float)) and not isinstance(config, bool):
+        return scaled(config, scale)
+    return config
+
+
+def _cached(key: tuple, build) -> Image.Image:
+    with _asset_lock:
+        img = _asset_cache.get(key)
+        if img is not None:
+            _asset_cache.move_to_end(key)
+            return img
+    img = build()
+    with _asset_lock:
+        _asset_cache[key] = img
+        while len(_asset_cache) > _ASSET_CACHE_SIZE:
+            _asset_cache.popitem(last=False)
+    return img
+
+
+def load_scaled(path: str, scale: float = 1.0) -> Image.Image:
+    """
+    Imagem RGBA de path redimensionada por scale (compartilhada: use .copy()
+    antes de desenhar sobre ela)
+    """
+    key = ("asset", path, os.path.getmtime(path), scale)
+
+    def build():
+        img = Image.open(path).convert("RGBA")
+        if scale != 1:
+            size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+            img = img.resize(size, Image.LANCZOS)
+        return img
+
+    return _cached(key, build)
+
+
+def fitted_badge(path: str, target_size: Tuple[int, int]) -> Image.Image:
+    """
+    Escudo reduzido (thumbnail LANCZOS) e centralizado num canvas
+    transparente de target_size; compartilhado, apenas para colar
+    """
+    key = ("badge", path, os.path.getmtime(path), tuple(target_size))
+
+    def build():
+        badge = Image.open(path).convert("RGBA")
+        badge.thumbnail(target_size, Image.LANCZOS)
+        canvas = Image.new("RGBA", target_size, (0, 0, 0, 0))
+        pos_x = (target_size[0] - badge.width) // 2
+        pos_y = (target_size[1] - badge.height) // 2
+        canvas.paste(badge, (pos_x, pos_y), badge)
+        return canvas
+
+    return _cached(key, build)
@@ -0,0 +1,614 @@
+"""
+Placares de partidas (modo "Placar" do app), individuais ou em lote
+
+desenhar_placar monta a arte de um jogo sobre o template da competição. No
+lote, os jogos colados no formato do ResultsParser (com linhas opcionais de
+marcadores) são desenhados num pool de threads e gravados num único ZIP à
+medida que ficam prontos. Templates, escudos e o fundo já escalado vêm dos
+caches compartilhados (scaling, background); as fontes vêm de
+text_sprites.get_font, que as guarda por thread.
+"""
+from PIL import Image, ImageDraw
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+import contextvars
+import os
+import re
+
+from utils import perf
+from utils.background import BackgroundSource, cover_background, prepare_cover_background
+from utils.image_export import ExportSettings, ImageZipWriter
+from utils.results_parser import ResultsParser
+from utils.scaling import fitted_badge, load_scaled, scale_geometry, scaled, scaled_font_size
+from utils.text_sprites import get_font
+
+
+def redimensionar_escudo(filepath, target_size=(100, 100)):
+    # Em cache por (arquivo, tamanho); a imagem é compartilhada, só para colar
+    return fitted_badge(filepath, tuple(target_size))
+
+
+
+def obter_config_template(template_path):
+    nome = os.path.splitext(os.path.basename(template_path))[0].lower()
+    
+    if "premier" in nome:
+        h = 799
+        return {
+            "fonte_normal": "fontes/premierleague.otf",
+            "fonte_bold": "fontes/premierleague-bold.otf",
+            "tamanho_escudo": (84, 84),
+            "pos_escudo_casa": (145, h),
+            "pos_escudo_fora": (-229, h), # valor negativo será tratado como relativo ao width,
+            "cor_texto": "#3b0643",
+            "cor_texto_placar": "white",
+            "cor_texto_times": "white",
+            "alinhamento_nomes": "lados",  # mandante à esquerda, visitante à direita (como os marcadores)
+            "pos_nome_casa": (240, h+22),  # x = margem esquerda
+            "pos_nome_fora": (-240, h+24), # x negativo = margem da borda direita
+            "pos_placar": h+1,
+            "pos_marcadores_casa": (243, 887),  # mesmo x do nome do time
+            "pos_marcadores_fora": (-243, 887), # x negativo = margem da borda direita
+            "tamanho_nome": 36,
+            "tamanho_placar": 72,
+            "tamanho_marcadores": 30,
+            "espaco_linha": 45,
+        }
+    # elif nome == "championship":
+    #     # Escudos ficam fora do card (card sem "orelhas"); placar dividido dentro do card
+    #     # Escudo maior (240x240) mantendo o mesmo centro de ancoragem (borda do card / linha do placar)
+    #     return {
+    #         "fonte_normal": "fontes/premierleague-bold.otf",
+    #         "fonte_bold": "fontes/efl-placar.otf",
+    #         "tamanho_escudo": (220, 220),
+    #         "pos_escudo_casa": (160, 880),
+    #         "pos_escudo_fora": (-380, 880),
+    #         "cor_texto": "#ad994a",
+    #         "cor_texto_placar": "#ad994a",
+    #         "tamanho_placar": 220,
+    #         "tamanho_marcadores": 16,
+    #         "pos_placar": 1000,
+    #         "placar_dividido": True,
+    #         "pos_placar_split_x": (490, 590),
+    #         "pos_marcadores_casa": (500, 1105),
+    #         "pos_marcadores_fora": (-500, 1105),
+    #         "espaco_linha": 20,
+    #     }
+    elif nome in ("championship", "leagueone", "leaguetwo", "eflcup"):
+        # Escudos ficam dentro das "orelhas" do card; placar dividido pela linha central
+        cor = {"championship": "#7f6701", "leagueone": "white", "leaguetwo": "#C10724", "eflcup": "#177E52"}[nome]
+        config = {
+            "fonte_normal": "fontes/premierleague-bold.otf",
+            "fonte_bold": "fontes/efl-placar.otf",
+            "tamanho_escudo": (164, 164),
+            "pos_escudo_casa": (350, 900),
+            "pos_escudo_fora": (-515, 900),
+            "cor_texto": "white",
+            "cor_texto_placar": "white",
+            "tamanho_placar": 164,
+            "tamanho_marcadores": 16,
+            "pos_placar": 990,
+            "placar_dividido": True,
+            "pos_placar_split_x": (248, 828),
+            "pos_marcadores_casa": (525, 1100),
+            "pos_marcadores_fora": (-525, 1100),
+            "espaco_linha": 20,
+        }
+        return config
+    elif "championship" in nome or "efl" in nome or "league" in nome:
+        h = 920
+        return {
+            "fonte_normal": "fontes/efl.otf",
+            "fonte_bold": "fontes/efl-bold.otf",
+            "tamanho_escudo": (50, 50),
+            "pos_escudo_casa": (130, h),
+            "pos_escudo_fora": (-180, h),
+            "cor_texto": "#3241a1",
+            "cor_texto_placar": "white",
+            # Sem nomes de times na nova arte da EFL (pos_nome_* omitidos)
+            "pos_placar": 923,
+        }
+    elif "facup" in nome:
+        h = 914
+        return {
+            "fonte_normal": "fontes/facup.otf",
+            "fonte_bold": "fontes/facup-bold.otf",
+            "tamanho_escudo": (60, 60),
+            "pos_escudo_casa": (121, h),
+            "pos_escudo_fora": (-181, h),
+            "cor_texto_times": "#383b38",
+            "cor_texto": "white",
+            "cor_texto_placar": "white",
+            "pos_nome_casa": (336, h+18),  # Posição absoluta
+            "pos_nome_fora": (742, h+18),
+            "pos_placar": 920,
+        }
+    elif "ucl" in nome:
+        h = 880
+        return {
+            "fonte_normal": "fontes/ucl.ttf",
+            "fonte_bold": "fontes/ucl-bold.ttf",
+            "tamanho_escudo": (120, 120),
+            "pos_escudo_casa": (70, h),
+            "pos_escudo_fora": (-180, h),
+            "cor_texto": "white",
+            "cor_texto_placar": "white",
+            "pos_nome_casa": (317, h+45),  # Posição absoluta
+            "pos_nome_fora": (758, h+45),
+            "pos_placar": 915,
+        }
+    elif "uel" in nome or "uecl" in nome:
+        h = 912
+        return {
+            "fonte_normal": "fontes/uel.ttf",
+            "fonte_bold": "fontes/uel-bold.ttf",
+            "tamanho_escudo": (60, 60),
+            "pos_escudo_casa": (120, h),
+            "pos_escudo_fora": (-180, h),
+            "cor_texto": "white",
+            "cor_texto_placar": "black",
+            "pos_nome_casa": (335, h+15),  # Posição absoluta
+            "pos_nome_fora": (743, h+15),  # Posição absoluta
+            "pos_placar": 915,
+        }
+    elif "inglaterra" in nome:
+        h = 915
+        return {
+            "fonte_normal": "fontes/ing.ttf",
+            "fonte_bold": "fontes/ing.ttf",
+            "tamanho_escudo": (60, 60),
+            "pos_escudo_casa": (120, h),
+            "pos_escudo_fora": (-180, h),
+            "cor_texto": "#0c113c",
+            "cor_texto_placar": "white",
+            "pos_nome_casa": (330, h+17),  # Posição absoluta
+            "pos_nome_fora": (760, h+17),
+            "pos_placar": 920,
+        }
+    else:
+        return {
+            "fonte_normal": "fontes/facup.ttf",
+            "fonte_bold": "fontes/facup-bold.ttf",
+            "tamanho_escudo": (100, 100),
+            "pos_escudo_casa": (50, h),
+            "pos_escudo_fora": (-150, h),
+            "cor_texto": "white",
+            "cor_texto_placar": "white",
+            "pos_nome_casa": (360, 870),  # Posição absoluta
+            "pos_nome_fora": (-360, 870),
+            "pos_placar": 915,
+        }
+
+
+
+def obter_escudo_path(team_name, template_path=None):
+    """Busca o escudo em múltiplas pastas"""
+    pastas = ["escudos-pl", "escudos-ch", "escudos-l1", "escudos-l2", 
+              "escudos-ucl", "escudos-uel", "escudos-uecl", "selecoes", "escudos-nl", "escudos-nonleague"]
+    
+    for pasta in pastas:
+        caminho = os.path.join(pasta, f"{team_name}.png")
+        if os.path.exists(caminho):
+            return caminho
+    
+    return None
+
+_GRADIENT_CONFIG = {
+    "premier":       {"color": (55, 0, 60),   "start": 0.4,  "intensity": 0.9},   # #37003c
+    "championship":  {"color": (52, 42, 0),   "start": 0.55, "intensity": 0.95},  # #342a00
+    "leagueone":     {"color": (23, 23, 23),  "start": 0.55, "intensity": 0.95},  # #171717
+    "leaguetwo":     {"color": (75, 0, 16),   "start": 0.55, "intensity": 0.95},  # #4b0010
+    "eflcup":        {"color": (28, 65, 35),  "start": 0.55, "intensity": 0.95},  # #1c4123
+    "nationalleague": {"color": (0, 0, 0),    "start": 0.4,  "intensity": 0.9},   # a definir
+    "efl":           {"color": (0, 0, 0),     "start": 0.4,  "intensity": 0.9},   # a definir
+}
+
+def _carregar_template(template_path: str, scale: float) -> Image.Image:
+    """Template do placar na escala pedida (compartilhado: copie antes de desenhar)"""
+    base = load_scaled(template_path)
+
+    # O template da Premier League é fornecido em alta resolução (2160px);
+    # reduz para 1350px de altura para casar com as coordenadas de obter_config_template
+    if "premier" in template_path.lower() and base.height > 1350:
+        return load_scaled(template_path, 1350 / base.height * scale)
+    return load_scaled(template_path, scale)
+
+
+@perf.instrument("desenhar_placar")
+def desenhar_placar(template_path, escudo_casa, escudo_fora, placar_texto, marcadores_casa, marcadores_fora, background=None, alinhamento="Centro", scale=1.0):
+    # scale < 1 gera a prévia: medidas, fontes e recursos reduzidos na mesma proporção
+    def s(valor):
+        return scaled(valor, scale)
+
+    base = _carregar_template(template_path, scale).copy()  # o template em cache não pode ser alterado
+
+    if background:
+        # Decodificação e escala ficam em cache; o alinhamento só refaz o recorte
+        from utils.gradient import apply_bottom_gradient
+
+        bg_cropped = cover_background(background, base.size, alinhamento)
+
+        tpl = template_path.lower()
+        gradient_cfg = next(
+            (cfg for key, cfg in _GRADIENT_CONFIG.items() if key in tpl),
+            None,
+        )
+        if gradient_cfg is not None:
+            bg_cropped = apply_bottom_gradient(
+                bg_cropped,
+                intensity=gradient_cfg["intensity"],
+                color=gradient_cfg["color"],
+                start=gradient_cfg["start"],
+            )
+
+        final_img = Image.new("RGBA", bg_cropped.size, (0, 0, 0, 0))
+        base_x = (bg_cropped.width - base.width) // 2
+        base_y = (bg_cropped.height - base.height) // 2
+        final_img.paste(bg_cropped, (0, 0))
+        final_img.paste(base, (base_x, base_y), base)
+        base = final_img
+
+    # Configurações do template
+    config = scale_geometry(obter_config_template(template_path), scale)
+    path_lower = template_path.lower()
+
+    if any(comp in path_lower for comp in ["uel", "uecl"]):
+        fonte_normal = get_font(config["fonte_bold"], scaled_font_size(28, scale))
+    else:
+        fonte_normal = get_font(config["fonte_normal"], scaled_font_size(32, scale))
+    fonte_bold = get_font(config["fonte_bold"], config.get("tamanho_placar", scaled_font_size(48, scale)))
+    fonte_pequena = get_font(config["fonte_normal"], config.get("tamanho_marcadores", scaled_font_size(26, scale)))
+    fonte_mais_pequena = get_font(config["fonte_normal"], scaled_font_size(18, scale))
+    fonte_nome = (
+        get_font(config["fonte_normal"], config["tamanho_nome"])
+        if "tamanho_nome" in config else None
+    )
+    cor_texto = config["cor_texto"]
+    cor_texto_placar = config["cor_texto_placar"]
+    cor_marcadores = config.get("cor_marcadores", cor_texto)
+
+    draw = ImageDraw.Draw(base)
+
+    # Redimensionar escudos com proporção preservada
+    escudo_home = redimensionar_escudo(obter_escudo_path(escudo_casa), config["tamanho_escudo"])
+    escudo_away = redimensionar_escudo(obter_escudo_path(escudo_fora), config["tamanho_escudo"])
+
+    # Posição dos escudos
+    pos_escudo_casa = config["pos_escudo_casa"]
+    pos_escudo_fora_raw = config["pos_escudo_fora"]
+    pos_escudo_fora = (
+        base.width + pos_escudo_fora_raw[0] if pos_escudo_fora_raw[0] < 0 else pos_escudo_fora_raw[0],
+        pos_escudo_fora_raw[1]
+    )
+
+    base.paste(escudo_home, pos_escudo_casa, escudo_home)
+    base.paste(escudo_away, pos_escudo_fora, escudo_away)
+    europeu = any(comp in path_lower for comp in ["ucl", "uel", "uecl"])
+    efl = any(comp in path_lower for comp in ["efl", "champ", "leagueone", "leaguetwo", "nationalleague"])
+    ing = any(comp in path_lower for comp in ["inglaterra"])
+
+    # 🏷️ Nomes dos times
+    for nome, pos_key in [(escudo_casa, "pos_nome_casa"), (escudo_fora, "pos_nome_fora")]:
+        pos = config.get(pos_key)
+        if not pos:
+            continue
+        
+        x, y = pos
+        if europeu and nome == "Nottingham Forest":
+            nome = "Nott'm Forest"
+        if europeu and nome == "Borussia Dortmund":
+            nome = "Bor. Dortmund"
+        if "facup" in path_lower and nome == "Queens Park Rangers":
+            nome = "QPR"
+        # Solicitação oficial do clube: exibir "Tottenham Hotspur" ou "Spurs", nunca "Tottenham"
+        if "premier" in path_lower and nome == "Tottenham Hotspur":
+            nome = "Spurs"
+        if "premier" in path_lower and nome == "Manchester United":
+            nome = "Manchester Utd"
+        if "premier" in path_lower and nome == "Newcastle United":
+            nome = "Newcastle Utd"
+        if "premier" in path_lower and nome == "Nottingham Forest":
+            nome = "Nott'm Forest"
+        nome_maiusculo = nome.upper()
+
+        # Decide a fonte (tamanho_nome no config tem prioridade)
+        if fonte_nome is not None:
+            fonte_usada = fonte_nome
+        elif any(comp in path_lower for comp in ["ucl", "uel", "uecl"]):
+            fonte_usada = fonte_normal
+        else:
+            fonte_usada = fonte_pequena
+
+        w_text = fonte_usada.getbbox(nome_maiusculo)[2] - fonte_usada.getbbox(nome_maiusculo)[0]
+
+        if config.get("alinhamento_nomes") == "lados":
+            # Mandante alinhado à esquerda; visitante à direita (x negativo = margem direita)
+            x_final = base.width + x - w_text if x < 0 else x
+        else:
+            # Centralizado na posição x
+            x_final = x - w_text // 2
+
+        # Desenha
+        if ing:
+            draw.text((x_final, y), nome_maiusculo, font=fonte_usada, fill=cor_texto)
+        else:
+            draw.text((x_final, y), nome_maiusculo, font=fonte_usada, fill=config.get("cor_texto_times", "white"))
+
+
+    # Placar principal centralizado
+    placar = placar_texto.split('(')[0].strip()
+
+    # Remove espaços ao redor de hífens
+    placar = re.sub(r'\s*-\s*', '-', placar)
+
+    if config.get("placar_dividido") and '-' in placar:
+        # Números separados nos dois lados da linha/escudo central do card
+        # pos_placar_split_x guarda o centro de cada número (anchor "mm" centraliza nos dois eixos)
+        placar_casa, placar_fora = placar.split('-', 1)
+        x_placar_casa, x_placar_fora = config["pos_placar_split_x"]
+        draw.text((x_placar_casa, config["pos_placar"]), placar_casa, font=fonte_bold, fill=cor_texto_placar, anchor="mm")
+        draw.text((x_placar_fora, config["pos_placar"]), placar_fora, font=fonte_bold, fill=cor_texto_placar, anchor="mm")
+    else:
+        w_placar = fonte_bold.getbbox(placar)[2] - fonte_bold.getbbox(placar)[0]
+        draw.text(((base.width - w_placar) // 2, config["pos_placar"]), placar, font=fonte_bold, fill=cor_texto_placar)
+
+    # Agregado ou pênaltis (centralizado)
+    # Posições do config têm prioridade sobre os padrões por competição
+    # (x negativo em pos_marcadores_fora = margem da borda direita)
+    pos_marc_casa = config.get("pos_marcadores_casa")
+    pos_marc_fora = config.get("pos_marcadores_fora")
+
+    # Nos cards de placar dividido (EFL Cup, Championship, League One, League Two)
+    # o texto de agregado/pênaltis fica escondido atrás do escudo/placar central se
+    # desenhado na posição padrão — em vez disso, ocupa o lugar onde os marcadores
+    # ficariam e empurra os marcadores um pouco mais para baixo.
+    agregado_abaixo_marcadores = bool(config.get("placar_dividido")) and pos_marc_casa is not None
+
+    if '(' in placar_texto and ')' in placar_texto:
+        conteudo = placar_texto.split('(')[1].replace(')', '').strip().lower()
+
+        if "agr" in conteudo:
+            label = "Agregado: "
+            valor = conteudo.replace("agr.", "").replace("agr", "").strip()
+        elif "pên" in conteudo:
+            label = "Pênaltis: "
+            valor = conteudo.replace("pên.", "").replace("pên", "").strip()
+        elif "pen" in conteudo:
+            label = "Pênaltis: "
+            valor = conteudo.replace("pen.", "").replace("pen", "").strip()
+        elif "pro" in conteudo:
+            label = "Prorrogação"
+            valor = ""
+        else:
+            label = ""
+            valor = conteudo  # fallback
+
+        agregado_texto = label + valor
+
+        path_lower = template_path.lower()
+        mais_pra_cima = any(comp in path_lower for comp in ["uel", "uecl", "efl", "championship", "leagueone", "leaguetwo", "nationalleague"])
+
+        if agregado_abaixo_marcadores:
+            y_agregado = pos_marc_casa[1]
+            # Um pouco maior que a fonte dos marcadores, para se destacar como informação extra
+            fonte_agregado = get_font(
+                config["fonte_normal"],
+                config.get("tamanho_marcadores", scaled_font_size(26, scale)) + s(4),
+            )
+        else:
+            y_agregado = s(975 if mais_pra_cima else 985)
+            fonte_agregado = fonte_mais_pequena
+
+        w_agr = fonte_agregado.getbbox(agregado_texto)[2] - fonte_agregado.getbbox(agregado_texto)[0]
+        draw.text(((base.width - w_agr) // 2, y_agregado), agregado_texto, font=fonte_agregado, fill=cor_texto)
+
+    # 🟩 Marcadores
+    espaco_linha = config.get("espaco_linha", s(34))
+
+    tem_agregado = (
+        '(' in placar_texto and ')' in placar_texto and
+        any(x in placar_texto.split('(')[1].replace(')', '').strip().lower() for x in ["agr", "pên", "pen", "pro"])
+    )
+    if tem_agregado:
+        offset_agregado = s(36 if agregado_abaixo_marcadores else 15)
+    else:
+        offset_agregado = 0
+
+    if europeu:
+        y_base = s(1000) + offset_agregado
+    elif efl:
+        y_base = s(980) + offset_agregado
+    else:
+        y_base = s(990) + offset_agregado
+
+    margem_padrao = s(140 if europeu else 200)
+    maiusculas = europeu or ing or config.get("placar_dividido")
+
+    y_casa = pos_marc_casa[1] + offset_agregado if pos_marc_casa else y_base
+    y_fora = pos_marc_fora[1] + offset_agregado if pos_marc_fora else y_base
+
+    # Nos cards de placar dividido, os marcadores ficam ancorados na borda interna
+    # (voltada para o centro) do próprio escudo: mandante alinhado à direita,
+    # visitante alinhado à esquerda — o oposto do padrão usado nos demais templates.
+    if config.get("placar_dividido"):
+        badge_w = config["tamanho_escudo"][0]
+        if pos_marc_casa:
+            x_casa_fim = pos_marc_casa[0]
+        else:
+            x_casa_fim = pos_escudo_casa[0] + badge_w
+        if pos_marc_fora:
+            x_fora_inicio = base.width + pos_marc_fora[0] if pos_marc_fora[0] < 0 else pos_marc_fora[0]
+        else:
+            x_fora_inicio = pos_escudo_fora[0]
+
+        # Mandante (alinhamento à direita)
+        for i, linha in enumerate(marcadores_casa.split('\n')):
+            if maiusculas:
+                linha = linha.upper()
+            w_linha = fonte_pequena.getbbox(linha)[2] - fonte_pequena.getbbox(linha)[0]
+            draw.text((x_casa_fim - w_linha, y_casa + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
+
+        # Visitante (alinhamento à esquerda)
+        for i, linha in enumerate(marcadores_fora.split('\n')):
+            if maiusculas:
+                linha = linha.upper()
+            draw.text((x_fora_inicio, y_fora + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
+    else:
+        x_casa = pos_marc_casa[0] if pos_marc_casa else margem_padrao
+        margem_fora = -pos_marc_fora[0] if pos_marc_fora else margem_padrao
+
+        # Casa (alinhamento à esquerda)
+        for i, linha in enumerate(marcadores_casa.split('\n')):
+            if maiusculas:
+                linha = linha.upper()
+            draw.text((x_casa, y_casa + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
+
+        # Visitante (alinhado à direita)
+        for i, linha in enumerate(marcadores_fora.split('\n')):
+            if maiusculas:
+                linha = linha.upper()
+            w_linha = fonte_pequena.getbbox(linha)[2] - fonte_pequena.getbbox(linha)[0]
+            draw.text((base.width - margem_fora - w_linha, y_fora + i * espaco_linha), linha, font=fonte_pequena, fill=cor_marcadores)
+
+    return base
+
+
+# ============================================================================
+# LOTE: UM PLACAR POR JOGO DA RODADA
+# ============================================================================
+
+# Linhas de marcadores no lote: "C:" mandante (casa), "F:" visitante (fora)
+_MARCADOR_RE = re.compile(r'^([CF])\s*:\s*(.*)$', re.IGNORECASE)
+
+
+def _placar_texto(result: Dict) -> Optional[str]:
+    """Texto de placar de desenhar_placar a partir de um resultado do ResultsParser"""
+    if result.get('home_score') is None:
+        return None
+    placar = f"{result['home_score']}-{result['away_score']}"
+    if result['status'] == 'penalties':
+        placar += f" (pên. {result['pen_home']}-{result['pen_away']})"
+    elif result['status'] == 'extra_time':
+        placar += " (pro)"
+    return placar
+
+
+def parse_lote_placares(texto: str, parser: ResultsParser) -> Tuple[List[Dict], List[str]]:
+    """
+    Jogos do modo em lote
+
+    Cada jogo é uma linha no formato do ResultsParser ("ARS 2-1 CHE",
+    "LIV 1-1(4-3) EVE", ...), seguida opcionalmente de linhas "C: ..." com os
+    marcadores do mandante e "F: ..." com os do visitante, uma por linha:
+
+        ARS 2-1 CHE
+        C: Saka 12'
+        C: Havertz 80'
+        F: Palmer 45+2'
+
+    Returns:
+        (jogos, ignoradas): jogos com as chaves de desenhar_placar e as linhas
+        que não viraram placar (formato inválido, jogo sem placar, marcador
+        antes de qualquer jogo)
+    """
+    jogos: List[Dict] = []
+    ignoradas: List[str] = []
+    atual: Optional[Dict] = None
+
+    for linha in texto.strip().split('\n'):
+        linha = linha.strip()
+        if not linha:
+            continue
+
+        m = _MARCADOR_RE.match(linha)
+        if m:
+            if atual is None:
+                ignoradas.append(linha)
+                continue
+            chave = 'marcadores_casa' if m.group(1).upper() == 'C' else 'marcadores_fora'
+            atual[chave].append(m.group(2).strip())
+            continue
+
+        result = parser.parse_single_result(linha)
+        placar = _placar_texto(result) if result else None
+        if placar is None:
+            # Resultado inválido, adiado, futuro...: os marcadores seguintes também ficam de fora
+            ignoradas.append(linha)
+            atual = None
+            continue
+
+        atual = {
+            'escudo_casa': result['home_team'],
+            'escudo_fora': result['away_team'],
+            'placar_texto': placar,
+            'marcadores_casa': [],
+            'marcadores_fora': [],
+        }
+        jogos.append(atual)
+
+    for jogo in jogos:
+        jogo['marcadores_casa'] = '\n'.join(jogo['marcadores_casa'])
+        jogo['marcadores_fora'] = '\n'.join(jogo['marcadores_fora'])
+    return jogos, ignoradas
+
+
+def nome_arquivo_placar(jogo: Dict, extensao: str) -> str:
+    """Mesmo padrão de nome do download individual: "Mandante 2-1 Visitante.ext" """
+    return f"{jogo['escudo_casa']} {jogo['placar_texto']} {jogo['escudo_fora']}.{extensao}".replace("/", "-")
+
+
+def escudos_faltando(jogos: Iterable[Dict]) -> List[str]:
+    """Times do lote sem escudo em nenhuma das pastas"""
+    faltando = []
+    for jogo in jogos:
+        for time in (jogo['escudo_casa'], jogo['escudo_fora']):
+            if obter_escudo_path(time) is None and time not in faltando:
+                faltando.append(time)
+    return faltando
+
+
+def iter_placares_lote(template_path: str, jogos: List[Dict],
+                       background: Optional[BackgroundSource] = None,
+                       alinhamento="Centro", scale: float = 1.0,
+                       max_workers: Optional[int] = None) -> Iterator[Image.Image]:
+    """
+    Desenha os placares do lote num pool de threads e os devolve na ordem dos
+    jogos. No máximo 2 × max_workers artes ficam em andamento ou esperando a
+    vez, então a memória não cresce com o tamanho do lote.
+    """
+    max_workers = max_workers or min(4, os.cpu_count() or 1)
+
+    if background:
+        # Decodifica o fundo uma vez antes de abrir o pool; os jogos só recortam
+        prepare_cover_background(background, _carregar_template(template_path, scale).size)
+
+    def desenhar(jogo: Dict) -> Image.Image:
+        return desenhar_placar(
+            template_path, background=background, alinhamento=alinhamento, scale=scale, **jogo
+        ).convert("RGB")
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="placar") as pool:
+        pendentes = deque()
+        for jogo in jogos:
+            # Cópia do contexto: o tempo de cada placar conta na ação que pediu o lote
+            pendentes.append(pool.submit(contextvars.copy_context().run, desenhar, jogo))
+            if len(pendentes) >= 2 * max_workers:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+def gerar_zip_placares(fileobj: IO[bytes], template_path: str, jogos: List[Dict],
+                       exportacao: ExportSettings,
+                       background: Optional[BackgroundSource] = None,
+                       alinhamento="Centro", scale: float = 1.0) -> List[str]:
+    """
+    Grava em fileobj um ZIP com um placar por jogo (desenho em paralelo e
+    codificação em paralelo com o desenho) e devolve os nomes das entradas
+    """
+    with perf.timed("scoreboard.gerar_zip_placares"), ImageZipWriter(fileobj, exportacao) as zip_writer:
+        imagens = iter_placares_lote(template_path, jogos, background, alinhamento, scale)
+        for jogo, img in zip(jogos, imagens):
+            zip_writer.add(nome_arquivo_placar(jogo, exportacao.extension), img)
+    return zip_writer.filenames
@@ -0,0 +1,19 @@
+"""
+Season boundaries for English football (seasons start on July 1st).
+
+Kept free of pandas so that modules needing only the season label can be
+imported without paying for the dataframe stack.
+"""
+from datetime import datetime
+
+
+def _season_start(ref_date=None) -> datetime:
+    d = ref_date if ref_date is not None else datetime.now()
+    year = d.year if d.month >= 7 else d.year - 1
+    return datetime(year, 7, 1)
+
+
+def _season_label(ref_date=None) -> str:
+    """Returns the English-football season label for ref_date, e.g. '2025-26'."""
+    start_year = _season_start(ref_date).year
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
@@ -0,0 +1,146 @@
+"""
+Animação da tabela: cada time sai da posição da rodada anterior
+(data/posicoes.csv) e desliza até a atual
+
+Montada sobre ImageGenerator.generate_table_layers: o fundo (template,
+zonas, números) é desenhado uma vez, o sprite de cada time também, e cada
+quadro é só o fundo restaurado e os sprites colados na altura do momento,
+apenas na região que mudou. O quadro parado do fim é a tabela estática. Os quadros vão um a um para o codificador
+(utils/animated_export.py), que grava só essa região; a memória não cresce
+com o número de quadros.
+"""
+from PIL import ImageChops
+from typing import IO, Dict, List, Optional, Tuple
+import math
+
+from utils.animated_export import open_animation_writer
+from utils.image_generator import TableLayers, _boxes_overlap, _union_box
+from utils.perf import instrument
+
+# Quadros do deslocamento e duração de cada um (ms)
+MOVE_FRAMES = 30
+FRAME_MS = 40
+
+# Tempo parado na tabela anterior e na atual (ms)
+HOLD_START_MS = 1000
+HOLD_END_MS = 3000
+
+Box = Tuple[int, int, int, int]
+
+
+def ease_in_out(t: float) -> float:
+    """Cúbica: sai devagar, acelera no meio e chega devagar"""
+    if t < 0.5:
+        return 4 * t ** 3
+    return 1 - (-2 * t + 2) ** 3 / 2
+
+
+def start_rows(table_data: List[Dict], previous: Dict[str, int]) -> List[int]:
+    """
+    Linha (0 = primeira) de onde cada time sai, na ordem de table_data
+
+    Quem não tem posição anterior válida (ausente, fora da tabela ou já
+    ocupada) começa na atual se ela estiver livre, senão na primeira linha
+    livre: dois times nunca saem da mesma linha.
+    """
+    num_rows = len(table_data)
+    rows: List[Optional[int]] = [None] * num_rows
+    claimed = set()
+    for idx, team in enumerate(table_data):
+        row = previous.get(team['name'], 0) - 1
+        if 0 <= row < num_rows and row not in claimed:
+            rows[idx] = row
+            claimed.add(row)
+    for idx in range(num_rows):
+        if rows[idx] is None and idx not in claimed:
+            rows[idx] = idx
+            claimed.add(idx)
+    free = iter(sorted(set(range(num_rows)) - claimed))
+    return [row if row is not None else next(free) for row in rows]
+
+
+def _schedule(rows_from: List[int], move_frames: int, frame_ms: int,
+              hold_start_ms: int, hold_end_ms: int) -> List[Tuple[List[float], int]]:
+    """(linha fracionária de cada time, duração) de cada quadro"""
+    rows_to = list(range(len(rows_from)))
+    steps = [(list(map(float, rows_from)), hold_start_ms)]
+    for k in range(1, move_frames + 1):
+        e = ease_in_out(k / move_frames)
+        steps.append(([a + (b - a) * e for a, b in zip(rows_from, rows_to)], frame_ms))
+    rows, _ = steps[-1]
+    steps[-1] = (rows, hold_end_ms)
+    return steps
+
+
+@instrument()
+def render_standings_animation(fileobj: IO[bytes], layers: TableLayers, rows_from: List[int],
+                               fmt: str = "gif", quality: Optional[int] = None,
+                               move_frames: int = MOVE_FRAMES, frame_ms: int = FRAME_MS,
+                               hold_start_ms: int = HOLD_START_MS,
+                               hold_end_ms: int = HOLD_END_MS) -> int:
+    """
+    Grava em fileobj a animação da tabela em fmt ("gif" ou "webp") e
+    devolve quantos quadros foram gravados
+
+    Args:
+        layers: camadas da tabela atual (ImageGenerator.generate_table_layers)
+        rows_from: linha de partida de cada time (ver start_rows)
+    """
+    background = layers.background.convert("RGBA")
+    final = layers.final.convert("RGBA")
+    frame = background.copy()
+
+    # Quem sobe passa por cima de quem cai
+    order = sorted(range(len(layers.sprites)), key=lambda i: rows_from[i] - i)
+
+    def boxes(rows: List[float]) -> List[Box]:
+        result = []
+        for (sprite, (dx, dy)), row in zip(layers.sprites, rows):
+            y = math.floor(layers.table_top + row * layers.row_height) + dy
+            result.append((dx, y, dx + sprite.width, y + sprite.height))
+        return result
+
+    def paint(region: Box, current: List[Box]) -> None:
+        """Fundo e sprites (recortados) dentro de region"""
+        frame.paste(background.crop(region), region[:2])
+        for i in order:
+            box = current[i]
+            if not _boxes_overlap(box, region):
+                continue
+            clip = (max(box[0], region[0]), max(box[1], region[1]),
+                    min(box[2], region[2]), min(box[3], region[3]))
+            frame.alpha_composite(
+                layers.sprites[i][0], clip[:2],
+                (clip[0] - box[0], clip[1] - box[1], clip[2] - box[0], clip[3] - box[1])
+            )
+
+    # Quadros em que nenhum sprite muda de pixel viram tempo do anterior
+    steps = []
+    for rows, duration in _schedule(rows_from, move_frames, frame_ms, hold_start_ms, hold_end_ms):
+        current = boxes(rows)
+        if steps and steps[-1][0] == current:
+            steps[-1][1] += duration
+        else:
+            steps.append([current, duration])
+
+    with open_animation_writer(fileobj, fmt, background.size, quality) as writer:
+        previous: Optional[List[Box]] = None
+        for n, (current, duration) in enumerate(steps, start=1):
+            if previous is None:
+                region = (0, 0) + background.size
+            else:
+                region = None
+                for old, new in zip(previous, current):
+                    if old != new:
+                        moved = _union_box(old, new)
+                        region = moved if region is None else _union_box(region, moved)
+            paint(region, current)
+            if n == len(steps):
+                # Bordas do texto composto dos sprites: acerta para a tabela estática
+                fix = ImageChops.difference(frame, final).getbbox(alpha_only=False)
+                if fix:
+                    frame.paste(final.crop(fix), fix[:2])
+                    region = fix if region is None else _union_box(region, fix)
+            writer.add(frame, duration, region)
+            previous = current
+        return writer.frames
@@ -2,17 +2,21 @@
 Motor de estatísticas para o Streamlit app.
 Lê data/historico.csv e gera insights usando bbi_functions.
 """
+import os
 import pandas as pd
 from typing import Dict, List, Tuple
 
-from utils.bbi_functions import allinsights, wdl, gf as _gf, gs as _gs, _parse_score, _season_start
+from utils.bbi_functions import allinsights, wdl, gf as _gf, gs as _gs, _parse_score
+from utils.season import _season_start
+from utils.perf import instrument, timed
 
 HISTORICO_PATH = "data/historico.csv"
 
 
 def load_historico(liga_str: str) -> pd.DataFrame:
     """Carrega registros históricos de uma liga, ordenados por data."""
-    df = pd.read_csv(HISTORICO_PATH, parse_dates=['data'])
+    with timed("csv historico.csv", bytes_in=os.path.getsize(HISTORICO_PATH)):
+        df = pd.read_csv(HISTORICO_PATH, parse_dates=['data'])
     df = df[df['liga'] == liga_str].copy()
     df = df.sort_values('data').reset_index(drop=True)
     return df
@@ -136,6 +140,7 @@ def _ranking_insights(team: str, home_table: pd.DataFrame, away_table: pd.DataFr
     return insights
 
 
+@instrument()
 def compute_league_stats(liga_str: str) -> dict:
     """
     Calcula todas as estatísticas de uma liga a partir do histórico CSV.
@@ -1,22 +1,177 @@
 """
 Validador de tabelas - compara tabela calculada com fonte oficial
 """
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from lxml import html
 from collections import Counter
-from typing import List, Dict, Tuple
-from fuzzywuzzy import process
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Iterable, Optional, Tuple
 import pandas as pd
 
+from utils.perf import timed
+from utils.team_matcher import TeamMatcher
+
+DEFAULT_SOURCES = {
+    'premierleague': 'https://www.skysports.com/premier-league-table',
+    'championship': 'https://www.skysports.com/championship-table',
+    'leagueone': 'https://www.skysports.com/league-1-table',
+    'leaguetwo': 'https://www.skysports.com/league-2-table',
+    'nationalleague': 'https://www.skysports.com/national-league-table'
+}
+
+# Páginas baixadas ficam em disco; dentro do TTL nem há requisição, depois
+# dele a página é revalidada com ETag / Last-Modified (304 = reaproveita)
+SKY_CACHE_DIR = ".cache/sky"
+DEFAULT_CACHE_TTL = 600
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Busca em segundo plano de todas as ligas (ver TableValidator.prefetch_all)
+_prefetch_thread: Optional[threading.Thread] = None
+_prefetch_started = 0.0
+_prefetch_lock = threading.Lock()
+
+
+def _shared_session() -> requests.Session:
+    """Sessão HTTP compartilhada (keep-alive entre ligas e entre validações)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=len(DEFAULT_SOURCES))
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
 class TableValidator:
-    def __init__(self):
-        self.sources = {
-            'premierleague': 'https://www.skysports.com/premier-league-table',
-            'championship': 'https://www.skysports.com/championship-table',
-            'leagueone': 'https://www.skysports.com/league-1-table',
-            'leaguetwo': 'https://www.skysports.com/league-2-table',
-            'nationalleague': 'https://www.skysports.com/national-league-table'
-        }
+    def __init__(self, sources: Optional[Dict[str, str]] = None,
+                 cache_dir: Optional[str] = SKY_CACHE_DIR,
+                 cache_ttl: float = DEFAULT_CACHE_TTL,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            sources: {liga: URL} das tabelas oficiais (padrão: Sky Sports)
+            cache_dir: Pasta do cache de páginas (None desativa o cache)
+            cache_ttl: Segundos em que uma página em cache é usada sem revalidar
+            session: Sessão HTTP (padrão: sessão compartilhada do módulo)
+        """
+        self.sources = dict(sources) if sources is not None else dict(DEFAULT_SOURCES)
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.session = session if session is not None else _shared_session()
+
+    def _cache_paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(url.encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.html", f"{base}.json"
+
+    def _read_cache(self, url: str) -> Tuple[Optional[bytes], dict]:
+        if not self.cache_dir:
+            return None, {}
+        body_path, meta_path = self._cache_paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return f.read(), meta
+        except (OSError, ValueError):
+            return None, {}
+
+    def _write_cache(self, url: str, body: Optional[bytes], meta: dict) -> None:
+        if not self.cache_dir:
+            return
+        body_path, meta_path = self._cache_paths(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if body is not None:
+                with open(f"{body_path}.tmp", 'wb') as f:
+                    f.write(body)
+                os.replace(f"{body_path}.tmp", body_path)
+            with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except OSError as e:
+            print(f"Erro ao gravar cache da tabela oficial: {e}")
+
+    def _fetch_page(self, url: str) -> bytes:
+        """
+        Baixa a página (ou usa o cache em disco)
+
+        Levanta requests.RequestException em caso de erro de rede/HTTP.
+        """
+        cached_body, meta = self._read_cache(url)
+        if cached_body is not None and time.time() - meta.get('fetched_at', 0) < self.cache_ttl:
+            return cached_body
+
+        headers = {}
+        if cached_body is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        with timed("sky fetch") as span:
+            response = self.session.get(url, headers=headers, timeout=10)
+            span.bytes_in = len(response.content)
+        if response.status_code == 304 and cached_body is not None:
+            meta['fetched_at'] = time.time()
+            self._write_cache(url, None, meta)
+            return cached_body
+        response.raise_for_status()
+
+        self._write_cache(url, response.content, {
+            'url': url,
+            'fetched_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        })
+        return response.content
+
+    @staticmethod
+    def _parse_table(content: bytes) -> Optional[pd.DataFrame]:
+        """Extrai a tabela de classificação do HTML do Sky Sports"""
+        web_content = html.fromstring(content)
+
+        # Sky Sports renderiza a tabela de classificação como a única
+        # <table> da página, com a classe "sdc-site-table".
+        table_element = web_content.xpath('//table[contains(@class, "sdc-site-table")]')
+
+        if not table_element:
+            # Tentar XPath alternativo (layout antigo)
+            table_element = web_content.xpath('/html/body/main/div[5]/div/div/div/table')
+
+        if not table_element:
+            return None
+        
+        table_element = table_element[0]
+        
+        # Extrair dados
+        table_data = []
+        for row in table_element.xpath('.//tr'):
+            row_data = [cell.text_content().strip() for cell in row.xpath('.//td')]
+            if row_data:
+                table_data.append(row_data)
+        
+        # Criar DataFrame
+        columns = ['Pos', 'Time', 'J', 'V', 'E', 'D', 'GM', 'GS', 'SG', 'Pts']
+        extracted_table = pd.DataFrame(table_data, columns=columns)
+        extracted_table = extracted_table.drop(columns=['Pos'])
+        
+        # Converter colunas numéricas
+        numeric_columns = ['J', 'V', 'E', 'D', 'GM', 'GS', 'SG', 'Pts']
+        for col in numeric_columns:
+            extracted_table[col] = extracted_table[col].str.replace('+', '', regex=False).astype(int)
+        
+        return extracted_table
     
     def fetch_official_table(self, league: str) -> pd.DataFrame:
         """
@@ -30,51 +185,70 @@ class TableValidator:
             return None
         
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            web_content = html.fromstring(response.content)
-
-            # Sky Sports renderiza a tabela de classificação como a única
-            # <table> da página, com a classe "sdc-site-table".
-            table_element = web_content.xpath('//table[contains(@class, "sdc-site-table")]')
-
-            if not table_element:
-                # Tentar XPath alternativo (layout antigo)
-                table_element = web_content.xpath('/html/body/main/div[5]/div/div/div/table')
-
-            if not table_element:
-                return None
-            
-            table_element = table_element[0]
-            
-            # Extrair dados
-            table_data = []
-            for row in table_element.xpath('.//tr'):
-                row_data = [cell.text_content().strip() for cell in row.xpath('.//td')]
-                if row_data:
-                    table_data.append(row_data)
-            
-            # Criar DataFrame
-            columns = ['Pos', 'Time', 'J', 'V', 'E', 'D', 'GM', 'GS', 'SG', 'Pts']
-            extracted_table = pd.DataFrame(table_data, columns=columns)
-            extracted_table = extracted_table.drop(columns=['Pos'])
-            
-            # Converter colunas numéricas
-            numeric_columns = ['J', 'V', 'E', 'D', 'GM', 'GS', 'SG', 'Pts']
-            for col in numeric_columns:
-                extracted_table[col] = extracted_table[col].str.replace('+', '', regex=False).astype(int)
-            
-            return extracted_table
-        
+            return self._parse_table(self._fetch_page(url))
         except Exception as e:
             print(f"Erro ao buscar tabela oficial: {e}")
             return None
+
+    def fetch_all(self, leagues: Optional[Iterable[str]] = None,
+                  max_workers: int = 5) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Busca as tabelas oficiais de várias ligas em paralelo
+
+        Args:
+            leagues: Ligas a buscar (padrão: todas as de self.sources)
+            max_workers: Número máximo de downloads simultâneos
+
+        Returns:
+            {liga: DataFrame ou None se a busca falhou}
+        """
+        leagues = list(leagues) if leagues is not None else list(self.sources)
+        if not leagues:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(leagues))) as executor:
+            # Cada busca roda numa cópia do contexto de quem chamou (ação do perf)
+            futures = [executor.submit(contextvars.copy_context().run, self.fetch_official_table, league)
+                       for league in leagues]
+            return dict(zip(leagues, (f.result() for f in futures)))
     
-    def compare_tables(self, calculated_table: List[Dict], official_df: pd.DataFrame) -> pd.DataFrame:
+    def prefetch_all(self, leagues: Optional[Iterable[str]] = None) -> None:
         """
-        Compara tabela calculada com oficial usando fuzzy matching
-        
+        Começa fetch_all numa thread em segundo plano, só para aquecer o cache
+        de páginas: quando a validação de uma liga rodar, a página já está em
+        disco. Não faz nada sem cache, com uma busca ainda em andamento ou se
+        a última começou há menos de metade do cache_ttl.
+        """
+        global _prefetch_thread, _prefetch_started
+        if not self.cache_dir:
+            return
+        with _prefetch_lock:
+            if _prefetch_thread is not None and _prefetch_thread.is_alive():
+                return
+            if time.time() - _prefetch_started < self.cache_ttl / 2:
+                return
+            _prefetch_started = time.time()
+            _prefetch_thread = threading.Thread(
+                target=self.fetch_all, args=(leagues,), name="sky-prefetch", daemon=True
+            )
+            _prefetch_thread.start()
+
+    def wait_prefetch(self, timeout: Optional[float] = None) -> None:
+        """Espera a busca em segundo plano (se houver), para não baixar a mesma página duas vezes"""
+        with _prefetch_lock:
+            thread = _prefetch_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def compare_tables(self, calculated_table: List[Dict], official_df: pd.DataFrame,
+                       matcher: Optional[TeamMatcher] = None) -> pd.DataFrame:
+        """
+        Compara tabela calculada com oficial (nomes via TeamMatcher)
+
+        Args:
+            matcher: TeamMatcher dos times da tabela calculada (padrão: um novo);
+                depois da comparação, matcher.fuzzy_matches diz quais nomes
+                foram associados por aproximação
+
         Returns:
             DataFrame com divergências (vazio se tudo ok)
         """
@@ -84,14 +258,10 @@ class TableValidator:
                                      'goals_for', 'goals_against', 'goal_difference', 'points']]
         tabela_final.columns = ['Time', 'J', 'V', 'E', 'D', 'GM', 'GS', 'SG', 'Pts']
         
-        # Fuzzy matching de nomes
-        def get_best_match(name, choices):
-            match, score = process.extractOne(name, choices)
-            return match
-        
-        official_df['Time'] = official_df['Time'].apply(
-            lambda x: get_best_match(x, tabela_final['Time'].tolist())
-        )
+        # Nomes: exato / apelidos primeiro, fuzzy só para o que sobrar
+        if matcher is None:
+            matcher = TeamMatcher(tabela_final['Time'].tolist())
+        official_df['Time'] = matcher.match_all(official_df['Time'].tolist())
         
         # Garantir tipos numéricos
         numeric_columns = ['J', 'V', 'E', 'D', 'GM', 'GS', 'SG', 'Pts']
@@ -101,17 +271,10 @@ class TableValidator:
         # Merge e comparação
         comparison = tabela_final.merge(official_df, on='Time', suffixes=('_calculado', '_oficial'))
         
-        # Filtrar divergências
-        divergencias = comparison[
-            (comparison['J_calculado'] != comparison['J_oficial']) |
-            (comparison['V_calculado'] != comparison['V_oficial']) |
-            (comparison['E_calculado'] != comparison['E_oficial']) |
-            (comparison['D_calculado'] != comparison['D_oficial']) |
-            (comparison['GM_calculado'] != comparison['GM_oficial']) |
-            (comparison['GS_calculado'] != comparison['GS_oficial']) |
-            (comparison['SG_calculado'] != comparison['SG_oficial']) |
-            (comparison['Pts_calculado'] != comparison['Pts_oficial'])
-        ]
+        # Filtrar divergências (qualquer coluna numérica diferente)
+        calculado = comparison[[f"{col}_calculado" for col in numeric_columns]].to_numpy()
+        oficial = comparison[[f"{col}_oficial" for col in numeric_columns]].to_numpy()
+        divergencias = comparison[(calculado != oficial).any(axis=1)]
         
         return divergencias
     
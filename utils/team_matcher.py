@@ -0,0 +1,164 @@
+"""
+Associação de nomes de times de fontes externas aos nomes usados no app
+
+Ordem de resolução: nome idêntico → mapeamento confirmado (memorizado em
+disco) → índice de apelidos normalizados (config/team_abbreviations.json e
+config/team_display_names.json) → fuzzy matching apenas para o que sobrar.
+
+Um palpite do fuzzy nunca é memorizado sozinho: um time rebaixado ou
+renomeado pode casar com um nome parecido, e o erro ficaria para sempre.
+Só vai para o disco o que alguém confirmou (TeamMatcher.remember).
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fuzzywuzzy import process
+
+ABBREVIATIONS_PATH = "config/team_abbreviations.json"
+DISPLAY_NAMES_PATH = "config/team_display_names.json"
+MATCH_MEMO_PATH = ".cache/confirmed_team_matches.json"
+
+# Palavras que as fontes incluem ou omitem livremente
+_NOISE_TOKENS = {"fc", "afc"}
+
+_memo_lock = threading.Lock()
+_memos: Dict[str, Dict[str, str]] = {}
+
+
+def normalize_team_name(name: str) -> str:
+    """Minúsculas, sem acentos, pontuação e sufixos como FC/AFC"""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace("&", " and ")
+    tokens = re.sub(r"[^a-z0-9 ]+", " ", text).split()
+    return " ".join(t for t in tokens if t not in _NOISE_TOKENS)
+
+
+def _load_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _load_memo(path: str) -> Dict[str, str]:
+    with _memo_lock:
+        if path not in _memos:
+            _memos[path] = _load_json(path) if path else {}
+        return _memos[path]
+
+
+def _save_memo(path: str, memo: Dict[str, str]) -> None:
+    if not path:
+        return
+    with _memo_lock:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(memo, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"Erro ao salvar mapeamento de times: {e}")
+
+
+class TeamMatcher:
+    """
+    Resolve nomes externos para um conjunto fixo de nomes candidatos
+
+    O índice é montado uma vez por instância; crie uma por tabela validada.
+    """
+
+    def __init__(self, candidates: Iterable[str],
+                 memo_path: Optional[str] = MATCH_MEMO_PATH,
+                 abbreviations_path: str = ABBREVIATIONS_PATH,
+                 display_names_path: str = DISPLAY_NAMES_PATH):
+        self.candidates: List[str] = list(candidates)
+        self._candidate_set = set(self.candidates)
+        self.memo_path = memo_path
+        self._memo = _load_memo(memo_path)
+        # Palpites do fuzzy desta instância: {nome externo: (candidato, pontuação)}
+        self.fuzzy_matches: Dict[str, Tuple[str, int]] = {}
+        self._index = self._build_index(abbreviations_path, display_names_path)
+
+    def _build_index(self, abbreviations_path: str, display_names_path: str) -> Dict[str, str]:
+        """{nome normalizado ou apelido: candidato}"""
+        index: Dict[str, str] = {}
+
+        def add(alias: str, candidate: str) -> None:
+            key = normalize_team_name(alias)
+            if key:
+                index.setdefault(key, candidate)
+
+        for candidate in self.candidates:
+            add(candidate, candidate)
+
+        for code, full_name in _load_json(abbreviations_path).items():
+            if full_name in self._candidate_set:
+                add(code, full_name)
+
+        # Nomes de exibição (completo → curto) valem nos dois sentidos
+        for mapping in _load_json(display_names_path).values():
+            if not isinstance(mapping, dict):
+                continue
+            for full_name, short_name in mapping.items():
+                if short_name in self._candidate_set:
+                    add(full_name, short_name)
+                if full_name in self._candidate_set:
+                    add(short_name, full_name)
+        return index
+
+    def _resolve_without_fuzzy(self, name: str) -> Optional[str]:
+        if name in self._candidate_set:
+            return name
+        memorized = self._memo.get(name)
+        if memorized in self._candidate_set:
+            return memorized
+        return self._index.get(normalize_team_name(name))
+
+    def match_all(self, names: Iterable[str]) -> List[str]:
+        """
+        Resolve todos os nomes; o fuzzy só compara os que não foram resolvidos
+        pelo índice contra os candidatos que ainda não foram associados (nem
+        pelo índice, nem pelo próprio fuzzy)
+        """
+        names = list(names)
+        resolved: List[Optional[str]] = [self._resolve_without_fuzzy(n) for n in names]
+
+        pending = [i for i, match in enumerate(resolved) if match is None]
+        if pending:
+            taken = set(m for m in resolved if m is not None)
+            for i in pending:
+                remaining = [c for c in self.candidates if c not in taken] or self.candidates
+                match, score = process.extractOne(names[i], remaining)
+                resolved[i] = match
+                taken.add(match)
+                self.fuzzy_matches[names[i]] = (match, score)
+
+        return resolved
+
+    def match(self, name: str) -> str:
+        """Resolve um único nome"""
+        return self.match_all([name])[0]
+
+    def remember(self, name: str, candidate: str) -> None:
+        """Memoriza em disco um mapeamento confirmado (nome externo → candidato)"""
+        if candidate not in self._candidate_set:
+            raise ValueError(f"{candidate!r} não é um dos candidatos")
+        with _memo_lock:
+            self._memo[name] = candidate
+        _save_memo(self.memo_path, self._memo)
+        self.fuzzy_matches.pop(name, None)
+
+    def clear_remembered(self) -> None:
+        """Apaga todos os mapeamentos confirmados (em memória e no disco)"""
+        with _memo_lock:
+            self._memo.clear()
+            if self.memo_path and os.path.exists(self.memo_path):
+                os.remove(self.memo_path)
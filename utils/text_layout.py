@@ -0,0 +1,183 @@
+"""
+Medição de texto com métricas em cache e quebra de linhas balanceada
+"""
+from PIL import ImageFont
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import threading
+
+from utils.text_sprites import get_font
+
+# Medidas guardadas por fonte (palavras e textos inteiros, cada um à parte)
+_MEASURE_CACHE_SIZE = 2048
+
+# Fontes (arquivo, tamanho) com TextLayout em memória
+_LAYOUT_CACHE_SIZE = 64
+
+
+def _lru_get(cache: "OrderedDict", key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: "OrderedDict", key, value, max_size: int) -> None:
+    cache[key] = value
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+
+
+class TextLayout:
+    """
+    Métricas de texto de uma fonte, medidas uma única vez
+
+    Cada palavra e o espaço são medidos (advance do FreeType) na primeira vez
+    em que aparecem; a largura de uma linha passa a ser a soma dessas medidas,
+    sem novas chamadas de layout. Use get_text_layout(font) para reaproveitar a
+    mesma instância entre chamadas. As medidas ficam num LRU limitado, então
+    um processo de vida longa não acumula todo texto que já mediu. A instância
+    é compartilhada entre threads, mas cada uma mede com a sua face (ver
+    text_sprites.get_font).
+    """
+
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        self.font = font
+        self.space_width = font.getlength(' ')
+        self._advances: "OrderedDict[str, float]" = OrderedDict()
+        self._widths: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _face(self) -> ImageFont.FreeTypeFont:
+        """A fonte desta thread (fontes sem arquivo: a própria instância)"""
+        path = getattr(self.font, 'path', None)
+        if not path or getattr(self.font, 'index', 0):
+            return self.font
+        return get_font(path, self.font.size)
+
+    def word_advance(self, word: str) -> float:
+        """Avanço horizontal de uma palavra (em cache)"""
+        with self._lock:
+            advance = _lru_get(self._advances, word)
+        if advance is None:
+            advance = self._face().getlength(word)
+            with self._lock:
+                _lru_put(self._advances, word, advance, _MEASURE_CACHE_SIZE)
+        return advance
+
+    def text_width(self, text: str) -> int:
+        """Largura da caixa do texto, como draw.textbbox em (0, 0) (em cache)"""
+        with self._lock:
+            width = _lru_get(self._widths, text)
+        if width is None:
+            bbox = self._face().getbbox(text)
+            width = bbox[2] - bbox[0]
+            with self._lock:
+                _lru_put(self._widths, text, width, _MEASURE_CACHE_SIZE)
+        return width
+
+    def line_width(self, words: List[str]) -> float:
+        """Largura de uma linha formada pelas palavras separadas por espaço"""
+        if not words:
+            return 0.0
+        return sum(self.word_advance(w) for w in words) + self.space_width * (len(words) - 1)
+
+    def _best_split(self, advances: List[float], num_lines: int,
+                    max_width: int) -> Optional[List[int]]:
+        """
+        Programação dinâmica: divide as palavras em num_lines linhas
+        minimizando a soma dos quadrados das larguras (linhas balanceadas;
+        com duas linhas equivale a minimizar a diferença entre elas)
+
+        Retorna os índices de início de cada linha, ou None se não couber.
+        """
+        n = len(advances)
+        if num_lines > n:
+            return None
+
+        prefix = [0.0]
+        for adv in advances:
+            prefix.append(prefix[-1] + adv)
+
+        def width(i: int, j: int) -> float:
+            return prefix[j] - prefix[i] + self.space_width * (j - i - 1)
+
+        inf = float('inf')
+        # best[k][j]: menor custo para as j primeiras palavras em k linhas
+        best = [[inf] * (n + 1) for _ in range(num_lines + 1)]
+        parent = [[0] * (n + 1) for _ in range(num_lines + 1)]
+        best[0][0] = 0.0
+
+        for k in range(1, num_lines + 1):
+            for j in range(k, n + 1):
+                for i in range(k - 1, j):
+                    if best[k - 1][i] == inf:
+                        continue
+                    w = width(i, j)
+                    if w > max_width:
+                        continue
+                    candidate = best[k - 1][i] + w * w
+                    # '<' estrito: em empate, mantém a quebra mais à esquerda
+                    if candidate < best[k][j]:
+                        best[k][j] = candidate
+                        parent[k][j] = i
+
+        if best[num_lines][n] == inf:
+            return None
+
+        starts = []
+        j = n
+        for k in range(num_lines, 0, -1):
+            i = parent[k][j]
+            starts.append(i)
+            j = i
+        return starts[::-1]
+
+    def balanced_lines(self, text: str, max_width: int, max_lines: int = 3) -> List[str]:
+        """
+        Divide o texto em linhas balanceadas (mesmo tamanho)
+
+        Usa o menor número de linhas (até max_lines) em que todas cabem em
+        max_width; se nenhuma divisão couber, quebra palavra por palavra.
+        """
+        if self.text_width(text) <= max_width:
+            return [text]
+
+        words = text.split()
+        advances = [self.word_advance(w) for w in words]
+
+        for num_lines in range(2, max_lines + 1):
+            starts = self._best_split(advances, num_lines, max_width)
+            if starts:
+                bounds = starts + [len(words)]
+                return [' '.join(words[bounds[k]:bounds[k + 1]]) for k in range(num_lines)]
+
+        # Último recurso: quebrar palavra por palavra até caber
+        lines = []
+        current_line: List[str] = []
+        for word in words:
+            if self.line_width(current_line + [word]) <= max_width:
+                current_line.append(word)
+            else:
+                if current_line:
+                    lines.append(' '.join(current_line))
+                current_line = [word]
+        if current_line:
+            lines.append(' '.join(current_line))
+        return lines
+
+
+_LAYOUTS: "OrderedDict[Tuple, TextLayout]" = OrderedDict()
+_layouts_lock = threading.Lock()
+
+
+def get_text_layout(font: ImageFont.FreeTypeFont) -> TextLayout:
+    """Retorna o TextLayout compartilhado de uma fonte (por arquivo e tamanho)"""
+    # Fontes carregadas de bytes não têm caminho: usa a própria instância
+    key = (getattr(font, 'path', None) or id(font), font.size, getattr(font, 'index', 0))
+    with _layouts_lock:
+        layout = _lru_get(_LAYOUTS, key)
+        if layout is None:
+            layout = TextLayout(font)
+            _lru_put(_LAYOUTS, key, layout, _LAYOUT_CACHE_SIZE)
+    return layout
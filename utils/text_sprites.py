@@ -0,0 +1,87 @@
+"""
+Cache de texto pré-rasterizado para os geradores de imagem
+
+Nomes de times, números de posição, estatísticas e "RODADA N" se repetem de
+uma renderização para a outra. Em vez de pedir ao FreeType o layout e a
+rasterização a cada draw.text, a máscara de cada texto fica em cache por
+(fonte, tamanho, modo, texto, fração de pixel) e é só carimbada na imagem
+com a cor pedida. O resultado é idêntico ao de ImageDraw.text.
+
+Uma face do FreeType não pode ser usada por duas threads ao mesmo tempo:
+get_font guarda as fontes por thread (as sessões do Streamlit renderizam em
+paralelo). As máscaras e medidas em cache são dados comuns e são
+compartilhadas.
+"""
+import math
+import threading
+from functools import lru_cache
+from typing import Tuple
+
+from PIL import ImageDraw, ImageFont
+
+# Máscaras de texto mantidas em memória (cada uma tem poucos KB)
+_SPRITE_CACHE_SIZE = 4096
+
+# Fontes (arquivo, tamanho) mantidas em memória por thread
+_FONT_CACHE_SIZE = 64
+
+_fonts_per_thread = threading.local()
+
+
+def get_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Fonte TrueType carregada uma vez por (arquivo, tamanho) em cada thread"""
+    load = getattr(_fonts_per_thread, "load", None)
+    if load is None:
+        load = _fonts_per_thread.load = lru_cache(maxsize=_FONT_CACHE_SIZE)(ImageFont.truetype)
+    return load(path, size)
+
+
+@lru_cache(maxsize=_SPRITE_CACHE_SIZE)
+def _rasterize(path: str, size: int, mode: str, text: str,
+               start: Tuple[float, float]):
+    """Máscara do texto e deslocamento, como ImageDraw.text os calcula"""
+    return get_font(path, size).getmask2(text, mode, start=start)
+
+
+@lru_cache(maxsize=_SPRITE_CACHE_SIZE)
+def _bbox(path: str, size: int, text: str) -> Tuple[int, int, int, int]:
+    return get_font(path, size).getbbox(text)
+
+
+def text_bbox(font: ImageFont.FreeTypeFont, text: str) -> Tuple[int, int, int, int]:
+    """Equivalente (em cache) a draw.textbbox((0, 0), text, font=font)"""
+    return _bbox(font.path, font.size, text)
+
+
+def text_width(font: ImageFont.FreeTypeFont, text: str) -> int:
+    bbox = text_bbox(font, text)
+    return bbox[2] - bbox[0]
+
+
+def draw_text(draw: ImageDraw.ImageDraw, xy: Tuple[float, float], text: str,
+              font: ImageFont.FreeTypeFont, fill) -> None:
+    """
+    Desenha text como draw.text(xy, text, font=font, fill=fill), reaproveitando
+    a máscara já rasterizada quando o mesmo texto aparece de novo
+    """
+    if not text:
+        return
+    if "\n" in text or not getattr(font, "path", None):
+        # Múltiplas linhas ou fonte sem arquivo: caminho normal do Pillow
+        draw.text(xy, text, font=font, fill=fill)
+        return
+
+    try:
+        # API interna do ImageDraw (a mesma que draw.text usa por baixo)
+        ink, fill_ink = draw._getink(fill)
+        draw_bitmap = draw.draw.draw_bitmap
+    except AttributeError:
+        # Pillow que mudou essa API: sem cache, mas o texto sai igual
+        draw.text(xy, text, font=font, fill=fill)
+        return
+    if ink is None:
+        ink = fill_ink
+    x, y = xy
+    start = (math.modf(x)[0], math.modf(y)[0])
+    mask, offset = _rasterize(font.path, font.size, draw.fontmode, text, start)
+    draw_bitmap((int(x) + offset[0], int(y) + offset[1]), mask, ink)